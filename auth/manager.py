@@ -11,7 +11,10 @@ import hashlib
 from datetime import datetime
 
 from .models import User
-print(f"[DEBUG] User importado em manager.py: {User}")
+from core.log import get_logger
+from core.layout import LayoutCache
+
+logger = get_logger('auth')
 
 
 class AuthProvider(ABC):
@@ -51,7 +54,7 @@ class SimpleAuthProvider(AuthProvider):
                         user = User.from_dict(user_data)
                         self._users[user.id] = user
             except Exception as e:
-                print(f"Erro ao carregar usuários: {e}")
+                logger.error("Erro ao carregar usuários: %s", e)
         else:
             # Criar usuário admin padrão
             admin_user = User(
@@ -73,32 +76,30 @@ class SimpleAuthProvider(AuthProvider):
             with open(self.users_file, 'w', encoding='utf-8') as f:
                 json.dump(data, f, indent=2, ensure_ascii=False)
         except Exception as e:
-            print(f"Erro ao salvar usuários: {e}")
+            logger.error("Erro ao salvar usuários: %s", e)
     
     def _hash_password(self, password: str) -> str:
         """Gera hash da senha"""
         return hashlib.sha256(password.encode()).hexdigest()
     
     async def authenticate(self, username: str, password: str) -> Optional[User]:
-        print(f"[DEBUG] authenticate chamado com: username={username}, password={password}")
+        logger.debug("authenticate chamado: username=%s", username)
         # Para o exemplo, senha padrão é "admin" para admin
         if username == "admin" and password == "admin":
             user = self._users.get("admin")
-            print(f"[DEBUG] user encontrado para admin: {user}")
             if user:
                 user.last_login = datetime.now()
                 self._save_users()
-                print(f"[DEBUG] user retornado: {user}")
+                logger.debug("usuário autenticado: id=%s", user.id)
                 return user
         # Buscar por username ou email
         for user in self._users.values():
-            print(f"[DEBUG] checando user: {user}")
             if (user.username == username or user.email == username) and user.is_active:
                 user.last_login = datetime.now()
                 self._save_users()
-                print(f"[DEBUG] user retornado por username/email: {user}")
+                logger.debug("usuário autenticado por username/email: id=%s", user.id)
                 return user
-        print("[DEBUG] Nenhum usuário autenticado")
+        logger.debug("Nenhum usuário autenticado: username=%s", username)
         return None
     
     async def get_user(self, user_id: str) -> Optional[User]:
@@ -146,8 +147,8 @@ class AuthManager:
     
     async def show_login_form(self, q: Q) -> None:
         """Exibe formulário de login"""
-        # Layout simples para login
-        q.page['meta'] = ui.meta_card(
+        # Layout simples para login (construído uma vez, reenviado só se mudou)
+        LayoutCache.get_instance().apply(q, ('auth', 'login'), lambda: ui.meta_card(
             box='',
             theme='neon',
             layouts=[
@@ -158,7 +159,7 @@ class AuthManager:
                     ]
                 )
             ]
-        )
+        ))
         
         # Verificar se há erro de login
         show_error = hasattr(q.client, 'login_error') and q.client.login_error
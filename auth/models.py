@@ -6,6 +6,10 @@ from dataclasses import dataclass
 from typing import Dict, Any, Optional
 from datetime import datetime
 
+from core.log import get_logger, TRACE
+
+logger = get_logger('auth')
+
 
 @dataclass
 class User:
@@ -43,7 +47,7 @@ class User:
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'User':
         """Cria usuário a partir de dicionário"""
-        print(f"[DEBUG] User.from_dict chamado com: {data}")
+        logger.log(TRACE, "User.from_dict: id=%s", data.get('id'))
         user_data = data.copy()
         # Fallback para campos obrigatórios
         user_data.setdefault('id', '')
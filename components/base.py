@@ -17,46 +17,73 @@ except ImportError:
     # For syntax checking without h2o_wave installed
     Q = Any
 
+from core.routing import Routable, RouteTable, Route, METHOD, default_dispatch, discover_event_methods
+from core.executor import INLINE, call_handler
+from core.memo import RenderMemo
+from core.log import get_logger, SampledTrace
+from core.config import get_config
 
+component_logger = get_logger('component')
+card_logger = get_logger('card')
+_trace_component = SampledTrace(component_logger, get_config().log_trace_sample)
+_trace_card = SampledTrace(card_logger, get_config().log_trace_sample)
 
-class BaseComponent:
+
+class BaseComponent(Routable):
     """
     Componente DAZE modular: handlers, renderização, estado e eventos.
+
+    ``execution_policy = THREAD`` executa handlers/render síncronos no pool de
+    threads (trabalho pesado de pandas ou I/O); métodos async são sempre aguardados.
     """
+    execution_policy = INLINE
+
     def __init__(self, component_id):
         self.component_id = component_id
         self.handlers = {}
 
     def register_handler(self, event_name, handler):
         self.handlers[event_name] = handler
+        self.invalidate_routes()
+
+    def build_routes(self, table: RouteTable) -> None:
+        # Dispatch automático: métodos on_<evento> descobertos uma vez por classe
+        for event_name, method_name in discover_event_methods(type(self)):
+            table.add(Route(event_name, (0,), (), (), METHOD, getattr(self, method_name), self))
+        # Fallback: handlers registrados manualmente
+        self.add_handler_routes(table, self.handlers, prefix=(1,))
 
     def render(self, q, state=None):
         raise NotImplementedError
 
+    def render_inputs(self, q, state=None):
+        """
+        Entradas do render (props e fatias de estado do cliente).
+        Se o hash não mudar desde o último render para o cliente, o render é pulado.
+        None desativa a memoização.
+        """
+        return None
+
+    def should_render(self, q, state=None):
+        return RenderMemo.get_instance().should_render(q, self.component_id, self.render_inputs(q, state=state))
+
+    @default_dispatch
     async def handle_events(self, q, state=None, args=None, **kwargs):
         # Fallback robusto de evento/args
         if args is None or not args:
             args = getattr(q.client, 'last_event', {})
         if not isinstance(args, dict):
             args = {}
-        # Dispatch automático: procura métodos on_<evento>
-        for event_name in args:
-            method = getattr(self, f'on_{event_name}', None)
-            if callable(method):
-                print(f"[DAZE][COMPONENT] dispatch automático: on_{event_name}")
-                result = await method(q, state=state, args=args) if hasattr(method, '__await__') else method(q, state=state, args=args)
-                # Salva resultado padronizado
-                if not hasattr(q.client, 'result') or not isinstance(getattr(q.client, 'result', None), dict):
-                    q.client.result = {}
-                q.client.result[event_name] = result
-                return True
-        # Fallback: handlers registrados manualmente
-        for event_name, handler in self.handlers.items():
-            if args.get(event_name):
-                print(f"[DAZE][COMPONENT] handler found: {event_name}")
-                return await handler(q, state=state, args=args)
-        print(f"[DAZE][COMPONENT] event not handled at component level")
-        return None
+        result = await self.route_table.dispatch(q, state=state, args=args)
+        if result is None:
+            _trace_component('%s: event not handled at component level', self.component_id)
+        return result
+
+    def store_result(self, q, event_name, result):
+        # Salva resultado padronizado
+        if not hasattr(q.client, 'result') or not isinstance(getattr(q.client, 'result', None), dict):
+            q.client.result = {}
+        q.client.result[event_name] = result
 
     def get_result(self, q, event_name):
         result = getattr(q.client, 'result', None)
@@ -66,10 +93,12 @@ class BaseComponent:
 
 
 
-class BaseCard:
+class BaseCard(Routable):
     """
     Card DAZE modular: orquestra componentes, handlers, estado e eventos.
     """
+    execution_policy = INLINE
+
     def __init__(self, card_id):
         self.card_id = card_id
         self.components = {}
@@ -77,34 +106,43 @@ class BaseCard:
 
     def add_component(self, name, component):
         self.components[name] = component
+        self.attach_route_child(component)
 
     def register_handler(self, event_name, handler):
         self.handlers[event_name] = handler
+        self.invalidate_routes()
+
+    def build_routes(self, table: RouteTable) -> None:
+        self.add_handler_routes(table, self.handlers)
+        self.add_child_routes(table, self.components)
 
     def set_zone(self, zone):
         self.zone = zone
 
     def render(self, q, zone=None, state=None, **kwargs):
         for name, component in self.components.items():
-            component.render(q, state=state.get(name) if state else None)
+            comp_state = state.get(name) if state else None
+            if component.should_render(q, state=comp_state):
+                component.render(q, state=comp_state)
+
+    async def render_async(self, q, zone=None, state=None, **kwargs):
+        """Renderiza respeitando a política de execução de cada componente"""
+        if type(self).render is not BaseCard.render:
+            return await call_handler(self.render, q, zone=zone, state=state, policy=self.execution_policy, **kwargs)
+        for name, component in self.components.items():
+            comp_state = state.get(name) if state else None
+            if component.should_render(q, state=comp_state):
+                await call_handler(component.render, q, state=comp_state,
+                                   policy=getattr(component, 'execution_policy', INLINE))
 
+    @default_dispatch
     async def handle_events(self, q, state=None, args=None, **kwargs):
-        from core.app import WaveApp
         if args is None or not args:
             args = getattr(q.client, 'last_event', {})
         if not isinstance(args, dict):
             args = {}
-        print(f"[DAZE][CARD] {self.card_id} handle_events: args={args}")
-        for event_name, handler in self.handlers.items():
-            if args.get(event_name):
-                print(f"[DAZE][CARD] handler found: {event_name}")
-                return await handler(q, state=state, args=args)
-        for name, component in self.components.items():
-            comp_state = state.get(name) if state and isinstance(state, dict) else None
-            print(f"[DAZE][CARD] propagating to component: {name} (state={comp_state})")
-            result = await component.handle_events(q, state=comp_state, args=args)
-            if result:
-                print(f"[DAZE][CARD] event handled by component: {name}")
-                return result
-        print(f"[DAZE][CARD] event not handled at card level")
-        return None
+        _trace_card('%s handle_events: keys=%s', self.card_id, tuple(args))
+        result = await self.route_table.dispatch(q, state=state, args=args)
+        if result is None:
+            _trace_card('%s: event not handled at card level', self.card_id)
+        return result
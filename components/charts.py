@@ -3,88 +3,373 @@ DAZE Template - Charts Component
 Componente para exibição de gráficos usando H2O Wave
 """
 
-from h2o_wave import Q, ui
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple
+import asyncio
+import time
+
+from h2o_wave import Q, ui, data
+import numpy as np
+import pandas as pd
 from .base import BaseComponent
+from core.diff import publish_card
+from .downsample import LTTB, downsample
+from core.flush import flush_page
+
+
+def _as_frame(source: Any) -> Optional[pd.DataFrame]:
+    """Normaliza a fonte do gráfico para DataFrame (sem copiar DataFrames)"""
+    if source is None:
+        return None
+    if isinstance(source, pd.DataFrame):
+        return source
+    if isinstance(source, pd.Series):
+        return source.rename('y').reset_index().rename(columns={source.index.name or 'index': 'x'})
+    if isinstance(source, np.ndarray):
+        if source.ndim == 1:
+            return pd.DataFrame({'x': np.arange(len(source)), 'y': source})
+        # 2D: primeira coluna é o eixo x, as demais são séries
+        return pd.DataFrame(source, columns=['x'] + [f'y{i}' if i > 1 else 'y' for i in range(1, source.shape[1])])
+    if isinstance(source, dict):
+        return pd.DataFrame(source)
+    if isinstance(source, (list, tuple)):
+        if not source:
+            return None
+        if isinstance(source[0], dict):
+            return pd.DataFrame.from_records(source)
+        frame = pd.DataFrame(list(source))
+        frame.columns = ['x'] + [f'y{i}' if i > 1 else 'y' for i in range(1, frame.shape[1])]
+        return frame
+    return None
+
+
+def _resolve_fields(frame: pd.DataFrame, x_field: Optional[str], y_field: Any):
+    """Coluna do eixo x e mapeamento rótulo → coluna das séries"""
+    if x_field not in frame.columns:
+        if 'x' in frame.columns:
+            x_field = 'x'
+        else:
+            # Primeira coluna não numérica (ex: 'date'); senão a primeira coluna
+            non_numeric = [c for c in frame.columns if not pd.api.types.is_numeric_dtype(frame[c])]
+            x_field = non_numeric[0] if non_numeric else frame.columns[0]
+
+    if isinstance(y_field, dict):
+        series = {str(label): col for label, col in y_field.items() if col in frame.columns}
+    elif isinstance(y_field, (list, tuple)):
+        series = {str(col): col for col in y_field if col in frame.columns}
+    elif y_field in frame.columns:
+        series = {str(y_field): y_field}
+    elif 'y' in frame.columns:
+        series = {'y': 'y'}
+    else:
+        numeric = [c for c in frame.columns if c != x_field and pd.api.types.is_numeric_dtype(frame[c])]
+        series = {str(numeric[0]): numeric[0]} if numeric else {}
+    return x_field, series
+
+
+def _column_values(values: np.ndarray) -> list:
+    """Array → lista JSON (datas em ISO, NaN como null), convertida em bloco"""
+    if np.issubdtype(values.dtype, np.datetime64):
+        stamps = values.astype('datetime64[s]')
+        unit = 'D' if not (stamps.astype('int64') % 86400).any() else 's'
+        return np.datetime_as_string(stamps, unit=unit).tolist()
+    if np.issubdtype(values.dtype, np.floating):
+        missing = np.isnan(values)
+        if missing.any():
+            values = values.astype(object)
+            values[missing] = None
+    return values.tolist()
+
+
+def _x_mask(x: np.ndarray, x_range) -> np.ndarray:
+    """Máscara dos pontos dentro de [início, fim] no eixo x (datas, números ou posições)"""
+    start, end = x_range
+    if np.issubdtype(x.dtype, np.datetime64):
+        start = np.datetime64(pd.Timestamp(start)) if start is not None else None
+        end = np.datetime64(pd.Timestamp(end)) if end is not None else None
+        values = x
+    elif np.issubdtype(x.dtype, np.number):
+        values = x
+    else:
+        values = np.arange(len(x))
+    mask = np.ones(len(x), dtype=bool)
+    if start is not None:
+        mask &= values >= start
+    if end is not None:
+        mask &= values <= end
+    return mask
+
+
+def to_wave_columns(source: Any, x_field: Optional[str] = None, y_field: Any = None,
+                    budget: Optional[int] = None, method: str = LTTB, x_range=None):
+    """
+    Converte a fonte em (campos, colunas) no formato de colunas do Wave.
+    Uma série → campos ``x y``; várias → formato longo ``x y series``.
+    Com ``budget`` cada série é reduzida por downsampling (``lttb``/``minmax``);
+    ``x_range`` recorta a série em resolução total antes disso (zoom).
+    Retorna (None, None) quando não há dados utilizáveis.
+    """
+    frame = _as_frame(source)
+    if frame is None or frame.empty:
+        return None, None
+    x_field, series = _resolve_fields(frame, x_field, y_field)
+    if not series:
+        return None, None
+
+    x = frame[x_field].to_numpy() if x_field in frame.columns else frame.index.to_numpy()
+    mask = _x_mask(x, x_range) if x_range else None
+    if mask is not None:
+        x = x[mask]
+
+    xs, ys, labels = [], [], []
+    for label, col in series.items():
+        column = frame[col]
+        y = column.to_numpy(dtype=float, na_value=np.nan) if column.hasnans else column.to_numpy()
+        if mask is not None:
+            y = y[mask]
+        if budget and method and len(y) > budget:
+            keep = downsample(x, y, budget, method)
+            xs.append(x[keep])
+            ys.append(y[keep])
+        else:
+            xs.append(x)
+            ys.append(y)
+        labels.append(label)
+
+    if len(series) == 1:
+        return ['x', 'y'], [_column_values(xs[0]), _column_values(ys[0])]
+    names = np.repeat(np.array(labels, dtype=object), [len(values) for values in ys])
+    return ['x', 'y', 'series'], [_column_values(np.concatenate(xs)),
+                                  _column_values(np.concatenate([values.astype(float) for values in ys])),
+                                  names.tolist()]
 
 
 class ChartComponent(BaseComponent):
     """
     Componente de gráficos reutilizável.
     Suporta diferentes tipos de gráficos (line, bar, area, etc.)
+    e modo streaming com buffer cíclico (create_stream + append/extend).
     """
     
-    def __init__(self, component_id: str = 'chart'):
+    # Pontos por pixel da largura do card enviados ao navegador
+    points_per_pixel = 2
+    # Largura presumida (px) quando o chamador não informa ``width``
+    default_width = 1000
+    # Séries reduzidas mantidas em cache (versão, orçamento, método, recorte)
+    max_cached_series = 16
+    
+    def __init__(self, component_id: str = 'chart', flush_interval: float = 1.0):
         super().__init__(component_id)
+        self.flush_interval = flush_interval
+        self._series_cache: 'OrderedDict[Hashable, Tuple[List[str], List[list]]]' = OrderedDict()
+    
+    def point_budget(self, width: Optional[int] = None, max_points: Optional[int] = None) -> int:
+        """Orçamento de pontos por série a partir da largura do card em pixels"""
+        if max_points:
+            return int(max_points)
+        return max(16, int((width or self.default_width) * self.points_per_pixel))
     
     async def create(self, q: Q, **kwargs):
-        """Cria um gráfico baseado nos parâmetros fornecidos"""
+        """
+        Cria um gráfico baseado nos parâmetros fornecidos.
+        ``data`` (ou ``chart_data``) aceita DataFrame, ndarray, dict de colunas,
+        lista de dicts ou lista de linhas; ``x_field``/``y_field`` escolhem as
+        colunas (``y_field`` pode ser lista ou dict rótulo → coluna para várias séries).
+        Séries maiores que o orçamento (``width``/``max_points``) são reduzidas com
+        ``downsample='lttb'`` (padrão) ou ``'minmax'``; ``downsample=None`` envia tudo.
+        Com ``version`` (identificador dos dados, a cargo de quem chama) a série
+        reduzida fica em cache no componente, compartilhada entre clientes; sem
+        ele, é sempre recalculada.
+        """
         # Parâmetros padrão
         chart_type = kwargs.get('chart_type', 'line')
-        data = kwargs.get('data', [])
+        source = kwargs.get('data')
+        if source is None:
+            source = kwargs.get('chart_data')
         title = kwargs.get('title', 'Gráfico')
         box = kwargs.get('box', 'content')
-        x_field = kwargs.get('x_field', 'x')
-        y_field = kwargs.get('y_field', 'y')
+        x_range = kwargs.get('x_range')
         
-        # Converte dados para formato Wave se necessário
-        if data and isinstance(data[0], dict):
-            wave_data = [[row[x_field], row[y_field]] for row in data if x_field in row and y_field in row]
-        else:
-            wave_data = data if data else [['Jan', 100], ['Feb', 150], ['Mar', 200]]
+        # Guarda a fonte (referência, sem cópia) para zoom em resolução total
+        self._chart_views(q)[self.component_id] = {k: v for k, v in kwargs.items() if k != 'x_range'}
         
-        # Cria o gráfico baseado no tipo
-        if chart_type == 'line':
-            chart = self._create_line_chart()
-        elif chart_type == 'bar':
-            chart = self._create_bar_chart()
-        elif chart_type == 'area':
-            chart = self._create_area_chart()
-        else:
-            chart = self._create_line_chart()
+        fields, columns = self._series_columns(
+            source, kwargs.get('x_field'), kwargs.get('y_field'),
+            budget=self.point_budget(kwargs.get('width'), kwargs.get('max_points')),
+            method=kwargs.get('downsample', LTTB),
+            x_range=tuple(x_range) if x_range else None,
+            version=kwargs.get('version')
+        )
+        if columns is None:
+            fields, columns = ['x', 'y'], [['Jan', 'Feb', 'Mar'], [100, 150, 200]]
+        
+        chart = self._create_chart(chart_type, x='=x', y='=y',
+                                   color='=series' if 'series' in fields else None)
         
-        q.page[self.component_id] = ui.plot_card(
+        publish_card(q, self.component_id, ui.plot_card(
             box=box,
             title=title,
-            data=wave_data,
+            # Formato em colunas empacotado: sem transpor para linhas em Python
+            data=data(fields, columns=columns, pack=True),
             plot=chart
-        )
+        ))
+    
+    def _series_columns(self, source, x_field, y_field, budget, method, x_range, version=None):
+        """Colunas reduzidas da série, em cache por (versão, orçamento, método, recorte)"""
+        frame = _as_frame(source)
+        if frame is None or frame.empty:
+            return None, None
+        if version is None:
+            return to_wave_columns(frame, x_field, y_field, budget=budget, method=method, x_range=x_range)
+        key = (version, x_field, repr(y_field), budget, method, x_range)
+        cached = self._series_cache.get(key)
+        if cached is not None:
+            self._series_cache.move_to_end(key)
+            return cached
+        result = to_wave_columns(frame, x_field, y_field, budget=budget, method=method, x_range=x_range)
+        self._series_cache[key] = result
+        if len(self._series_cache) > self.max_cached_series:
+            self._series_cache.popitem(last=False)
+        return result
+    
+    @staticmethod
+    def _chart_views(q: Q) -> Dict[str, Dict[str, Any]]:
+        views = getattr(q.client, 'chart_views', None)
+        if views is None:
+            views = {}
+            q.client.chart_views = views
+        return views
     
-    def _create_line_chart(self):
+    async def zoom(self, q: Q, start: Any = None, end: Any = None):
+        """Recorta o eixo x em [start, end] e reenvia com a resolução total desse trecho"""
+        view = self._chart_views(q).get(self.component_id)
+        if view is not None:
+            await self.create(q, **view, x_range=(start, end))
+    
+    async def reset_zoom(self, q: Q):
+        """Volta à série completa"""
+        view = self._chart_views(q).get(self.component_id)
+        if view is not None:
+            await self.create(q, **view)
+    
+    def _create_chart(self, chart_type: str, x: str = '=0', y: str = '=1', color: str = None):
+        """Cria o plot baseado no tipo"""
+        if chart_type in ('bar', 'column'):
+            return self._create_bar_chart(x, y, color or '$green')
+        if chart_type == 'area':
+            return self._create_area_chart(x, y, color or '$orange')
+        return self._create_line_chart(x, y, color or '$blue')
+    
+    def _create_line_chart(self, x: str = '=0', y: str = '=1', color: str = '$blue'):
         """Cria um gráfico de linha"""
         return ui.plot([
             ui.mark(
                 coord='rect',
                 type='line',
-                x='=0',
-                y='=1',
-                color='$blue'
+                x=x,
+                y=y,
+                color=color
             )
         ])
     
-    def _create_bar_chart(self):
+    def _create_bar_chart(self, x: str = '=0', y: str = '=1', color: str = '$green'):
         """Cria um gráfico de barras"""
         return ui.plot([
             ui.mark(
                 coord='rect',
                 type='interval',
-                x='=0',
-                y='=1',
-                color='$green'
+                x=x,
+                y=y,
+                color=color
             )
         ])
     
-    def _create_area_chart(self):
+    def _create_area_chart(self, x: str = '=0', y: str = '=1', color: str = '$orange'):
         """Cria um gráfico de área"""
         return ui.plot([
             ui.mark(
                 coord='rect',
                 type='area',
-                x='=0',
-                y='=1',
-                color='$orange'
+                x=x,
+                y=y,
+                color=color
             )
         ])
     
+    async def create_stream(self, q: Q, **kwargs):
+        """
+        Cria o gráfico uma única vez com buffer cíclico de tamanho fixo no servidor Wave.
+        Novos pontos entram por append/extend; os mais antigos saem do buffer.
+        """
+        chart_type = kwargs.get('chart_type', 'line')
+        title = kwargs.get('title', 'Gráfico')
+        box = kwargs.get('box', 'content')
+        fields = kwargs.get('fields', ('x', 'y'))
+        size = kwargs.get('size', 1000)
+        initial = kwargs.get('data') or None
+        
+        publish_card(q, self.component_id, ui.plot_card(
+            box=box,
+            title=title,
+            data=data(list(fields), -size),
+            plot=self._create_chart(chart_type, x=f'={fields[0]}', y=f'={fields[1]}')
+        ))
+        self._stream_state(q, reset=True)
+        
+        # Com rows, o Wave dimensionaria o buffer pelo tamanho inicial: os pontos
+        # iniciais entram como appends no buffer já alocado
+        if initial:
+            card_data = q.page[self.component_id].data
+            for point in initial[-size:]:
+                card_data[-1] = list(point)
+    
+    def _stream_state(self, q: Q, reset: bool = False) -> Dict[str, Any]:
+        streams = getattr(q.client, 'chart_streams', None)
+        if streams is None:
+            streams = {}
+            q.client.chart_streams = streams
+        state = streams.get(self.component_id)
+        if state is None or reset:
+            if state and state.get('task'):
+                state['task'].cancel()
+            state = streams[self.component_id] = {'pending': [], 'last_flush': 0.0, 'task': None}
+        return state
+    
+    async def append(self, q: Q, point: Sequence[Any]):
+        """Adiciona um ponto ao buffer; o envio é agrupado por flush_interval"""
+        await self.extend(q, [point])
+    
+    async def extend(self, q: Q, batch: Sequence[Sequence[Any]]):
+        """Adiciona um lote de pontos ao buffer; o envio é agrupado por flush_interval"""
+        state = self._stream_state(q)
+        state['pending'].extend(list(point) for point in batch)
+        elapsed = time.monotonic() - state['last_flush']
+        if elapsed >= self.flush_interval:
+            await self.flush(q)
+        elif state['task'] is None:
+            # Envia o que acumular até o fim do intervalo num único save
+            state['task'] = asyncio.ensure_future(self._delayed_flush(q, self.flush_interval - elapsed))
+    
+    async def _delayed_flush(self, q: Q, delay: float):
+        await asyncio.sleep(delay)
+        self._stream_state(q)['task'] = None
+        await self.flush(q)
+    
+    async def flush(self, q: Q):
+        """Envia os pontos pendentes ao buffer cíclico do card"""
+        state = self._stream_state(q)
+        pending: List[List[Any]] = state['pending']
+        state['last_flush'] = time.monotonic()
+        if not pending:
+            return
+        state['pending'] = []
+        card_data = q.page[self.component_id].data
+        for point in pending:
+            # Índice -1 em buffer cíclico acrescenta descartando o ponto mais antigo
+            card_data[-1] = point
+        # Fora do ciclo de evento (flush temporizado): envia já
+        await flush_page(q)
+    
     async def update(self, q: Q, **kwargs):
-        """Atualiza o gráfico com novos dados"""
+        """Atualiza o gráfico com novos dados (envia só os pontos alterados)"""
         await self.create(q, **kwargs)
\ No newline at end of file
@@ -0,0 +1,102 @@
+"""
+Downsampling de séries temporais que preserva a forma visual.
+
+O navegador não desenha mais pontos do que há pixels; séries grandes são
+reduzidas a um orçamento de pontos antes de irem para o Wave. Os dois métodos
+devolvem índices (ordenados) dos pontos escolhidos e são vetorizados em NumPy:
+
+- ``lttb``: Largest-Triangle-Three-Buckets. Para cada bucket escolhe o ponto que
+  forma o maior triângulo com o ponto escolhido no bucket anterior e a média do
+  próximo. A escolha depende da anterior, então os buckets são percorridos em
+  ordem (um por ponto do orçamento, alguns milhares no máximo); médias e a área
+  dentro de cada bucket são vetorizadas.
+- ``minmax``: mínimo e máximo de cada bucket (preserva picos e vales).
+
+O primeiro e o último ponto são sempre mantidos.
+"""
+
+from typing import Tuple
+
+import numpy as np
+
+LTTB = 'lttb'
+MINMAX = 'minmax'
+
+
+def as_numeric(values: np.ndarray) -> np.ndarray:
+    """Eixo em float64 (datas viram epoch em ns; texto/categorias viram posição)"""
+    if np.issubdtype(values.dtype, np.datetime64):
+        return values.astype('datetime64[ns]').astype('int64').astype(float)
+    if np.issubdtype(values.dtype, np.number):
+        return values.astype(float, copy=False)
+    return np.arange(len(values), dtype=float)
+
+
+def _buckets(n: int, count: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Divide os pontos internos (1..n-2) em ``count`` buckets: inícios, tamanhos, id por ponto"""
+    edges = np.linspace(1, n - 1, count + 1).astype(np.int64)
+    starts = edges[:-1]
+    sizes = np.diff(edges)
+    keep = sizes > 0
+    starts, sizes = starts[keep], sizes[keep]
+    ids = np.repeat(np.arange(len(starts)), sizes)
+    return starts, sizes, ids
+
+
+def _segment_argmax(values: np.ndarray, starts: np.ndarray, ids: np.ndarray) -> np.ndarray:
+    """Posição (relativa a ``values``) do primeiro máximo de cada bucket"""
+    maxes = np.maximum.reduceat(values, starts)
+    hits = np.flatnonzero(values == maxes[ids])
+    first = np.ones(len(hits), dtype=bool)
+    first[1:] = ids[hits][1:] != ids[hits][:-1]
+    return hits[first]
+
+
+def lttb(x: np.ndarray, y: np.ndarray, budget: int) -> np.ndarray:
+    """Índices dos ``budget`` pontos escolhidos pelo LTTB"""
+    n = len(y)
+    if budget >= n or budget < 3:
+        return np.arange(n)
+    x = as_numeric(x)
+    y = y.astype(float, copy=False)
+    starts, sizes, _ = _buckets(n, budget - 2)
+    offsets = starts - 1
+
+    # Média de cada bucket; o "próximo" do último bucket é o último ponto
+    mean_x = np.add.reduceat(x[1:n - 1], offsets) / sizes
+    mean_y = np.add.reduceat(np.nan_to_num(y[1:n - 1]), offsets) / sizes
+    next_x = np.append(mean_x[1:], x[-1]).tolist()
+    next_y = np.append(mean_y[1:], y[-1]).tolist()
+
+    chosen = np.empty(len(starts), dtype=np.int64)
+    anchor_x, anchor_y = float(x[0]), float(np.nan_to_num(y[0]))
+    for bucket, (start, size) in enumerate(zip(starts.tolist(), sizes.tolist())):
+        xs, ys = x[start:start + size], y[start:start + size]
+        area = np.abs((anchor_x - next_x[bucket]) * (ys - anchor_y)
+                      - (anchor_x - xs) * (next_y[bucket] - anchor_y))
+        index = start + int(np.argmax(np.where(np.isnan(area), -np.inf, area)))
+        chosen[bucket] = index
+        anchor_x, anchor_y = float(x[index]), float(np.nan_to_num(y[index]))
+    return np.concatenate(([0], chosen, [n - 1]))
+
+
+def minmax(x: np.ndarray, y: np.ndarray, budget: int) -> np.ndarray:
+    """Índices do mínimo e do máximo de cada bucket (``budget // 2`` buckets)"""
+    n = len(y)
+    if budget >= n or budget < 4:
+        return np.arange(n)
+    y = y.astype(float, copy=False)
+    starts, sizes, ids = _buckets(n, (budget - 2) // 2)
+    ys = y[1:n - 1]
+    offsets = starts - 1
+    highs = _segment_argmax(np.where(np.isnan(ys), -np.inf, ys), offsets, ids)
+    lows = _segment_argmax(np.where(np.isnan(ys), -np.inf, -ys), offsets, ids)
+    chosen = np.unique(np.concatenate((highs, lows))) + 1
+    return np.concatenate(([0], chosen, [n - 1]))
+
+
+def downsample(x: np.ndarray, y: np.ndarray, budget: int, method: str = LTTB) -> np.ndarray:
+    """Índices a manter para caber em ``budget`` pontos"""
+    if method == MINMAX:
+        return minmax(x, y, budget)
+    return lttb(x, y, budget)
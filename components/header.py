@@ -5,6 +5,7 @@ Header de navegação que consulta páginas registradas no app
 
 from h2o_wave import Q, ui
 from .base import BaseComponent
+from core.diff import publish_card
 
 
 class HeaderComponent(BaseComponent):
@@ -22,13 +23,13 @@ class HeaderComponent(BaseComponent):
         nav_items = self._get_navigation_items()
         current_page = kwargs.get('current_page', 'dashboard')
         
-        q.page[self.component_id] = ui.nav_card(
+        publish_card(q, self.component_id, ui.nav_card(
             box='header',
             title='🌊 DAZE - H2O Wave Template',
             subtitle=self._get_page_description(current_page),
             items=nav_items,
             value=current_page
-        )
+        ))
     
     def update(self, q: Q, **kwargs):
         """Atualiza o header (re-cria para manter sincronizado)"""
@@ -82,10 +83,10 @@ class BreadcrumbComponent(BaseComponent):
             filter_text = ', '.join([f'{k}: {v}' for k, v in filters.items()])
             breadcrumb_text += f' > _Filtros: {filter_text}_'
         
-        q.page[self.component_id] = ui.form_card(
+        publish_card(q, self.component_id, ui.form_card(
             box='breadcrumb',
             items=[ui.text_m(breadcrumb_text)]
-        )
+        ))
     
     def update(self, q: Q, **kwargs):
         """Atualiza o breadcrumb"""
@@ -7,6 +7,7 @@ from .charts import ChartComponent
 from .stats import StatsComponent  
 from .tables import TableComponent
 from services.data_service import DataService
+from core.broadcast import BroadcastHub
 
 
 class DashboardPage(BaseCard):
@@ -17,36 +18,44 @@ class DashboardPage(BaseCard):
         self.stats = StatsComponent('dashboard_stats')
         self.chart = ChartComponent('dashboard_chart')
         self.data_service = DataService()
+        # Resumo igual para todos os usuários: renderizado uma vez no site
+        self.broadcast = BroadcastHub.get_instance()
+        self.broadcast.register(f'{card_id}_summary', self._create_summary)
+    
+    async def _create_summary(self, q: Q) -> None:
+        """Stats e gráfico dos últimos 30 dias (página compartilhada)"""
+        # Dados resumidos
+        sales_data = await self.data_service.get_sample_sales_data(days=30)
+        product_data = await self.data_service.get_sample_product_data(count=10)
+        
+        # Estatísticas gerais
+        total_sales = sum([item['vendas'] for item in sales_data])
+        avg_daily = total_sales / 30
+        total_products = len(product_data)
+        
+        # Stats card
+        self.stats.create(q,
+            title="📊 Resumo Geral - 30 dias",
+            stats_data=[
+                {'label': 'Vendas Total', 'value': f'${total_sales:,.2f}', 'caption': '+12.5%', 'icon': 'Money'},
+                {'label': 'Média Diária', 'value': f'${avg_daily:,.2f}', 'caption': '+8.3%', 'icon': 'Calendar'},
+                {'label': 'Produtos Ativos', 'value': str(total_products), 'caption': '+2', 'icon': 'Product'},
+                {'label': 'Conversão', 'value': '3.4%', 'caption': '+0.8%', 'icon': 'Chart'}
+            ]
+        )
+        
+        # Chart card
+        await self.chart.create(q,
+            title="📈 Vendas dos Últimos 30 Dias",
+            chart_data=sales_data,
+            chart_type='line'
+        )
     
     async def create(self, q: Q, **kwargs) -> None:
         """Cria a página de dashboard"""
         try:
-            # Dados resumidos
-            sales_data = await self.data_service.get_sample_sales_data(days=30)
-            product_data = await self.data_service.get_sample_product_data(count=10)
-            
-            # Estatísticas gerais
-            total_sales = sum([item['value'] for item in sales_data])
-            avg_daily = total_sales / 30
-            total_products = len(product_data)
-            
-            # Stats card
-            await self.stats.create(q,
-                title="📊 Resumo Geral - 30 dias",
-                metrics=[
-                    {'label': 'Vendas Total', 'value': f'${total_sales:,.2f}', 'delta': '+12.5%'},
-                    {'label': 'Média Diária', 'value': f'${avg_daily:,.2f}', 'delta': '+8.3%'},
-                    {'label': 'Produtos Ativos', 'value': str(total_products), 'delta': '+2'},
-                    {'label': 'Conversão', 'value': '3.4%', 'delta': '+0.8%'}
-                ]
-            )
-            
-            # Chart card
-            await self.chart.create(q,
-                title="📈 Vendas dos Últimos 30 Dias",
-                chart_data=sales_data,
-                chart_type='line'
-            )
+            # Stats e gráfico compartilhados: só o frame vai para o cliente
+            await self.broadcast.mount(q, f'{self.card_id}_summary', box='content')
             
             # Quick actions
             q.page[f'{self.card_id}_actions'] = ui.form_card(
@@ -103,7 +112,7 @@ class SalesPage(BaseCard):
             sales_data = await self.data_service.get_sample_sales_data(days=days)
             
             # Cálculos
-            total_sales = sum([item['value'] for item in sales_data])
+            total_sales = sum([item['vendas'] for item in sales_data])
             avg_sale = total_sales / len(sales_data) if sales_data else 0
             
             # Stats
@@ -6,6 +6,7 @@ from typing import List, Dict, Any
 from h2o_wave import ui
 
 from .base import BaseComponent
+from core.diff import publish_card
 
 
 class StatsComponent(BaseComponent):
@@ -26,18 +27,18 @@ class StatsComponent(BaseComponent):
             stat_items.append(ui.stat(
                 label=stat.get('label', 'Label'),
                 value=str(stat.get('value', '0')),
+                caption=stat.get('caption'),
                 icon=stat.get('icon', 'Info')
             ))
         
-        q.page[self.component_id] = ui.form_card(
+        publish_card(q, self.component_id, ui.form_card(
             box=box,
             title=title,
             items=[ui.stats(items=stat_items)]
-        )
+        ))
     
     def update(self, q, **kwargs):
-        """Atualiza as estatísticas com novos dados"""
-        # Re-criar com os novos dados
+        """Atualiza as estatísticas com novos dados (envia só os valores alterados)"""
         self.create(q, **kwargs)
     
     def render(self, data: List[Dict[str, Any]] = None, **kwargs) -> ui.FormCard:
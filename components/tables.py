@@ -2,39 +2,239 @@
 Componente de tabelas reutilizável.
 """
 
-from typing import List, Dict, Any
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Tuple
+import inspect
+
 from h2o_wave import ui
+import numpy as np
+import pandas as pd
 
 from .base import BaseComponent
+from core.diff import publish_card, forget_card
 
 
 class TableComponent(BaseComponent):
-    """Componente para exibir tabelas com dados dinâmicos"""
-    
-    def __init__(self, component_id: str):
+    """
+    Componente para exibir tabelas com dados dinâmicos.
+
+    Modo cliente (``create``): todas as linhas vão para o navegador.
+    Modo servidor (``create_server``): a tabela guarda uma referência à fonte
+    (DataFrame ou função/corrotina que o retorna, ex: consulta do DataService),
+    envia só a página atual e trata paginação, ordenação, filtro e busca no
+    servidor. Permutações de ordenação e índices de visão ficam em cache e são
+    compartilhados entre clientes; por sessão só se guarda offset/ordem/busca.
+    """
+
+    # Quantidade de visões (ordem + busca + filtros) mantidas em cache
+    max_cached_views = 32
+
+    def __init__(self, component_id: str, rows_per_page: int = 50):
         super().__init__(component_id)
-    
-    def create(self, q, table_data: List[Dict[str, Any]] = None, 
+        self.rows_per_page = rows_per_page
+        self.source = None
+        self._frame: Optional[pd.DataFrame] = None
+        self._sort_cache: Dict[Tuple[str, bool], np.ndarray] = {}
+        self._text_cache: Dict[Tuple[str, bool], pd.Series] = {}
+        self._view_cache: 'OrderedDict[Tuple, np.ndarray]' = OrderedDict()
+
+    @property
+    def table_name(self) -> str:
+        return f'{self.component_id}_table'
+
+    def create(self, q, table_data: List[Dict[str, Any]] = None,
                box: str = 'content', title: str = 'Tabela', **kwargs):
         """Cria o componente de tabela na página Wave"""
         if not table_data:
             table_data = [{'coluna1': 'Sem dados', 'coluna2': 'Sem dados'}]
-        
+
         # Extrair colunas dos dados
-        columns = [ui.table_column(name=col, label=col.title()) 
+        columns = [ui.table_column(name=col, label=col.title())
                   for col in table_data[0].keys()]
-        
+
         # Criar linhas
-        rows = [ui.table_row(name=f'row_{i}', cells=[str(row[col]) for col in table_data[0].keys()]) 
+        rows = [ui.table_row(name=f'row_{i}', cells=[str(row[col]) for col in table_data[0].keys()])
                 for i, row in enumerate(table_data)]
-        
-        q.page[self.component_id] = ui.form_card(
+
+        publish_card(q, self.component_id, ui.form_card(
             box=box,
             title=title,
-            items=[ui.table(name=f'{self.component_id}_table', columns=columns, rows=rows)]
-        )
-    
+            items=[ui.table(name=self.table_name, columns=columns, rows=rows)]
+        ))
+
     def update(self, q, **kwargs):
-        """Atualiza a tabela com novos dados"""
-        # Re-criar com os novos dados
+        """Atualiza a tabela com novos dados (envia só as linhas/células alteradas)"""
         self.create(q, **kwargs)
+
+    # --- Modo servidor ---
+
+    def set_source(self, source) -> None:
+        """Define a fonte de dados (DataFrame ou função que o retorna) e limpa os caches"""
+        self.source = source
+        self.refresh_source()
+
+    def _same_source(self, source) -> bool:
+        """
+        Mesma fonte: identidade para dados, igualdade para funções (métodos ligados
+        recriados a cada render são iguais). Lambdas novas contam como fonte nova:
+        passe uma função estável ou use ``set_source``/``refresh_source``.
+        """
+        if source is self.source:
+            return True
+        if callable(source) and callable(self.source):
+            return source == self.source
+        return False
+
+    def refresh_source(self) -> None:
+        """Descarta o DataFrame resolvido e os caches derivados (a fonte mudou)"""
+        self._frame = None
+        self._sort_cache.clear()
+        self._text_cache.clear()
+        self._view_cache.clear()
+
+    async def get_frame(self) -> pd.DataFrame:
+        """Resolve a fonte uma vez e reaproveita o DataFrame entre clientes"""
+        if self._frame is None:
+            source = self.source
+            if callable(source):
+                source = source()
+            if inspect.isawaitable(source):
+                source = await source
+            if not isinstance(source, pd.DataFrame):
+                source = pd.DataFrame(source or [])
+            self._frame = source.reset_index(drop=True)
+        return self._frame
+
+    def _view_state(self, q) -> Dict[str, Any]:
+        views = getattr(q.client, 'table_views', None)
+        if views is None:
+            views = {}
+            q.client.table_views = views
+        view = views.get(self.component_id)
+        if view is None:
+            view = views[self.component_id] = {'offset': 0, 'sort': None, 'search': '', 'filters': {}}
+        return view
+
+    async def create_server(self, q, source=None, box: str = 'content', title: str = 'Tabela',
+                            columns: List[str] = None, labels: Dict[str, str] = None,
+                            rows_per_page: int = None, **kwargs):
+        """Cria a tabela paginada no servidor com a primeira página da fonte"""
+        if source is not None and not self._same_source(source):
+            self.set_source(source)
+        if rows_per_page:
+            self.rows_per_page = rows_per_page
+
+        frame = await self.get_frame()
+        columns = columns or [str(col) for col in frame.columns]
+        labels = labels or {}
+        view = self._view_state(q)
+        view.update(columns=columns, offset=0)
+
+        rows, total = self._page_rows(frame, view)
+        publish_card(q, self.component_id, ui.form_card(
+            box=box,
+            title=title,
+            items=[ui.table(
+                name=self.table_name,
+                columns=[ui.table_column(name=col, label=labels.get(col, col.title()),
+                                         sortable=True, filterable=kwargs.get('filterable', False),
+                                         searchable=True)
+                         for col in columns],
+                rows=rows,
+                pagination=ui.table_pagination(total_rows=total, rows_per_page=self.rows_per_page),
+                events=['page_change', 'sort', 'filter', 'search', 'reset'],
+                height=kwargs.get('height')
+            )]
+        ))
+
+    async def handle_events(self, q, state=None, args=None, **kwargs):
+        table_events = q.events[self.table_name] if q.events else None
+        if table_events and self.source is not None:
+            await self.on_table_event(q, table_events)
+            return True
+        return await super().handle_events(q, state=state, args=args, **kwargs)
+
+    async def on_table_event(self, q, events) -> None:
+        """Aplica paginação/ordem/filtro/busca do evento e envia só a página resultante"""
+        view = self._view_state(q)
+        if events.reset:
+            view.update(offset=0, sort=None, search='', filters={})
+        if events.sort:
+            column, reverse = next(iter(events.sort.items()))
+            view.update(sort=(column, not reverse), offset=0)
+        if events.filter is not None:
+            view.update(filters={col: list(values) for col, values in (events.filter or {}).items() if values},
+                        offset=0)
+        if events.search is not None:
+            view.update(search=events.search or '', offset=0)
+        if events.page_change:
+            view['offset'] = max(0, int(events.page_change.get('offset', 0)))
+
+        frame = await self.get_frame()
+        rows, total = self._page_rows(frame, view)
+        table = q.page[self.component_id].items[0].table
+        table.rows = rows
+        table.pagination = ui.table_pagination(total_rows=total, rows_per_page=self.rows_per_page)
+        # Linhas alteradas fora de publish_card: a sombra do card não vale mais
+        forget_card(q, self.component_id)
+
+    def _page_rows(self, frame: pd.DataFrame, view: Dict[str, Any]):
+        """Linhas da página atual e total de linhas da visão"""
+        positions = self._view_index(frame, view)
+        total = len(positions)
+        offset = min(view['offset'], max(0, total - 1))
+        page = positions[offset:offset + self.rows_per_page]
+        columns = view.get('columns') or list(frame.columns)
+        cells = frame.iloc[page][columns].astype(str).values.tolist()
+        rows = [ui.table_row(name=str(position), cells=row_cells) for position, row_cells in zip(page.tolist(), cells)]
+        return rows, total
+
+    def _view_index(self, frame: pd.DataFrame, view: Dict[str, Any]) -> np.ndarray:
+        """Posições das linhas da visão (ordenadas e filtradas), em cache por visão"""
+        filters = tuple(sorted((col, tuple(values)) for col, values in view['filters'].items()))
+        key = (view['sort'], view['search'], filters, tuple(view.get('columns') or ()))
+        cached = self._view_cache.get(key)
+        if cached is not None:
+            self._view_cache.move_to_end(key)
+            return cached
+
+        if view['sort']:
+            positions = self._sort_permutation(frame, *view['sort'])
+        else:
+            positions = np.arange(len(frame))
+
+        mask = None
+        for column, values in view['filters'].items():
+            if column in frame.columns:
+                column_mask = self._text_column(frame, column).isin([str(v) for v in values]).to_numpy()
+                mask = column_mask if mask is None else mask & column_mask
+        if view['search']:
+            term = view['search'].lower()
+            search_mask = np.zeros(len(frame), dtype=bool)
+            for column in view.get('columns') or frame.columns:
+                search_mask |= self._text_column(frame, column, lower=True).str.contains(term, regex=False, na=False).to_numpy()
+            mask = search_mask if mask is None else mask & search_mask
+        if mask is not None:
+            positions = positions[mask[positions]]
+
+        self._view_cache[key] = positions
+        if len(self._view_cache) > self.max_cached_views:
+            self._view_cache.popitem(last=False)
+        return positions
+
+    def _sort_permutation(self, frame: pd.DataFrame, column: str, ascending: bool) -> np.ndarray:
+        key = (column, ascending)
+        permutation = self._sort_cache.get(key)
+        if permutation is None:
+            permutation = frame[column].sort_values(ascending=ascending, kind='stable').index.to_numpy()
+            self._sort_cache[key] = permutation
+        return permutation
+
+    def _text_column(self, frame: pd.DataFrame, column: str, lower: bool = False) -> pd.Series:
+        """Coluna convertida para texto (e opcionalmente minúsculas), em cache"""
+        key = (column, lower)
+        text = self._text_cache.get(key)
+        if text is None:
+            text = self._text_column(frame, column).str.lower() if lower else frame[column].astype(str)
+            self._text_cache[key] = text
+        return text
@@ -4,7 +4,8 @@ Contains the main application class and core functionality.
 """
 
 from .app import WaveApp
+from .routing import Route, RouteTable
 from .config import AppConfig, get_config
 from .state import StateManager
 
-__all__ = ['WaveApp', 'AppConfig', 'get_config', 'StateManager']
+__all__ = ['WaveApp', 'AppConfig', 'get_config', 'StateManager', 'Route', 'RouteTable']
@@ -3,10 +3,9 @@ Classe principal da aplicação Wave - DAZE Template
 Versão atualizada para estratégias flexíveis de arquivos estáticos
 """
 
-from typing import Dict, Type, Optional, List
+from typing import Dict, Type, Optional, List, Set
 from h2o_wave import main, app, Q, ui, on, run_on
 import asyncio
-import logging
 import sys
 import os
 
@@ -17,10 +16,22 @@ if project_root not in sys.path:
 
 from core.config import get_config
 from core.state import StateManager
+from core.routing import Routable, RouteTable, default_dispatch
+from core.log import get_logger, ensure_logging, SampledTrace
+from core.coalescing import EventCoalescer, SUPERSEDED
+from core.executor import INLINE, call_handler
+from core.memo import RenderMemo
+from core.flush import mark_dirty, end_cycle
+from core.broadcast import BroadcastHub
 
 
+def _cancel_loads(q: Q) -> None:
+    """Interrompe as cargas do cliente (import tardio: services importa core)"""
+    from services.data_service import DataService
+    DataService.cancel_loads(q)
 
-class WaveApp:
+
+class WaveApp(Routable):
     """Classe principal da aplicação Wave - DAZE Template"""
     def __init__(self, static_strategy: str = "minimal"):
         self.config = get_config()
@@ -29,15 +40,66 @@ class WaveApp:
         self.auth_manager: Optional['AuthManager'] = None
         self.static_strategy = static_strategy
         self.static_manager = None
-        self.logger = logging.getLogger(__name__)
+        ensure_logging(self.config.log_level)
+        self.logger = get_logger('app')
+        self._trace = SampledTrace(self.logger, self.config.log_trace_sample)
         self.handlers = {}
         self.debug = False
+        self.active_route_only = self.config.active_route_only
+        self.global_pages: Set[str] = set(self.config.global_pages)
+        self.coalescer = EventCoalescer()
+        for event_name in self.config.coalesce_events:
+            self.coalescer.register(event_name, debounce=self.config.coalesce_debounce)
 
-    def add_page(self, name, page):
+    def add_page(self, name, page, global_page=False):
         self.pages[name] = page
+        self.attach_route_child(page)
+        if global_page:
+            self.global_pages.add(name)
+
+    def get_page(self, route):
+        return self.pages.get(route)
+
+    def set_active_route_only(self, enabled, global_pages=None):
+        """Restringe despacho e render à página atual do cliente (+ páginas globais)"""
+        self.active_route_only = enabled
+        if global_pages is not None:
+            self.global_pages = set(global_pages)
+
+    def get_current_route(self, q):
+        """Rota atual do cliente (definida por navigate_to_page) ou a rota padrão"""
+        route = self.state_manager.get_client_value(q, 'current_page')
+        return route if route in self.pages else self.get_default_route()
 
-    def register_handler(self, event_name, handler):
+    def get_active_pages(self, q) -> Optional[Set[str]]:
+        """Páginas que recebem eventos/render neste ciclo; None significa todas"""
+        if not self.active_route_only:
+            return None
+        return self.global_pages | {self.get_current_route(q)}
+
+    def register_handler(self, event_name, handler, debounce=None, coalesce=False, group=None):
         self.handlers[event_name] = handler
+        self.invalidate_routes()
+        if coalesce or debounce:
+            self.coalesce_event(event_name, debounce=debounce, group=group)
+
+    def coalesce_event(self, event_name, debounce=None, group=None):
+        """
+        Processa só a entrada mais recente do evento por cliente.
+        Eventos com o mesmo ``group`` formam uma única classe de coalescência.
+        """
+        if debounce is None:
+            debounce = self.config.coalesce_debounce
+        self.coalescer.register(event_name, debounce=debounce, group=group)
+
+    def build_routes(self, table: RouteTable) -> None:
+        """Handlers do app têm precedência sobre as páginas"""
+        self.add_handler_routes(table, self.handlers)
+        self.add_child_routes(table, self.pages)
+
+    def describe_routes(self):
+        """Retorna a tabela de rotas compilada (evento → handlers) para inspeção"""
+        return self.route_table.describe()
 
     def set_debug(self, debug):
         self.debug = debug
@@ -59,40 +121,66 @@ class WaveApp:
             return args['__kv']
         return args
 
-    def register_wave_event(self, event_name):
+    def register_wave_event(self, event_name, debounce=None, coalesce=False, group=None):
+        if coalesce or debounce:
+            self.coalesce_event(event_name, debounce=debounce, group=group)
+
         @on(event_name)
         async def handler(q: Q):
-            print(f"[DAZE][ON] Evento '{event_name}' recebido via @on")
-            args = self.get_args(q)
-            if args:
-                q.client.last_event = args.copy() if hasattr(args, 'copy') else dict(args)
-            await self.handle_events(q, args=args)
-            self.render(q)
-            await q.page.save()
+            self.logger.debug("Evento '%s' recebido via @on", event_name)
+            await self.serve(q)
+
+    async def serve(self, q: Q):
+        """
+        Ciclo completo de um evento: despacho, render e um único save no final.
+        Handlers e renders apenas marcam a página como suja (core.flush.mark_dirty).
+        """
+        args = self.get_args(q)
+        if args:
+            q.client.last_event = args.copy() if hasattr(args, 'copy') else dict(args)
+        try:
+            result = await self.handle_events(q, args=args)
+            if result is not SUPERSEDED:
+                await self.render_async(q)
+            return result
+        except asyncio.CancelledError:
+            # Ciclo abandonado (cliente saiu, servidor encerrando): leituras em blocos param também
+            _cancel_loads(q)
+            raise
+        finally:
+            await end_cycle(q)
 
+    @default_dispatch
     async def handle_events(self, q, state=None, args=None):
         if args is None or not args:
             args = getattr(q.client, 'last_event', {})
         if not isinstance(args, dict):
             args = {}
-        print(f"[DAZE][APP] handle_events: args={args}")
-        for event_name, handler in self.handlers.items():
-            if args.get(event_name):
-                print(f"[DAZE][APP] handler found: {event_name}")
-                return await handler(q, state=state, args=args)
-        for name, page in self.pages.items():
-            page_state = state.get(name) if state else None
-            print(f"[DAZE][APP] propagating to page: {name} (state={page_state})")
-            result = await page.handle_events(q, state=page_state, args=args)
-            if result:
-                print(f"[DAZE][APP] event handled by page: {name}")
-                return result
-        print(f"[DAZE][APP] event not handled at app level")
-        return None
+        self._trace('handle_events: keys=%s', tuple(args))
+        policy = self.coalescer.match(args, q.events)
+        if policy is not None:
+            return await self.coalescer.run(q, policy, lambda: self._dispatch(q, state, args))
+        return await self._dispatch(q, state, args)
+
+    async def _dispatch(self, q, state, args):
+        result = await self.route_table.dispatch(q, state=state, args=args, scope=self.get_active_pages(q))
+        if result is None:
+            self._trace('event not handled at app level')
+        return result
 
     def render(self, q, state=None):
+        active = self.get_active_pages(q)
+        for name, page in self.pages.items():
+            if active is None or name in active:
+                page.render(q, state=state.get(name) if state else None)
+
+    async def render_async(self, q, state=None):
+        """Como render, aguardando páginas async e usando o pool para renders bloqueantes"""
+        active = self.get_active_pages(q)
         for name, page in self.pages.items():
-            page.render(q, state=state.get(name) if state else None)
+            if active is None or name in active:
+                await call_handler(page.render, q, state=state.get(name) if state else None,
+                                   policy=getattr(page, 'execution_policy', INLINE))
 
     # --- Exemplo funcional minimalista removido ---
     
@@ -102,16 +190,16 @@ class WaveApp:
             if css_url:
                 # Método mais simples para adicionar CSS
                 q.page.add_meta(ui.stylesheet(css_url))
-                self.logger.info(f"Stylesheet adicionado: {css_url}")
+                self.logger.info("Stylesheet adicionado: %s", css_url)
             
         except Exception as e:
-            self.logger.error(f"❌ Erro ao adicionar stylesheet: {e}")
+            self.logger.error("❌ Erro ao adicionar stylesheet: %s", e)
     
     async def navigate_to_page(self, q: Q, route: str) -> None:
-        """Navega para uma página específica"""
+        """Navega para uma página específica (o save fica para o fim do ciclo)"""
         page = self.get_page(route)
         if not page:
-            self.logger.warning(f"Página não encontrada: {route}")
+            self.logger.warning("Página não encontrada: %s", route)
             await self.show_error_page(q, f"Página '{route}' não encontrada")
             return
         
@@ -119,7 +207,14 @@ class WaveApp:
         try:
             self.state_manager.clear_cards(q, ignore={'meta', 'sidebar', 'header'})
         except Exception as e:
-            self.logger.debug(f"Erro ao limpar cards (normal na inicialização): {e}")
+            self.logger.debug("Erro ao limpar cards (normal na inicialização): %s", e)
+        
+        # Cards da página anterior saíram da tela: nada do que foi memoizado vale mais
+        RenderMemo.get_instance().invalidate(q)
+        # Frames compartilhados também: a página nova monta os seus de novo
+        BroadcastHub.get_instance().unmount(q)
+        # Cargas iniciadas pela página anterior não têm mais quem as exiba
+        _cancel_loads(q)
         
         # Definir página atual
         self.state_manager.set_client_state(q, 'current_page', route)
@@ -127,9 +222,9 @@ class WaveApp:
         # Renderizar página
         try:
             await page.render(q)
-            await q.page.save()
+            mark_dirty(q)
         except Exception as e:
-            self.logger.error(f"Erro ao renderizar página {route}: {e}")
+            self.logger.error("Erro ao renderizar página %s: %s", route, e)
             await self.show_error_page(q, str(e))
     
     def get_default_route(self) -> str:
@@ -148,4 +243,4 @@ class WaveApp:
                 ui.button('home', label='Voltar ao Início', primary=True)
             ]
         )
-        await q.page.save()
+        mark_dirty(q)
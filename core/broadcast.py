@@ -0,0 +1,179 @@
+"""
+Páginas compartilhadas (broadcast) no nível do site.
+
+Cards iguais para todos os usuários (KPIs, gráficos gerais) são renderizados uma
+única vez numa página do site (``q.site['/daze/shared/<nome>']``) e atualizados
+por uma única tarefa em segundo plano. Cada cliente só monta um ``frame_card``
+apontando para essa página, então os dados são calculados e guardados uma vez,
+não uma vez por cliente. Cards por usuário continuam em ``q.page``.
+
+O builder recebe um contexto parecido com ``Q`` (``page``, ``client``, ``site``)
+e escreve nele como faria num render normal, inclusive via ``publish_card``: a
+cada atualização só as mudanças seguem para o site.
+
+Só páginas com clientes montados são atualizadas: ``mount`` registra o cliente
+(referência fraca ao ``q.client``, que some quando o Wave o desconecta) e
+``unmount`` o remove ao sair da página. Sem nenhum cliente, a tarefa termina e
+volta no próximo ``mount``.
+"""
+
+from typing import Any, Callable, Dict, Optional
+import asyncio
+import time
+import weakref
+
+from h2o_wave import ui, Expando
+
+from core.config import get_config
+from core.diff import publish_card
+from core.executor import INLINE, call_handler
+from core.log import get_logger
+
+logger = get_logger('broadcast')
+
+SHARED_PREFIX = '/daze/shared'
+
+
+class SharedContext:
+    """Contexto tipo Q para renderizar na página compartilhada do site"""
+
+    def __init__(self, site, path: str):
+        self.site = site
+        self.page = site[path]
+        self.client = Expando()
+        self.app = Expando()
+        self.args = Expando()
+        self.events = Expando()
+
+
+class SharedPage:
+    """Página do site com os cards de um builder compartilhado"""
+
+    __slots__ = ('name', 'path', 'builder', 'interval', 'policy', 'context', 'updated', 'lock', 'viewers')
+
+    def __init__(self, name: str, builder: Callable, interval: float, policy: str):
+        self.name = name
+        self.path = f'{SHARED_PREFIX}/{name}'
+        self.builder = builder
+        self.interval = interval
+        self.policy = policy
+        self.context: Optional[SharedContext] = None
+        self.updated = 0.0
+        self.lock = asyncio.Lock()
+        self.viewers = weakref.WeakSet()
+
+    def stale(self) -> bool:
+        return not self.updated or bool(self.interval and time.monotonic() - self.updated >= self.interval)
+
+
+class BroadcastHub:
+    """Registro de páginas compartilhadas e tarefa única de atualização"""
+    _instance = None
+
+    def __init__(self):
+        self.pages: Dict[str, SharedPage] = {}
+        self.site = None
+        self.refreshes = 0
+        self._task: Optional[asyncio.Task] = None
+
+    @classmethod
+    def get_instance(cls):
+        if cls._instance is None:
+            cls._instance = BroadcastHub()
+        return cls._instance
+
+    def register(self, name: str, builder: Callable, interval: float = None,
+                 policy: str = INLINE) -> str:
+        """
+        Registra um builder compartilhado; retorna o caminho da página no site.
+        Registrar de novo o mesmo nome mantém o primeiro (páginas instanciadas várias vezes).
+        """
+        shared = self.pages.get(name)
+        if shared is None:
+            if interval is None:
+                interval = get_config().broadcast_interval
+            shared = self.pages[name] = SharedPage(name, builder, interval, policy)
+        return shared.path
+
+    async def refresh(self, name: str) -> None:
+        """Executa o builder e envia as mudanças para a página do site"""
+        shared = self.pages[name]
+        async with shared.lock:
+            await self._refresh(shared)
+
+    async def _refresh(self, shared: SharedPage) -> None:
+        if shared.context is None:
+            shared.context = SharedContext(self.site, shared.path)
+            # Página sem app: uma zona única ocupando o frame
+            shared.context.page['meta'] = ui.meta_card(box='', layouts=[
+                ui.layout(breakpoint='xs', zones=[ui.zone('content')])
+            ])
+        await call_handler(shared.builder, shared.context, policy=shared.policy)
+        await shared.context.page.save()
+        shared.updated = time.monotonic()
+        self.refreshes += 1
+
+    async def mount(self, q, name: str, box: str, card_name: str = None) -> None:
+        """Monta a página compartilhada no cliente (renderiza na primeira vez)"""
+        shared = self.pages[name]
+        if self.site is None:
+            self.site = q.site
+        if not shared.viewers and shared.stale():
+            # Primeira montagem ou página parada sem clientes: atualiza antes de mostrar
+            async with shared.lock:
+                # Vários clientes chegando juntos: só o primeiro renderiza
+                if not shared.viewers and shared.stale():
+                    await self._refresh(shared)
+        shared.viewers.add(q.client)
+        self.start()
+        publish_card(q, card_name or name, ui.frame_card(box=box, title='', path=shared.path, compact=True))
+
+    def unmount(self, q, name: str = None) -> None:
+        """Remove o cliente dos espectadores de uma página compartilhada (ou de todas)"""
+        for shared in ([self.pages[name]] if name else self.pages.values()):
+            shared.viewers.discard(q.client)
+
+    def viewers(self, name: str) -> int:
+        return len(self.pages[name].viewers)
+
+    def start(self) -> None:
+        """Inicia a tarefa de atualização (uma por processo)"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._run())
+            self._task.add_done_callback(self._task_done)
+
+    @staticmethod
+    def _task_done(task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Tarefa de atualização das páginas compartilhadas falhou",
+                         exc_info=task.exception())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def _tick(self) -> float:
+        intervals = [shared.interval for shared in self.pages.values() if shared.interval]
+        return max(0.1, min(intervals)) if intervals else 1.0
+
+    async def _run(self) -> None:
+        while any(shared.viewers for shared in self.pages.values()):
+            await asyncio.sleep(self._tick())
+            for shared in list(self.pages.values()):
+                if not shared.viewers or not shared.updated or not shared.stale():
+                    continue
+                try:
+                    async with shared.lock:
+                        await self._refresh(shared)
+                except Exception:
+                    logger.exception("Falha ao atualizar página compartilhada '%s'", shared.name)
+
+    def stats(self) -> Dict[str, Any]:
+        return {'pages': len(self.pages), 'refreshes': self.refreshes,
+                'viewers': sum(len(shared.viewers) for shared in self.pages.values()),
+                'running': self._task is not None and not self._task.done()}
@@ -0,0 +1,118 @@
+"""
+Coalescência e debounce de eventos por cliente.
+
+Eventos de uma mesma classe (grupo) são serializados por cliente e só a entrada
+mais recente é processada: enquanto um evento do grupo está em execução, os que
+chegam ficam na fila e são descartados se outro mais novo os substituir antes
+da vez deles. Cada evento pode declarar uma janela de debounce.
+
+A política vale para o componente que disparou o evento (``__wave_submission_name__``
+nos args, ou o nome em ``q.events``), não para qualquer chave presente: o Wave
+envia os valores de todo o formulário a cada evento, então um clique num botão
+traz junto os valores dos filtros e não deve ser atrasado nem descartado. As
+entradas coalescidas precisam de ``trigger=True`` para disparar sozinhas.
+"""
+
+from typing import Any, Awaitable, Callable, Dict, Optional
+import asyncio
+
+from core.log import get_logger
+
+logger = get_logger('app')
+
+# Resultado de um evento substituído por outro mais recente do mesmo grupo
+SUPERSEDED = type('Superseded', (), {'__repr__': lambda self: 'SUPERSEDED'})()
+
+# Arg com o nome do componente que disparou o evento (botão ou entrada com trigger)
+SUBMISSION_KEY = '__wave_submission_name__'
+
+
+def _get(values: Any, key: str) -> Any:
+    """Valor de um dict ou Expando (None se ausente)"""
+    return values.get(key) if isinstance(values, dict) else values[key]
+
+
+def event_source(args: Any) -> Optional[str]:
+    """Nome do componente que disparou o evento (args em dict ou ``q.args``)"""
+    name = _get(args, SUBMISSION_KEY) if args else None
+    return str(name) if name else None
+
+
+class EventPolicy:
+    """Política de coalescência de um evento"""
+
+    __slots__ = ('event_name', 'debounce', 'group')
+
+    def __init__(self, event_name: str, debounce: float = 0.0, group: Optional[str] = None):
+        self.event_name = event_name
+        self.debounce = max(0.0, float(debounce or 0.0))
+        self.group = group or event_name
+
+
+class _ClientGroup:
+    """Estado de um grupo de eventos para um cliente"""
+
+    __slots__ = ('generation', 'lock')
+
+    def __init__(self):
+        self.generation = 0
+        self.lock = asyncio.Lock()
+
+
+class EventCoalescer:
+    """Aplica as políticas de coalescência/debounce aos eventos de cada cliente"""
+
+    def __init__(self):
+        self.policies: Dict[str, EventPolicy] = {}
+
+    def register(self, event_name: str, debounce: float = 0.0, group: Optional[str] = None) -> EventPolicy:
+        policy = EventPolicy(event_name, debounce, group)
+        self.policies[event_name] = policy
+        return policy
+
+    def match(self, args: Dict[str, Any], events: Any = None) -> Optional[EventPolicy]:
+        """Política do componente que disparou o evento (None: despacha na hora)"""
+        if not self.policies:
+            return None
+        source = event_source(args)
+        if source is not None:
+            return self.policies.get(source)
+        # Eventos de componente (q.events.<nome>) não trazem o nome da submissão
+        if events:
+            for name, policy in self.policies.items():
+                if _get(events, name) is not None:
+                    return policy
+        return None
+
+    @staticmethod
+    def _client_group(q, group: str) -> _ClientGroup:
+        groups = getattr(q.client, 'event_groups', None)
+        if groups is None:
+            groups = {}
+            q.client.event_groups = groups
+        state = groups.get(group)
+        if state is None:
+            state = groups[group] = _ClientGroup()
+        return state
+
+    async def run(self, q, policy: EventPolicy, func: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Executa ``func`` se este ainda for o evento mais recente do grupo.
+        Retorna ``SUPERSEDED`` quando uma entrada mais nova o substituiu.
+        """
+        state = self._client_group(q, policy.group)
+        state.generation += 1
+        generation = state.generation
+
+        if policy.debounce:
+            await asyncio.sleep(policy.debounce)
+            if state.generation != generation:
+                logger.debug("Evento '%s' descartado no debounce", policy.event_name)
+                return SUPERSEDED
+
+        async with state.lock:
+            # Uma entrada mais nova chegou enquanto este aguardava a vez
+            if state.generation != generation:
+                logger.debug("Evento '%s' substituído por entrada mais recente", policy.event_name)
+                return SUPERSEDED
+            return await func()
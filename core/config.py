@@ -3,7 +3,7 @@ Configurações centralizadas da aplicação Wave.
 """
 
 from dataclasses import dataclass
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 import os
 
 
@@ -30,14 +30,33 @@ class AppConfig:
     port: int = 10101
     debug: bool = False
     
+    # Configurações de logging
+    log_level: str = "INFO"  # TRACE, DEBUG, INFO, WARNING, ERROR
+    log_trace_sample: int = 1  # registra 1 a cada N linhas de trace do despacho
+    
     # Configurações de layout
     default_layout: str = "default"
     sidebar_width: str = "250px"
     header_height: str = "80px"
     
+    # Configurações de despacho
+    active_route_only: bool = False  # eventos e render só na página atual do cliente
+    global_pages: List[str] = None  # páginas sempre ativas no modo active_route_only
+    coalesce_events: List[str] = None  # eventos em que só a entrada mais recente é processada
+    coalesce_debounce: float = 0.0  # janela de debounce padrão (segundos) desses eventos
+    
+    # Configurações de execução
+    executor_workers: int = 4  # threads para handlers/renders bloqueantes
+    broadcast_interval: float = 5.0  # segundos entre atualizações das páginas compartilhadas
+    
     # Configurações de dados
     max_upload_size: int = 100 * 1024 * 1024  # 100MB
     temp_dir: str = "temp"
+    data_cache_ttl: float = 300.0  # segundos de validade padrão do cache do DataService
+    data_cache_soft_ttl: Optional[float] = None  # a partir daqui serve o valor velho e recarrega em segundo plano
+    data_cache_max_entries: int = 1024  # entradas por namespace do cache
+    data_cache_max_bytes: int = 256 * 1024 * 1024  # teto global aproximado do cache
+    result_cache_max_bytes: int = 64 * 1024 * 1024  # parte do cache para resultados de process_dataframe
     
     # Configurações customizadas
     custom_settings: Dict[str, Any] = None
@@ -45,6 +64,10 @@ class AppConfig:
     def __post_init__(self):
         if self.custom_settings is None:
             self.custom_settings = {}
+        if self.global_pages is None:
+            self.global_pages = []
+        if self.coalesce_events is None:
+            self.coalesce_events = []
 
 
 # Instância global de configuração
@@ -62,6 +85,18 @@ def get_config() -> AppConfig:
         _config.theme = os.getenv("WAVE_THEME", _config.theme)
         _config.debug = os.getenv("WAVE_DEBUG", "false").lower() == "true"
         _config.auth_enabled = os.getenv("WAVE_AUTH_ENABLED", "true").lower() == "true"
+        _config.log_level = os.getenv("WAVE_LOG_LEVEL", _config.log_level)
+        _config.log_trace_sample = int(os.getenv("WAVE_LOG_TRACE_SAMPLE", _config.log_trace_sample))
+        _config.executor_workers = int(os.getenv("WAVE_EXECUTOR_WORKERS", _config.executor_workers))
+        _config.broadcast_interval = float(os.getenv("WAVE_BROADCAST_INTERVAL", _config.broadcast_interval))
+        _config.data_cache_ttl = float(os.getenv("WAVE_DATA_CACHE_TTL", _config.data_cache_ttl))
+        soft_ttl = os.getenv("WAVE_DATA_CACHE_SOFT_TTL")
+        if soft_ttl:
+            _config.data_cache_soft_ttl = float(soft_ttl)
+        _config.data_cache_max_entries = int(os.getenv("WAVE_DATA_CACHE_MAX_ENTRIES", _config.data_cache_max_entries))
+        _config.data_cache_max_bytes = int(os.getenv("WAVE_DATA_CACHE_MAX_BYTES", _config.data_cache_max_bytes))
+        _config.result_cache_max_bytes = int(os.getenv("WAVE_RESULT_CACHE_MAX_BYTES", _config.result_cache_max_bytes))
+        _config.active_route_only = os.getenv("WAVE_ACTIVE_ROUTE_ONLY", "false").lower() == "true"
         
     return _config
 
@@ -0,0 +1,130 @@
+"""
+Diff de payloads de cards por cliente.
+
+Cada cliente guarda uma cópia-sombra do último payload enviado para cada card.
+``publish_card`` compara o card novo com a sombra e envia só as atribuições
+necessárias (``q.page['x'].data = ...``, ``q.page['x'].items[0].stats.items[1].value = ...``).
+O card inteiro só é reenviado quando a estrutura muda (outro tipo de card,
+conjunto de atributos diferente, buffers ``data()``) ou quando o diff fica
+maior que o próprio card.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    from h2o_wave.core import Data
+except ImportError:
+    Data = None
+
+from core.flush import mark_dirty
+
+
+Path = Tuple[Any, ...]
+
+# Acima deste número de atribuições o reenvio completo sai mais barato
+DEFAULT_MAX_OPS = 64
+
+
+def _dump_card(card: Any) -> Optional[dict]:
+    if isinstance(card, dict):
+        return card
+    if hasattr(card, 'dump') and callable(card.dump):
+        return card.dump()
+    return None
+
+
+def _has_data_buffer(value: Any) -> bool:
+    if Data is None:
+        return False
+    if isinstance(value, Data):
+        return True
+    if isinstance(value, dict):
+        return any(_has_data_buffer(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return any(_has_data_buffer(v) for v in value)
+    return False
+
+
+def diff_props(old: Any, new: Any, path: Path = (), ops: Optional[List[Tuple[Path, Any]]] = None,
+               max_ops: int = DEFAULT_MAX_OPS) -> Optional[List[Tuple[Path, Any]]]:
+    """
+    Lista de atribuições (caminho, valor) que transformam ``old`` em ``new``.
+    Retorna None quando passa de ``max_ops``.
+    """
+    if ops is None:
+        ops = []
+    if isinstance(old, dict) and isinstance(new, dict):
+        if old.keys() != new.keys():
+            ops.append((path, new))
+        else:
+            for key, value in new.items():
+                if diff_props(old[key], value, path + (key,), ops, max_ops) is None:
+                    return None
+    elif isinstance(old, (list, tuple)) and isinstance(new, (list, tuple)):
+        if len(old) != len(new):
+            ops.append((path, new))
+        else:
+            for index, (old_item, new_item) in enumerate(zip(old, new)):
+                if diff_props(old_item, new_item, path + (index,), ops, max_ops) is None:
+                    return None
+    elif type(old) is not type(new) or old != new:
+        ops.append((path, new))
+    return ops if len(ops) <= max_ops else None
+
+
+def _shadow(q) -> Dict[str, dict]:
+    shadow = getattr(q.client, 'card_shadow', None)
+    if shadow is None:
+        shadow = {}
+        q.client.card_shadow = shadow
+    return shadow
+
+
+def publish_card(q, name: str, card: Any, max_ops: int = DEFAULT_MAX_OPS) -> int:
+    """
+    Envia o card para a página do cliente com o menor conjunto de mudanças.
+    Retorna o número de atribuições enviadas (-1 para substituição completa).
+    """
+    props = _dump_card(card)
+    shadow = _shadow(q)
+    mark_dirty(q)
+    previous = shadow.get(name)
+
+    ops = None
+    if (props is not None and previous is not None
+            and previous.keys() == props.keys()
+            and previous.get('view') == props.get('view')
+            and not _has_data_buffer(props)):
+        ops = diff_props(previous, props, max_ops=max_ops)
+        # Mudança no nível raiz (ex: atributos diferentes) equivale a recriar
+        if ops and any(not path for path, _ in ops):
+            ops = None
+
+    if ops is None:
+        q.page[name] = card
+        if props is not None and not _has_data_buffer(props):
+            shadow[name] = props
+        else:
+            shadow.pop(name, None)
+        return -1
+
+    ref = q.page[name]
+    for path, value in ops:
+        target = ref
+        for key in path[:-1]:
+            target = target[key]
+        target[path[-1]] = value
+    shadow[name] = props
+    return len(ops)
+
+
+def forget_card(q, name: str) -> None:
+    """Descarta a sombra de um card (removido ou escrito fora de publish_card)"""
+    shadow = getattr(q.client, 'card_shadow', None)
+    if shadow:
+        shadow.pop(name, None)
+
+
+def reset_cards(q) -> None:
+    """Descarta todas as sombras do cliente (ex: página recarregada)"""
+    q.client.card_shadow = {}
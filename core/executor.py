@@ -0,0 +1,83 @@
+"""
+Política de execução de handlers e renders.
+
+Funções de corrotina são aguardadas; funções síncronas rodam inline no event
+loop, exceto as marcadas como bloqueantes (``@blocking`` ou nós com
+``execution_policy = THREAD``), que vão para um ``ThreadPoolExecutor`` limitado
+e compartilhado pelo processo.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+import asyncio
+import functools
+import inspect
+import threading
+
+from core.config import get_config
+
+
+INLINE = 'inline'
+THREAD = 'thread'
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Pool de threads do processo (tamanho em AppConfig.executor_workers)"""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=max(1, get_config().executor_workers),
+                    thread_name_prefix='daze-worker'
+                )
+    return _executor
+
+
+def shutdown_executor(wait: bool = True) -> None:
+    """Encerra o pool; o próximo uso cria um novo com a configuração atual"""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=wait)
+            _executor = None
+
+
+def blocking(func: Callable) -> Callable:
+    """Marca um handler/render síncrono como bloqueante (pandas, I/O de arquivo)"""
+    func.__daze_blocking__ = True
+    return func
+
+
+def is_blocking(func: Callable) -> bool:
+    return getattr(func, '__daze_blocking__', False)
+
+
+def is_coroutine_function(func: Callable) -> bool:
+    """Detecta funções/métodos async, inclusive dentro de functools.partial"""
+    while isinstance(func, functools.partial):
+        func = func.func
+    return inspect.iscoroutinefunction(func)
+
+
+async def run_in_executor(func: Callable, *args, **kwargs) -> Any:
+    """Executa uma função síncrona no pool de threads do processo"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_executor(), functools.partial(func, *args, **kwargs))
+
+
+async def call_handler(func: Callable, *args, policy: str = INLINE, **kwargs) -> Any:
+    """Chama um handler ou render respeitando a política de execução"""
+    if is_coroutine_function(func):
+        return await func(*args, **kwargs)
+    if policy == THREAD or is_blocking(func):
+        result = await run_in_executor(func, *args, **kwargs)
+    else:
+        result = func(*args, **kwargs)
+    # Funções síncronas que devolvem awaitables (ex: lambdas sobre corrotinas)
+    if inspect.isawaitable(result):
+        result = await result
+    return result
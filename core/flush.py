@@ -0,0 +1,33 @@
+"""
+Um único ``q.page.save()`` por ciclo de evento.
+
+Handlers e renders só alteram ``q.page`` e marcam a página como suja
+(``mark_dirty``); o ciclo do framework (``WaveApp.serve``) chama ``end_cycle``
+no final e envia tudo num único save. Para renderização progressiva (ex: mostrar
+um esqueleto antes de uma consulta lenta, streaming de gráficos) use
+``flush_page``, que envia imediatamente o que estiver pendente.
+"""
+
+
+def mark_dirty(q) -> None:
+    """Marca a página do cliente como alterada neste ciclo"""
+    q.client.page_dirty = True
+
+
+def is_dirty(q) -> bool:
+    """True se houve marcação explícita ou há mudanças locais ainda não enviadas"""
+    return bool(getattr(q.client, 'page_dirty', False) or getattr(q.page, '_changes', None))
+
+
+async def flush_page(q) -> None:
+    """Envia agora as mudanças pendentes (flush antecipado para renderização progressiva)"""
+    q.client.page_dirty = False
+    await q.page.save()
+
+
+async def end_cycle(q) -> bool:
+    """Fim do ciclo de evento: um save se algo mudou; True se enviou"""
+    if not is_dirty(q):
+        return False
+    await flush_page(q)
+    return True
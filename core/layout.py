@@ -0,0 +1,46 @@
+"""
+Cache de layouts (meta_card) por classe de página e detecção de mudança por cliente.
+
+O meta_card de cada layout é construído uma vez por processo e reutilizado
+(trate-o como somente leitura). Cada cliente guarda a chave do layout ativo e só
+recebe ``q.page['meta']`` de novo quando essa chave muda: navegação para outra
+página ou zona de debug ligada/desligada.
+"""
+
+from typing import Any, Callable, Dict, Hashable
+
+
+class LayoutCache:
+    """Layouts construídos uma vez e reenviados só quando o layout ativo muda"""
+    _instance = None
+
+    def __init__(self):
+        self._layouts: Dict[Hashable, Any] = {}
+
+    @classmethod
+    def get_instance(cls):
+        if cls._instance is None:
+            cls._instance = LayoutCache()
+        return cls._instance
+
+    def get(self, key: Hashable, builder: Callable[[], Any]) -> Any:
+        """meta_card da chave, construído na primeira chamada"""
+        layout = self._layouts.get(key)
+        if layout is None:
+            layout = self._layouts[key] = builder()
+        return layout
+
+    def apply(self, q, key: Hashable, builder: Callable[[], Any]) -> bool:
+        """Atribui q.page['meta'] se o layout ativo do cliente for outro; True se enviou"""
+        if getattr(q.client, 'active_layout', None) == key:
+            return False
+        q.page['meta'] = self.get(key, builder)
+        q.client.active_layout = key
+        return True
+
+    def invalidate_client(self, q) -> None:
+        """Força o reenvio do layout no próximo apply (ex: página recarregada)"""
+        q.client.active_layout = None
+
+    def clear(self) -> None:
+        self._layouts.clear()
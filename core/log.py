@@ -0,0 +1,113 @@
+"""
+Logging estruturado e não bloqueante do DAZE.
+
+Os loggers ``daze.<subsistema>`` (app, page, card, component, auth) escrevem numa
+fila em memória; uma thread de ``QueueListener`` faz a formatação e o I/O, fora
+do event loop. Linhas de trace muito frequentes podem ser amostradas com
+``SampledTrace``.
+"""
+
+from typing import Iterable, Optional, Union
+import atexit
+import itertools
+import logging
+import logging.handlers
+import queue
+import sys
+
+
+TRACE = 5
+logging.addLevelName(TRACE, 'TRACE')
+
+ROOT_LOGGER = 'daze'
+SUBSYSTEMS = ('app', 'page', 'card', 'component', 'auth')
+DEFAULT_FORMAT = '%(asctime)s [%(name)s] %(levelname)s %(message)s'
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler que deixa a formatação para a thread do listener"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # A fila é local ao processo: não é preciso serializar o record aqui
+        return record
+
+
+def get_logger(subsystem: str) -> logging.Logger:
+    """Retorna o logger de um subsistema (ex: 'app' → daze.app)"""
+    return logging.getLogger(f'{ROOT_LOGGER}.{subsystem}')
+
+
+def setup_logging(level: Union[int, str] = logging.INFO,
+                  handlers: Optional[Iterable[logging.Handler]] = None,
+                  fmt: str = DEFAULT_FORMAT) -> logging.handlers.QueueListener:
+    """
+    Configura o logger raiz ``daze`` com handler de fila.
+    Chamadas repetidas substituem a configuração anterior.
+    """
+    global _listener
+    if isinstance(level, str):
+        level = logging.getLevelName(level.upper())
+        if not isinstance(level, int):
+            level = logging.INFO
+
+    if handlers is None:
+        stream_handler = logging.StreamHandler(sys.stdout)
+        handlers = [stream_handler]
+    handlers = list(handlers)
+    formatter = logging.Formatter(fmt)
+    for handler in handlers:
+        if handler.formatter is None:
+            handler.setFormatter(formatter)
+
+    shutdown_logging()
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    root = logging.getLogger(ROOT_LOGGER)
+    for handler in list(root.handlers):
+        if isinstance(handler, _DeferredQueueHandler):
+            root.removeHandler(handler)
+    root.addHandler(_DeferredQueueHandler(log_queue))
+    root.setLevel(level)
+    root.propagate = False
+
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+
+def ensure_logging(level: Union[int, str] = logging.INFO) -> None:
+    """Configura o logging apenas se ainda não houver listener ativo"""
+    if _listener is None:
+        setup_logging(level)
+
+
+def shutdown_logging() -> None:
+    """Esvazia a fila e encerra a thread do listener"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(shutdown_logging)
+
+
+class SampledTrace:
+    """
+    Emite uma a cada ``every`` linhas de trace de um ponto do código.
+    O nível é verificado antes de qualquer formatação ou contagem.
+    """
+
+    def __init__(self, logger: logging.Logger, every: int = 1):
+        self.logger = logger
+        self.every = max(1, int(every))
+        self._counter = itertools.count()
+
+    def __call__(self, msg: str, *args) -> None:
+        if not self.logger.isEnabledFor(TRACE):
+            return
+        if self.every > 1 and next(self._counter) % self.every:
+            return
+        self.logger.log(TRACE, msg, *args)
@@ -0,0 +1,98 @@
+"""
+Memoização de render por cliente.
+
+Componentes e páginas declaram as entradas do render (props, fatias do estado do
+cliente). Se o hash das entradas for igual ao do último render daquele card
+para o cliente, o render e a atribuição do card são pulados.
+
+DataFrames, Series e arrays entram pelo conteúdo completo; outros valores não
+hasheáveis geram ``TypeError`` (declare uma versão ou uma tupla no lugar).
+"""
+
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+
+def _freeze(value: Any) -> Any:
+    """Converte entradas em estrutura hashable estável"""
+    if isinstance(value, dict):
+        return tuple(sorted(((repr(k), _freeze(v)) for k, v in value.items()), key=lambda item: item[0]))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(_freeze(v) for v in value)
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        columns = tuple(map(repr, value.columns)) if isinstance(value, pd.DataFrame) else repr(value.name)
+        dtypes = tuple(map(str, value.dtypes)) if isinstance(value, pd.DataFrame) else str(value.dtype)
+        rows = pd.util.hash_pandas_object(value, index=True).to_numpy()
+        return (type(value).__name__, columns, dtypes, rows.tobytes())
+    if isinstance(value, np.ndarray):
+        if value.dtype == object:
+            return ('ndarray', value.shape, _freeze(value.ravel().tolist()))
+        return ('ndarray', value.shape, str(value.dtype), np.ascontiguousarray(value).tobytes())
+    hash(value)  # TypeError: entrada sem hash estável
+    return value
+
+
+def hash_inputs(inputs: Any) -> int:
+    return hash(_freeze(inputs))
+
+
+class RenderMemo:
+    """Registro por cliente do hash das entradas do último render de cada card"""
+    _instance = None
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def get_instance(cls):
+        if cls._instance is None:
+            cls._instance = RenderMemo()
+        return cls._instance
+
+    @staticmethod
+    def _store(q) -> Dict[str, int]:
+        store = getattr(q.client, 'render_memo', None)
+        if store is None:
+            store = {}
+            q.client.render_memo = store
+        return store
+
+    def should_render(self, q, key: str, inputs: Any) -> bool:
+        """
+        True se as entradas mudaram desde o último render de ``key`` (None sempre
+        renderiza). Entradas não hasheáveis geram ``TypeError``.
+        """
+        if inputs is None:
+            return True
+        digest = hash_inputs(inputs)
+        store = self._store(q)
+        if store.get(key) == digest:
+            self.hits += 1
+            return False
+        store[key] = digest
+        self.misses += 1
+        return True
+
+    def invalidate(self, q, key: Optional[str] = None) -> None:
+        """Força o próximo render de ``key`` (ou de todos os cards do cliente)"""
+        if key is None:
+            q.client.render_memo = {}
+        else:
+            self._store(q).pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / total, 4) if total else 0.0
+        }
+
+    def reset_stats(self) -> None:
+        self.hits = 0
+        self.misses = 0
@@ -0,0 +1,239 @@
+"""
+Tabela de rotas de eventos pré-compilada para a árvore App → Page → Card → Component.
+
+Cada nó compila uma vez a sua própria tabela (handlers registrados, métodos
+``on_<evento>`` e as tabelas dos filhos) e a reaproveita até que a árvore abaixo
+dele mude. O despacho consulta apenas as rotas das chaves presentes nos args,
+preservando a mesma precedência do percurso linear antigo:
+
+- handlers do próprio nó antes dos filhos;
+- filhos na ordem de registro;
+- em componentes, métodos ``on_<evento>`` antes dos handlers registrados.
+"""
+
+from typing import Any, Callable, Collection, Dict, Iterator, List, Optional, Tuple
+
+from core.executor import INLINE, call_handler
+
+
+HANDLER = 'handler'
+METHOD = 'method'
+NODE = 'node'
+
+# Cache por classe dos métodos on_<evento> descobertos
+_EVENT_METHODS: Dict[type, Tuple[Tuple[str, str], ...]] = {}
+
+
+def default_dispatch(func: Callable) -> Callable:
+    """Marca o handle_events padrão de uma classe base (despacho via tabela)"""
+    func.__daze_default_dispatch__ = True
+    return func
+
+
+def uses_route_table(node: Any) -> bool:
+    """Indica se o nó despacha pela tabela ou se sobrescreveu handle_events"""
+    handle_events = getattr(type(node), 'handle_events', None)
+    return isinstance(node, Routable) and getattr(handle_events, '__daze_default_dispatch__', False)
+
+
+def discover_event_methods(cls: type) -> Tuple[Tuple[str, str], ...]:
+    """Retorna os pares (evento, nome do método) on_<evento> da classe"""
+    methods = _EVENT_METHODS.get(cls)
+    if methods is None:
+        methods = tuple(
+            (name[3:], name) for name in dir(cls)
+            if name.startswith('on_') and len(name) > 3 and callable(getattr(cls, name, None))
+        )
+        _EVENT_METHODS[cls] = methods
+    return methods
+
+
+def slice_state(state: Any, path: Tuple[str, ...]) -> Any:
+    """Desce no estado aninhado seguindo os nomes do caminho da rota"""
+    for name in path:
+        state = state.get(name) if state and isinstance(state, dict) else None
+    return state
+
+
+def in_scope(route: 'Route', scope: Optional[Collection[str]]) -> bool:
+    """Rotas do próprio nó sempre valem; as dos filhos só se o filho estiver no escopo"""
+    return scope is None or not route.path or route.path[0] in scope
+
+
+class Route:
+    """Rota de um evento até o handler que o atende"""
+
+    __slots__ = ('event', 'rank', 'scope', 'path', 'kind', 'target', 'owner')
+
+    def __init__(self, event: Optional[str], rank: Tuple[int, ...], scope: Tuple[int, ...],
+                 path: Tuple[str, ...], kind: str, target: Callable, owner: Any):
+        self.event = event
+        self.rank = rank    # Posição no percurso da árvore (define a precedência)
+        self.scope = scope  # Prefixo do nó dono; resultado falso pula o restante do nó
+        self.path = path    # Nomes até o dono, usados para fatiar o estado
+        self.kind = kind
+        self.target = target
+        self.owner = owner
+
+    def prefixed(self, prefix: Tuple[int, ...], name: str) -> 'Route':
+        """Copia a rota para a tabela do nó pai"""
+        return Route(self.event, prefix + self.rank, prefix + self.scope,
+                     (name,) + self.path, self.kind, self.target, self.owner)
+
+    def matches(self, args: Dict[str, Any]) -> bool:
+        """Handlers exigem valor verdadeiro; métodos on_<evento> apenas a chave"""
+        if self.kind == HANDLER:
+            return bool(args.get(self.event))
+        return True
+
+    async def invoke(self, q, state=None, args=None):
+        """Executa o alvo da rota com o estado fatiado para o nó dono"""
+        node_state = slice_state(state, self.path)
+        policy = getattr(self.owner, 'execution_policy', INLINE)
+        if self.kind == HANDLER:
+            return await call_handler(self.target, q, state=node_state, args=args, policy=policy)
+        if self.kind == METHOD:
+            result = await call_handler(self.target, q, state=node_state, args=args, policy=policy)
+            self.owner.store_result(q, self.event, result)
+            return True
+        return await self.owner.handle_events(q, state=node_state, args=args)
+
+    def describe(self) -> Dict[str, Any]:
+        """Representação legível da rota para inspeção"""
+        return {
+            'event': self.event,
+            'kind': self.kind,
+            'path': '/'.join(self.path),
+            'rank': self.rank,
+            'target': getattr(self.target, '__qualname__', repr(self.target)),
+        }
+
+    def __repr__(self) -> str:
+        return f"Route({self.event!r}, kind={self.kind!r}, path={'/'.join(self.path)!r})"
+
+
+class RouteTable:
+    """Mapa evento → rotas ordenadas por precedência"""
+
+    def __init__(self):
+        self._routes: Dict[str, List[Route]] = {}
+        self._nodes: List[Route] = []  # Nós que sobrescrevem handle_events recebem tudo
+
+    def add(self, route: Route) -> None:
+        if route.kind == NODE:
+            self._nodes.append(route)
+        else:
+            self._routes.setdefault(route.event, []).append(route)
+
+    def extend(self, other: 'RouteTable', prefix: Tuple[int, ...], name: str) -> None:
+        """Incorpora a tabela de um filho sob o prefixo de sua posição"""
+        for route in other:
+            self.add(route.prefixed(prefix, name))
+
+    def finalize(self) -> None:
+        for routes in self._routes.values():
+            routes.sort(key=lambda route: route.rank)
+        self._nodes.sort(key=lambda route: route.rank)
+
+    def lookup(self, event: str) -> List[Route]:
+        """Rotas registradas para um evento, em ordem de precedência"""
+        return list(self._routes.get(event, ()))
+
+    def resolve(self, args: Dict[str, Any], scope: Optional[Collection[str]] = None) -> List[Route]:
+        """
+        Rotas candidatas para os args, na ordem em que o percurso as visitaria.
+        Com ``scope``, só entram rotas do próprio nó ou dos filhos diretos listados.
+        """
+        matched = []
+        for position, key in enumerate(args):
+            for route in self._routes.get(key, ()):
+                if route.matches(args) and in_scope(route, scope):
+                    matched.append((route.rank, position, route))
+        for route in self._nodes:
+            if in_scope(route, scope):
+                matched.append((route.rank, -1, route))
+        matched.sort(key=lambda item: (item[0], item[1]))
+        return [route for _, _, route in matched]
+
+    async def dispatch(self, q, state=None, args=None, scope: Optional[Collection[str]] = None):
+        """Executa as rotas candidatas até a primeira que tratar o evento"""
+        skip = None
+        for route in self.resolve(args, scope):
+            if skip is not None and route.rank[:len(skip)] == skip:
+                continue
+            result = await route.invoke(q, state=state, args=args)
+            if result or not route.scope:
+                return result
+            skip = route.scope
+        return None
+
+    def describe(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Tabela completa em formato serializável para inspeção/debug"""
+        table = {event: [route.describe() for route in routes] for event, routes in self._routes.items()}
+        if self._nodes:
+            table['*'] = [route.describe() for route in self._nodes]
+        return table
+
+    def __iter__(self) -> Iterator[Route]:
+        for routes in self._routes.values():
+            yield from routes
+        yield from self._nodes
+
+    def __contains__(self, event: str) -> bool:
+        return event in self._routes
+
+    def __len__(self) -> int:
+        return sum(len(routes) for routes in self._routes.values()) + len(self._nodes)
+
+
+class Routable:
+    """
+    Base para nós da árvore com tabela de rotas compilada.
+    A tabela é reconstruída só quando o nó ou algum descendente muda.
+    """
+
+    _route_table: Optional[RouteTable] = None
+    _route_parents: Tuple['Routable', ...] = ()
+
+    @property
+    def route_table(self) -> RouteTable:
+        """Tabela compilada do nó (compila sob demanda)"""
+        if self._route_table is None:
+            table = RouteTable()
+            self.build_routes(table)
+            table.finalize()
+            self._route_table = table
+        return self._route_table
+
+    def build_routes(self, table: RouteTable) -> None:
+        """Preenche a tabela com as rotas do nó; sobrescrito pelas classes base"""
+        raise NotImplementedError
+
+    def invalidate_routes(self) -> None:
+        """Descarta a tabela do nó e de todos os ancestrais"""
+        if self._route_table is None:
+            return
+        self._route_table = None
+        for parent in self._route_parents:
+            parent.invalidate_routes()
+
+    def attach_route_child(self, child: Any) -> None:
+        """Liga o filho ao nó para propagar invalidações"""
+        if isinstance(child, Routable):
+            if self not in child._route_parents:
+                child._route_parents = child._route_parents + (self,)
+        self.invalidate_routes()
+
+    def add_handler_routes(self, table: RouteTable, handlers: Dict[str, Callable],
+                           prefix: Tuple[int, ...] = (0,)) -> None:
+        for index, (event_name, handler) in enumerate(handlers.items()):
+            table.add(Route(event_name, prefix + (index,), (), (), HANDLER, handler, self))
+
+    def add_child_routes(self, table: RouteTable, children: Dict[str, Any],
+                         prefix: Tuple[int, ...] = (1,)) -> None:
+        for index, (name, child) in enumerate(children.items()):
+            child_prefix = prefix + (index,)
+            if uses_route_table(child):
+                table.extend(child.route_table, child_prefix, name)
+            elif hasattr(child, 'handle_events'):
+                table.add(Route(None, child_prefix, child_prefix, (name,), NODE, child.handle_events, child))
@@ -6,6 +6,10 @@ from typing import Any, Dict, Optional, Set
 from h2o_wave import Q
 import asyncio
 
+from core.diff import forget_card, reset_cards
+from core.memo import RenderMemo
+from core.layout import LayoutCache
+
 
 class StateManager:
     """Gerenciador de estado da aplicação"""
@@ -70,6 +74,8 @@ class StateManager:
         """Remove um card do conjunto rastreado"""
         cards = self.get_tracked_cards(q)
         cards.discard(name)
+        forget_card(q, name)
+        RenderMemo.get_instance().invalidate(q, name)
         if name in q.page:
             del q.page[name]
     
@@ -83,6 +89,8 @@ class StateManager:
             cards_to_remove = cards - ignore
             
             for card_name in cards_to_remove:
+                forget_card(q, card_name)
+                RenderMemo.get_instance().invalidate(q, card_name)
                 if card_name in q.page:
                     del q.page[card_name]
             
@@ -97,3 +105,6 @@ class StateManager:
             q.client.app_state = {}
             q.client.tracked_cards = set()
             q.client.current_page = None
+            reset_cards(q)
+            RenderMemo.get_instance().invalidate(q)
+            LayoutCache.get_instance().invalidate_client(q)
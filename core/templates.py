@@ -0,0 +1,61 @@
+"""
+Templates de elementos de UI imutáveis, construídos uma vez por processo.
+
+As partes estáticas de um card (``ui.choice``, ``ui.table_column``, separadores,
+botões) são criadas uma única vez e compartilhadas por referência entre todos
+os clientes e renders. Só as posições dinâmicas (``Slot``: valor selecionado,
+contadores, datas) são construídas a cada ``bind``. Nada é copiado: trate os
+objetos do template como somente leitura.
+"""
+
+from typing import Any, Callable, Dict, Hashable, List, Sequence
+
+
+class Slot:
+    """Posição dinâmica de um template: ``factory(values)`` gera o componente"""
+
+    __slots__ = ('factory',)
+
+    def __init__(self, factory: Callable[[Dict[str, Any]], Any]):
+        self.factory = factory
+
+
+class CardTemplate:
+    """Lista de itens com partes estáticas compartilhadas e slots por cliente"""
+
+    __slots__ = ('items', '_slots')
+
+    def __init__(self, items: Sequence[Any]):
+        self.items = tuple(items)
+        self._slots = tuple(i for i, item in enumerate(self.items) if isinstance(item, Slot))
+
+    def bind(self, **values) -> List[Any]:
+        """Itens do card com os slots preenchidos; os estáticos são os mesmos objetos"""
+        items = list(self.items)
+        for index in self._slots:
+            items[index] = items[index].factory(values)
+        return items
+
+
+class TemplateCache:
+    """Templates e definições estáticas de UI por chave, construídos uma vez"""
+    _instance = None
+
+    def __init__(self):
+        self._templates: Dict[Hashable, Any] = {}
+
+    @classmethod
+    def get_instance(cls):
+        if cls._instance is None:
+            cls._instance = TemplateCache()
+        return cls._instance
+
+    def get(self, key: Hashable, builder: Callable[[], Any]) -> Any:
+        """Objeto da chave (template, colunas, choices), construído na primeira chamada"""
+        template = self._templates.get(key)
+        if template is None:
+            template = self._templates[key] = builder()
+        return template
+
+    def clear(self) -> None:
+        self._templates.clear()
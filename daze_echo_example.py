@@ -21,6 +21,10 @@ class EchoComponent(BaseComponent):
         if result:
             q.page['echo_result'] = ui.markdown_card(box='1 3 2 1', title='Resultado', content=result)
 
+    def render_inputs(self, q, state=None):
+        # Só o resultado do echo muda o card: sem ele novo, o render é pulado
+        return (self.get_result(q, 'echo'),)
+
     def on_echo(self, q, state=None, args=None):
         dummy = args.get('dummy')
         print(f'[ECHO][COMPONENT] on_echo chamado! {dummy}')
@@ -31,9 +35,7 @@ class EchoCard(BaseCard):
     def __init__(self, card_id):
         super().__init__(card_id)
         self.add_component('main', EchoComponent('main'))
-    def render(self, q, state=None, **kwargs):
-        for c in self.components.values():
-            c.render(q, state=state)
+    # render padrão do BaseCard: consulta render_inputs antes de cada componente
 
 # --- Page ---
 class EchoPage(BasePage):
@@ -57,8 +59,4 @@ async def serve(q: Q):
     print('RAW ARGS:', q.args)
     args = app_daze.get_args(q)
     print('ARGS:', args)
-    if args:
-        q.client.last_event = args.copy() if hasattr(args, 'copy') else dict(args)
-    await app_daze.handle_events(q, args=args)
-    app_daze.render(q)
-    await q.page.save()
+    await app_daze.serve(q)
@@ -6,9 +6,21 @@ from abc import ABC, abstractmethod
 from typing import List, Optional, Dict, Any
 from h2o_wave import Q, ui
 
+from core.routing import Routable, RouteTable, default_dispatch
+from core.log import get_logger, SampledTrace
+from core.config import get_config
+from core.executor import INLINE, call_handler
+from core.memo import RenderMemo
+from core.layout import LayoutCache
+from core.flush import mark_dirty
+from core.debug import DebugManager
+from core.debug_layout import add_debug_zone
 
+logger = get_logger('page')
+_trace = SampledTrace(logger, get_config().log_trace_sample)
 
-class BasePage:
+
+class BasePage(Routable):
     """
     Página base: gerencia layout, zonas, cards e eventos.
     Integra com sessão via q.client e state_manager.
@@ -23,43 +35,79 @@ class BasePage:
 
     def add_card(self, name, card):
         self.cards[name] = card
+        self.attach_route_child(card)
 
     def register_handler(self, event_name: str, handler):
         """Registra um handler para um evento específico (ex: botão, form, etc)."""
         self.handlers[event_name] = handler
+        self.invalidate_routes()
+
+    def coalesce_event(self, event_name: str, debounce: Optional[float] = None, group: Optional[str] = None):
+        """Declara no app que só a entrada mais recente deste evento é processada por cliente."""
+        if self.app and hasattr(self.app, 'coalesce_event'):
+            self.app.coalesce_event(event_name, debounce=debounce, group=group)
+
+    def build_routes(self, table: RouteTable) -> None:
+        """Handlers da página antes dos cards, na ordem de registro."""
+        self.add_handler_routes(table, self.handlers)
+        self.add_child_routes(table, self.cards)
+
+    def layout_zones(self) -> Optional[List]:
+        """Zonas do layout da página; sobrescreva nas páginas com layout próprio."""
+        return None
 
     def setup_layout(self, q: Q, zones=None):
-        """Configura layout simples ou customizado. Adiciona zona de debug se ativo."""
-        from core.debug import DebugManager
-        from core.debug_layout import add_debug_zone
-        # ...implementar layout customizado se necessário...
+        """
+        Configura layout simples ou customizado. Adiciona zona de debug se ativo.
+        O layout padrão da classe é construído uma vez e só reenviado quando o
+        layout ativo do cliente muda (navegação, debug ligado/desligado).
+        """
+        debug = DebugManager.get_instance().enabled
+        if zones is not None:
+            # Zonas customizadas por chamada: sem cache, e o próximo layout padrão é reenviado
+            q.page['meta'] = self._build_meta(list(zones), debug)
+            LayoutCache.get_instance().invalidate_client(q)
+            return
+        cls = type(self)
+        if cls.layout_zones is BasePage.layout_zones:
+            return
+        key = (cls.__module__, cls.__qualname__, debug)
+        LayoutCache.get_instance().apply(q, key, lambda: self._build_meta(self.layout_zones(), debug))
+
+    def _build_meta(self, zones, debug: bool):
+        if zones is None:
+            return None
+        if debug:
+            zones = add_debug_zone(list(zones))
+        return ui.meta_card(box='', layouts=[ui.layout(breakpoint='xs', zones=zones)])
 
 
-    async def render(self, q: Q):
+    async def render(self, q: Q, state=None):
         """Renderiza todos os cards da página (ciclo modular)."""
         self.setup_layout(q)
-        self.render_cards(q)
-        await q.page.save()
+        await self.render_cards(q, state=state)
+        mark_dirty(q)
 
+    async def render_cards(self, q: Q, state=None):
+        """Renderiza os cards em ordem, respeitando a política de execução de cada um."""
+        for name, card in self.cards.items():
+            card_state = state.get(name) if state and isinstance(state, dict) else None
+            if hasattr(card, 'render_async'):
+                await card.render_async(q, state=card_state)
+            else:
+                await call_handler(card.render, q, state=card_state,
+                                   policy=getattr(card, 'execution_policy', INLINE))
+
+    @default_dispatch
     async def handle_events(self, q: Q, state=None, args=None):
-        from core.app import WaveApp
         if args is None or not args:
             args = getattr(q.client, 'last_event', {})
         if not isinstance(args, dict):
             args = {}
-        for event_name, handler in self.handlers.items():
-            if args.get(event_name):
-                print(f"[DAZE][PAGE] handler found: {event_name}")
-                return await handler(q, state=state, args=args)
-        for name, card in self.cards.items():
-            card_state = state.get(name) if state and isinstance(state, dict) else None
-            print(f"[DAZE][PAGE] propagating to card: {name} (state={card_state})")
-            result = await card.handle_events(q, state=card_state, args=args)
-            if result:
-                print(f"[DAZE][PAGE] event handled by card: {name}")
-                return result
-        print(f"[DAZE][PAGE] event not handled at page level")
-        return None
+        result = await self.route_table.dispatch(q, state=state, args=args)
+        if result is None:
+            _trace('%s: event not handled at page level', self.route)
+        return result
 
     def set_state(self, q: Q, key: str, value: Any):
         if self.app and hasattr(self.app, 'state_manager'):
@@ -69,3 +117,7 @@ class BasePage:
         if self.app and hasattr(self.app, 'state_manager'):
             return self.app.state_manager.get_client_value(q, f'{self.route}_{key}', default)
         return default
+
+    def should_render(self, q: Q, card_name: str, *inputs) -> bool:
+        """False se o card já foi renderizado para o cliente com as mesmas entradas."""
+        return RenderMemo.get_instance().should_render(q, card_name, (self.route,) + inputs)
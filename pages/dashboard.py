@@ -1,4 +1,5 @@
 from components.base import BaseCard
+from core.flush import mark_dirty
 
 # Card de header modular
 class DashboardHeaderCard(BaseCard):
@@ -48,6 +49,8 @@ from components.stats import StatsComponent
 from components.charts import ChartComponent
 from components.tables import TableComponent
 from core.debug import DebugManager
+from core.broadcast import BroadcastHub
+from core.diff import publish_card
 
 
 class DashboardPage(BasePage):
@@ -71,38 +74,34 @@ class DashboardPage(BasePage):
         self.add_card(self.form_card, zone='main')
         # Registro modular do handler da tabela
         self.register_handler('sales_table', self.handle_sales_table)
+        # Métricas e gráfico são iguais para todos: renderizados uma vez no site
+        self.broadcast = BroadcastHub.get_instance()
+        self.broadcast.register('dashboard_overview', lambda q: self._create_overview_card(q, box='content'))
+        self.broadcast.register('dashboard_chart', lambda q: self._create_chart_card(q, box='content'))
     
-    def setup_layout(self, q):
-        q.page['meta'] = ui.meta_card(
-            box='',
-            layouts=[
-                ui.layout(
-                    breakpoint='xs',
-                    zones=[
-                        ui.zone('header'),
-                        ui.zone('main'),
-                        ui.zone('footer'),
-                    ]
-                )
-            ]
-        )
+    def layout_zones(self):
+        return [
+            ui.zone('header'),
+            ui.zone('main'),
+            ui.zone('footer'),
+        ]
     
-    async def render(self, q: Q):
+    async def render(self, q: Q, state=None):
         """Renderiza o dashboard com cards específicos (modular)"""
         debug = DebugManager.get_instance()
         debug.log('[DashboardPage.render] chamado')
         self.setup_layout(q)
-        self.render_cards(q)
-        # Cards extras (mantidos para exemplo)
-        self._create_overview_card(q)
-        self._create_chart_card(q)
+        await self.render_cards(q)
+        # Cards compartilhados: só o frame é enviado ao cliente
+        await self.broadcast.mount(q, 'dashboard_overview', box='sidebar', card_name='overview')
+        await self.broadcast.mount(q, 'dashboard_chart', box='main', card_name='main_chart')
         self._create_table_card(q)
-        await q.page.save()
+        mark_dirty(q)
     
-    def _create_overview_card(self, q: Q):
+    def _create_overview_card(self, q: Q, box: str = 'sidebar'):
         """Cria card de visão geral com estatísticas"""
-        q.page['overview'] = ui.stat_list_card(
-            box='sidebar',
+        publish_card(q, 'overview', ui.stat_list_card(
+            box=box,
             title='📊 Métricas Principais',
             items=[
                 ui.stat(
@@ -124,9 +123,9 @@ class DashboardPage(BasePage):
                     icon='People'
                 )
             ]
-        )
+        ))
     
-    def _create_chart_card(self, q: Q):
+    def _create_chart_card(self, q: Q, box: str = 'main'):
         """Cria card com gráfico principal"""
         # Dados de exemplo
         data = [
@@ -137,8 +136,8 @@ class DashboardPage(BasePage):
             ['Mai', 200, 180, 150]
         ]
         
-        q.page['main_chart'] = ui.plot_card(
-            box='main',
+        publish_card(q, 'main_chart', ui.plot_card(
+            box=box,
             title='📈 Vendas por Mês',
             data=data,
             axes=[
@@ -157,7 +156,7 @@ class DashboardPage(BasePage):
                     )
                 ])
             ]
-        )
+        ))
     
     def _create_table_card(self, q: Q):
         """Cria card com tabela de dados recentes"""
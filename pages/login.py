@@ -3,6 +3,7 @@ Página de Login DAZE - Modular, herda BasePage
 """
 from h2o_wave import Q, ui
 from pages.base import BasePage
+from core.flush import mark_dirty
 from core.debug import DebugManager
 
 class LoginPage(BasePage):
@@ -11,7 +12,7 @@ class LoginPage(BasePage):
         # Registro modular do handler do botão do_login
         self.register_handler('do_login', self.handle_do_login)
 
-    async def render(self, q: Q):
+    async def render(self, q: Q, state=None):
         debug = DebugManager.get_instance()
         debug.log(f'[LoginPage.render] chamado, callable={callable(self.render)}')
         self.setup_layout(q)
@@ -25,7 +26,7 @@ class LoginPage(BasePage):
                 ui.textbox('login_hidden', value='1', visible=False)
             ]
         )
-        await q.page.save()
+        mark_dirty(q)
 
     async def handle_do_login(self, q: Q):
         debug = DebugManager.get_instance()
@@ -54,5 +55,5 @@ class LoginPage(BasePage):
                     ui.text('Usuário ou senha inválidos.')
                 ]
             )
-            await q.page.save()
+            mark_dirty(q)
             return True
@@ -5,6 +5,9 @@ Página de gestão de produtos com filtros e ações
 
 from h2o_wave import Q, ui
 from pages.base import BasePage
+from core.flush import mark_dirty
+from core.coalescing import event_source
+from core.templates import TemplateCache, CardTemplate, Slot
 
 
 class ProductsPage(BasePage):
@@ -13,6 +16,9 @@ class ProductsPage(BasePage):
     Demonstra CRUD e filtros complexos
     """
     
+    # Entradas que disparam a busca sozinhas (trigger), com debounce
+    FILTER_EVENTS = ('category_filter', 'min_stock_filter', 'max_price_filter')
+    
     def __init__(self, app=None):
         super().__init__(
             route='products',
@@ -22,28 +28,25 @@ class ProductsPage(BasePage):
         )
         self.description = 'Gestão de produtos e inventário'
         self.data_service = app.data_service if app else None
+        # Rajadas nos filtros disparam só a busca mais recente
+        for event_name in self.FILTER_EVENTS:
+            self.coalesce_event(event_name, debounce=0.3, group='products_filters')
     
-    def setup_layout(self, q: Q, zones=None):
-        """Layout específico da página de produtos"""
-        if not zones:
-            zones = [
-                ui.zone('header', size='60px'),
-                ui.zone('breadcrumb', size='40px'),
-                ui.zone('content', direction='row', zones=[
-                    ui.zone('filters', size='30%'),
-                    ui.zone('main', size='70%', direction='column', zones=[
-                        ui.zone('actions', size='80px'),
-                        ui.zone('products_grid', size='calc(100% - 80px)')
-                    ])
+    def layout_zones(self):
+        """Layout específico da página de produtos (construído uma vez por processo)"""
+        return [
+            ui.zone('header', size='60px'),
+            ui.zone('breadcrumb', size='40px'),
+            ui.zone('content', direction='row', zones=[
+                ui.zone('filters', size='30%'),
+                ui.zone('main', size='70%', direction='column', zones=[
+                    ui.zone('actions', size='80px'),
+                    ui.zone('products_grid', size='calc(100% - 80px)')
                 ])
-            ]
-        
-        q.page['meta'] = ui.meta_card(
-            box='', 
-            layouts=[ui.layout(breakpoint='xs', zones=zones)]
-        )
+            ])
+        ]
     
-    async def render(self, q: Q):
+    async def render(self, q: Q, state=None):
         """Renderiza a página de produtos"""
         self.setup_layout(q)
         
@@ -56,69 +59,85 @@ class ProductsPage(BasePage):
         # Card de produtos
         await self._create_products_card(q)
         
-        await q.page.save()
+        mark_dirty(q)
     
     def _create_filters_card(self, q: Q):
         """Cria card de filtros para produtos"""
         category = self.get_state(q, 'category_filter', 'all')
         min_stock = self.get_state(q, 'min_stock_filter', 0)
         max_price = self.get_state(q, 'max_price_filter', 10000)
+        products_count = self.get_state(q, 'products_count', 'N/A')
+        if not self.should_render(q, 'products_filters', category, min_stock, max_price, products_count):
+            return
         
+        template = TemplateCache.get_instance().get(('products', 'filters'), self._filters_template)
         q.page['products_filters'] = ui.form_card(
             box='filters',
             title='🔍 Filtros de Produtos',
-            items=[
-                ui.separator('Categoria'),
-                ui.dropdown(
-                    name='category_filter',
-                    label='Categoria',
-                    value=category,
-                    choices=[
-                        ui.choice('all', 'Todas'),
-                        ui.choice('electronics', 'Eletrônicos'),
-                        ui.choice('clothing', 'Roupas'),
-                        ui.choice('books', 'Livros'),
-                        ui.choice('home', 'Casa e Jardim')
-                    ]
-                ),
-                ui.separator('Estoque'),
-                ui.spinbox(
-                    name='min_stock_filter',
-                    label='Estoque Mínimo',
-                    value=min_stock,
-                    min=0,
-                    max=1000,
-                    step=1
-                ),
-                ui.separator('Preço'),
-                ui.spinbox(
-                    name='max_price_filter',
-                    label='Preço Máximo (R$)',
-                    value=max_price,
-                    min=0,
-                    max=50000,
-                    step=100
-                ),
-                ui.separator('Ações'),
-                ui.button(
-                    name='apply_product_filters',
-                    label='📦 Filtrar Produtos',
-                    primary=True
-                ),
-                ui.button(
-                    name='reset_product_filters',
-                    label='🔄 Limpar Filtros'
-                ),
-                ui.separator('Resumo'),
-                ui.text(f'**Categoria:** {category}'),
-                ui.text(f'**Estoque min:** {min_stock}'),
-                ui.text(f'**Preço max:** R$ {max_price}'),
-                ui.text(f'**Produtos encontrados:** {self.get_state(q, "products_count", "N/A")}')
-            ]
+            items=template.bind(category=category, min_stock=min_stock,
+                                max_price=max_price, products_count=products_count)
         )
     
+    @staticmethod
+    def _filters_template() -> CardTemplate:
+        """Partes estáticas do card de filtros (construídas uma vez por processo)"""
+        categories = [
+            ui.choice('all', 'Todas'),
+            ui.choice('electronics', 'Eletrônicos'),
+            ui.choice('clothing', 'Roupas'),
+            ui.choice('books', 'Livros'),
+            ui.choice('home', 'Casa e Jardim')
+        ]
+        return CardTemplate([
+            ui.separator('Categoria'),
+            Slot(lambda v: ui.dropdown(
+                name='category_filter',
+                trigger=True,
+                label='Categoria',
+                value=v['category'],
+                choices=categories
+            )),
+            ui.separator('Estoque'),
+            Slot(lambda v: ui.spinbox(
+                name='min_stock_filter',
+                trigger=True,
+                label='Estoque Mínimo',
+                value=v['min_stock'],
+                min=0,
+                max=1000,
+                step=1
+            )),
+            ui.separator('Preço'),
+            Slot(lambda v: ui.spinbox(
+                name='max_price_filter',
+                trigger=True,
+                label='Preço Máximo (R$)',
+                value=v['max_price'],
+                min=0,
+                max=50000,
+                step=100
+            )),
+            ui.separator('Ações'),
+            ui.button(
+                name='apply_product_filters',
+                label='📦 Filtrar Produtos',
+                primary=True
+            ),
+            ui.button(
+                name='reset_product_filters',
+                label='🔄 Limpar Filtros'
+            ),
+            ui.separator('Resumo'),
+            Slot(lambda v: ui.text(f"**Categoria:** {v['category']}")),
+            Slot(lambda v: ui.text(f"**Estoque min:** {v['min_stock']}")),
+            Slot(lambda v: ui.text(f"**Preço max:** R$ {v['max_price']}")),
+            Slot(lambda v: ui.text(f"**Produtos encontrados:** {v['products_count']}"))
+        ])
+    
     def _create_actions_card(self, q: Q):
         """Cria card de ações para produtos"""
+        if not self.should_render(q, 'products_actions'):
+            return
         q.page['products_actions'] = ui.form_card(
             box='actions',
             title='⚡ Ações',
@@ -172,13 +191,13 @@ class ProductsPage(BasePage):
                 items=[
                     ui.table(
                         name='products_table',
-                        columns=[
+                        columns=TemplateCache.get_instance().get(('products', 'columns'), lambda: [
                             ui.table_column('name', 'Nome', width='200px'),
                             ui.table_column('category', 'Categoria', width='120px'),
                             ui.table_column('price', 'Preço', width='100px'),
                             ui.table_column('stock', 'Estoque', width='80px'),
                             ui.table_column('status', 'Status', width='120px')
-                        ],
+                        ]),
                         rows=product_rows,
                         height='400px',
                         multiple=True  # Permite seleção múltipla
@@ -225,9 +244,10 @@ class ProductsPage(BasePage):
             {'name': 'Smartphone Samsung', 'category': 'electronics', 'price': 1200.00, 'stock': 25, 'status': 'Ativo'}
         ]
     
-    async def handle_events(self, q: Q):
+    async def handle_events(self, q: Q, state=None, args=None):
         """Processa eventos específicos da página de produtos"""
-        if q.args.apply_product_filters:
+        # Botão ou mudança num filtro (trigger, com debounce): aplica os filtros
+        if q.args.apply_product_filters or event_source(q.args) in self.FILTER_EVENTS:
             # Aplica filtros de produtos
             if q.args.category_filter:
                 self.set_state(q, 'category_filter', q.args.category_filter)
@@ -240,7 +260,7 @@ class ProductsPage(BasePage):
             await self._create_products_card(q)
             self._create_filters_card(q)  # Atualiza contador
             
-            await q.page.save()
+            mark_dirty(q)
             return True
         
         elif q.args.reset_product_filters:
@@ -252,7 +272,7 @@ class ProductsPage(BasePage):
             await self._create_products_card(q)
             self._create_filters_card(q)
             
-            await q.page.save()
+            mark_dirty(q)
             return True
         
         elif q.args.add_product:
@@ -269,11 +289,11 @@ class ProductsPage(BasePage):
         
         elif q.args.retry_products:
             await self._create_products_card(q)
-            await q.page.save()
+            mark_dirty(q)
             return True
         
         # Chama o handler base
-        return await super().handle_events(q)
+        return await super().handle_events(q, state=state, args=args)
     
     async def _show_add_product_dialog(self, q: Q):
         """Mostra dialog para adicionar produto (exemplo)"""
@@ -300,4 +320,4 @@ class ProductsPage(BasePage):
                 ])
             ]
         )
-        await q.page.save()
+        mark_dirty(q)
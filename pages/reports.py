@@ -5,6 +5,8 @@ Página de relatórios customizados
 
 from h2o_wave import Q, ui
 from pages.base import BasePage
+from core.flush import mark_dirty
+from core.templates import TemplateCache, CardTemplate, Slot
 
 
 class ReportsPage(BasePage):
@@ -23,24 +25,18 @@ class ReportsPage(BasePage):
         self.description = 'Geração de relatórios customizados'
         self.data_service = app.data_service if app else None
     
-    def setup_layout(self, q: Q, zones=None):
-        """Layout específico da página de relatórios"""
-        if not zones:
-            zones = [
-                ui.zone('header', size='60px'),
-                ui.zone('breadcrumb', size='40px'),
-                ui.zone('content', direction='row', zones=[
-                    ui.zone('generator', size='35%'),
-                    ui.zone('report', size='65%')
-                ])
-            ]
-        
-        q.page['meta'] = ui.meta_card(
-            box='', 
-            layouts=[ui.layout(breakpoint='xs', zones=zones)]
-        )
+    def layout_zones(self):
+        """Layout específico da página de relatórios (construído uma vez por processo)"""
+        return [
+            ui.zone('header', size='60px'),
+            ui.zone('breadcrumb', size='40px'),
+            ui.zone('content', direction='row', zones=[
+                ui.zone('generator', size='35%'),
+                ui.zone('report', size='65%')
+            ])
+        ]
     
-    async def render(self, q: Q):
+    async def render(self, q: Q, state=None):
         """Renderiza a página de relatórios"""
         self.setup_layout(q)
         
@@ -50,7 +46,7 @@ class ReportsPage(BasePage):
         # Card do relatório
         await self._create_report_card(q)
         
-        await q.page.save()
+        mark_dirty(q)
     
     def _create_generator_card(self, q: Q):
         """Cria card para configurar e gerar relatórios"""
@@ -58,75 +54,90 @@ class ReportsPage(BasePage):
         date_from = self.get_state(q, 'date_from', '2025-08-01')
         date_to = self.get_state(q, 'date_to', '2025-08-28')
         include_charts = self.get_state(q, 'include_charts', True)
+        include_tables = self.get_state(q, 'include_tables', True)
+        include_summary = self.get_state(q, 'include_summary', True)
+        last_generated = self.get_state(q, 'last_generated', 'N/A')
+        if not self.should_render(q, 'report_generator', report_type, date_from, date_to,
+                                  include_charts, include_tables, include_summary, last_generated):
+            return
         
+        template = TemplateCache.get_instance().get(('reports', 'generator'), self._generator_template)
         q.page['report_generator'] = ui.form_card(
             box='generator',
             title='📋 Gerador de Relatórios',
-            items=[
-                ui.separator('Tipo de Relatório'),
-                ui.dropdown(
-                    name='report_type',
-                    label='Tipo',
-                    value=report_type,
-                    choices=[
-                        ui.choice('sales_summary', '💰 Resumo de Vendas'),
-                        ui.choice('product_analysis', '📦 Análise de Produtos'),
-                        ui.choice('customer_report', '👥 Relatório de Clientes'),
-                        ui.choice('financial_overview', '💹 Visão Financeira'),
-                        ui.choice('custom_kpi', '📊 KPIs Customizados')
-                    ]
-                ),
-                ui.separator('Período'),
-                ui.date_picker(
-                    name='date_from',
-                    label='Data Inicial',
-                    value=date_from
-                ),
-                ui.date_picker(
-                    name='date_to',
-                    label='Data Final',
-                    value=date_to
-                ),
-                ui.separator('Opções'),
-                ui.checkbox(
-                    name='include_charts',
-                    label='Incluir Gráficos',
-                    value=include_charts
-                ),
-                ui.checkbox(
-                    name='include_tables',
-                    label='Incluir Tabelas Detalhadas',
-                    value=self.get_state(q, 'include_tables', True)
-                ),
-                ui.checkbox(
-                    name='include_summary',
-                    label='Incluir Resumo Executivo',
-                    value=self.get_state(q, 'include_summary', True)
-                ),
-                ui.separator('Ações'),
-                ui.button(
-                    name='generate_report',
-                    label='📋 Gerar Relatório',
-                    primary=True
-                ),
-                ui.button(
-                    name='export_pdf',
-                    label='📄 Exportar PDF'
-                ),
-                ui.button(
-                    name='schedule_report',
-                    label='⏰ Agendar'
-                ),
-                ui.separator('Relatórios Salvos'),
-                ui.link(
-                    name='saved_reports',
-                    label='📁 Ver Relatórios Salvos',
-                    path='#'
-                ),
-                ui.text(f'**Último gerado:** {self.get_state(q, "last_generated", "N/A")}')
-            ]
+            items=template.bind(report_type=report_type, date_from=date_from, date_to=date_to,
+                                include_charts=include_charts, include_tables=include_tables,
+                                include_summary=include_summary, last_generated=last_generated)
         )
     
+    @staticmethod
+    def _generator_template() -> CardTemplate:
+        """Partes estáticas do gerador (construídas uma vez por processo)"""
+        report_types = [
+            ui.choice('sales_summary', '💰 Resumo de Vendas'),
+            ui.choice('product_analysis', '📦 Análise de Produtos'),
+            ui.choice('customer_report', '👥 Relatório de Clientes'),
+            ui.choice('financial_overview', '💹 Visão Financeira'),
+            ui.choice('custom_kpi', '📊 KPIs Customizados')
+        ]
+        return CardTemplate([
+            ui.separator('Tipo de Relatório'),
+            Slot(lambda v: ui.dropdown(
+                name='report_type',
+                label='Tipo',
+                value=v['report_type'],
+                choices=report_types
+            )),
+            ui.separator('Período'),
+            Slot(lambda v: ui.date_picker(
+                name='date_from',
+                label='Data Inicial',
+                value=v['date_from']
+            )),
+            Slot(lambda v: ui.date_picker(
+                name='date_to',
+                label='Data Final',
+                value=v['date_to']
+            )),
+            ui.separator('Opções'),
+            Slot(lambda v: ui.checkbox(
+                name='include_charts',
+                label='Incluir Gráficos',
+                value=v['include_charts']
+            )),
+            Slot(lambda v: ui.checkbox(
+                name='include_tables',
+                label='Incluir Tabelas Detalhadas',
+                value=v['include_tables']
+            )),
+            Slot(lambda v: ui.checkbox(
+                name='include_summary',
+                label='Incluir Resumo Executivo',
+                value=v['include_summary']
+            )),
+            ui.separator('Ações'),
+            ui.button(
+                name='generate_report',
+                label='📋 Gerar Relatório',
+                primary=True
+            ),
+            ui.button(
+                name='export_pdf',
+                label='📄 Exportar PDF'
+            ),
+            ui.button(
+                name='schedule_report',
+                label='⏰ Agendar'
+            ),
+            ui.separator('Relatórios Salvos'),
+            ui.link(
+                name='saved_reports',
+                label='📁 Ver Relatórios Salvos',
+                path='#'
+            ),
+            Slot(lambda v: ui.text(f"**Último gerado:** {v['last_generated']}"))
+        ])
+    
     async def _create_report_card(self, q: Q):
         """Cria card com o relatório gerado"""
         report_type = self.get_state(q, 'report_type', 'sales_summary')
@@ -274,11 +285,11 @@ class ReportsPage(BasePage):
             ui.text('**📋 Dados Detalhados**'),
             ui.table(
                 name='report_table',
-                columns=[
+                columns=TemplateCache.get_instance().get(('reports', 'columns'), lambda: [
                     ui.table_column('item', 'Item', width='200px'),
                     ui.table_column('value', 'Valor', width='100px'),
                     ui.table_column('change', 'Variação', width='100px')
-                ],
+                ]),
                 rows=[
                     ui.table_row('r1', ['Vendas Totais', 'R$ 125.430', '+12%']),
                     ui.table_row('r2', ['Produtos Vendidos', '542 unid.', '+8%']),
@@ -297,7 +308,7 @@ class ReportsPage(BasePage):
         """Dados de fallback para relatórios"""
         return {'type': report_type, 'sample': True}
     
-    async def handle_events(self, q: Q):
+    async def handle_events(self, q: Q, state=None, args=None):
         """Processa eventos específicos da página de relatórios"""
         if q.args.generate_report:
             # Salva parâmetros e gera relatório
@@ -322,7 +333,7 @@ class ReportsPage(BasePage):
             await self._create_report_card(q)
             self._create_generator_card(q)  # Atualiza timestamp
             
-            await q.page.save()
+            mark_dirty(q)
             return True
         
         elif q.args.export_pdf:
@@ -338,18 +349,18 @@ class ReportsPage(BasePage):
                     ui.button('close_export', 'Fechar')
                 ]
             )
-            await q.page.save()
+            mark_dirty(q)
             return True
         
         elif q.args.close_export:
             await self._create_report_card(q)
-            await q.page.save()
+            mark_dirty(q)
             return True
         
         elif q.args.retry_report:
             await self._create_report_card(q)
-            await q.page.save()
+            mark_dirty(q)
             return True
         
         # Chama o handler base
-        return await super().handle_events(q)
+        return await super().handle_events(q, state=state, args=args)
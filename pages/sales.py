@@ -3,8 +3,12 @@ DAZE Template - Sales Page
 Página de análise de vendas com filtros dinâmicos
 """
 
-from h2o_wave import Q, ui
+from h2o_wave import Q, ui, data
 from pages.base import BasePage
+from core.flush import mark_dirty
+from core.coalescing import event_source
+from core.templates import TemplateCache, CardTemplate, Slot
+from components.charts import to_wave_columns
 
 
 class SalesPage(BasePage):
@@ -13,6 +17,12 @@ class SalesPage(BasePage):
     Demonstra integração com DataService e parâmetros dinâmicos
     """
     
+    # Pontos por série enviados ao gráfico (~2 por pixel de um card largo)
+    chart_point_budget = 2000
+    
+    # Entradas que disparam a busca sozinhas (trigger), com debounce
+    FILTER_EVENTS = ('days_filter', 'period_filter')
+    
     def __init__(self, app=None):
         super().__init__(
             route='sales',
@@ -22,28 +32,25 @@ class SalesPage(BasePage):
         )
         self.description = 'Análise detalhada de vendas por período'
         self.data_service = app.data_service if app else None
+        # Rajadas nos filtros disparam só a busca mais recente
+        for event_name in self.FILTER_EVENTS:
+            self.coalesce_event(event_name, debounce=0.3, group='sales_filters')
     
-    def setup_layout(self, q: Q, zones=None):
-        """Layout específico da página de vendas"""
-        if not zones:
-            zones = [
-                ui.zone('header', size='60px'),
-                ui.zone('breadcrumb', size='40px'),
-                ui.zone('content', direction='row', zones=[
-                    ui.zone('filters', size='25%'),
-                    ui.zone('main', size='75%', direction='column', zones=[
-                        ui.zone('chart', size='60%'),
-                        ui.zone('table', size='40%')
-                    ])
+    def layout_zones(self):
+        """Layout específico da página de vendas (construído uma vez por processo)"""
+        return [
+            ui.zone('header', size='60px'),
+            ui.zone('breadcrumb', size='40px'),
+            ui.zone('content', direction='row', zones=[
+                ui.zone('filters', size='25%'),
+                ui.zone('main', size='75%', direction='column', zones=[
+                    ui.zone('chart', size='60%'),
+                    ui.zone('table', size='40%')
                 ])
-            ]
-        
-        q.page['meta'] = ui.meta_card(
-            box='', 
-            layouts=[ui.layout(breakpoint='xs', zones=zones)]
-        )
+            ])
+        ]
     
-    async def render(self, q: Q):
+    async def render(self, q: Q, state=None):
         """Renderiza a página de vendas"""
         self.setup_layout(q)
         
@@ -56,54 +63,66 @@ class SalesPage(BasePage):
         # Card de tabela
         await self._create_table_card(q)
         
-        await q.page.save()
+        mark_dirty(q)
     
     def _create_filters_card(self, q: Q):
         """Cria card de filtros para análise de vendas"""
         # Valores atuais dos filtros
         days = self.get_state(q, 'days_filter', 30)
         period = self.get_state(q, 'period_filter', 'daily')
+        last_update = self.get_state(q, 'last_update', 'N/A')
+        if not self.should_render(q, 'sales_filters', days, period, last_update):
+            return
         
+        template = TemplateCache.get_instance().get(('sales', 'filters'), self._filters_template)
         q.page['sales_filters'] = ui.form_card(
             box='filters',
             title='🔍 Filtros de Vendas',
-            items=[
-                ui.separator('Período de Análise'),
-                ui.spinbox(
-                    name='days_filter',
-                    label='Últimos Dias',
-                    value=days,
-                    min=1,
-                    max=365,
-                    step=1
-                ),
-                ui.dropdown(
-                    name='period_filter',
-                    label='Agrupamento',
-                    value=period,
-                    choices=[
-                        ui.choice('daily', 'Diário'),
-                        ui.choice('weekly', 'Semanal'),
-                        ui.choice('monthly', 'Mensal')
-                    ]
-                ),
-                ui.separator('Ações'),
-                ui.button(
-                    name='apply_sales_filters',
-                    label='📊 Aplicar Filtros',
-                    primary=True
-                ),
-                ui.button(
-                    name='reset_sales_filters',
-                    label='🔄 Limpar Filtros'
-                ),
-                ui.separator('Informações'),
-                ui.text(f'**Período:** {days} dias'),
-                ui.text(f'**Agrupamento:** {period}'),
-                ui.text(f'**Última atualização:** {self.get_state(q, "last_update", "N/A")}')
-            ]
+            items=template.bind(days=days, period=period, last_update=last_update)
         )
     
+    @staticmethod
+    def _filters_template() -> CardTemplate:
+        """Partes estáticas do card de filtros (construídas uma vez por processo)"""
+        periods = [
+            ui.choice('daily', 'Diário'),
+            ui.choice('weekly', 'Semanal'),
+            ui.choice('monthly', 'Mensal')
+        ]
+        return CardTemplate([
+            ui.separator('Período de Análise'),
+            Slot(lambda v: ui.spinbox(
+                name='days_filter',
+                trigger=True,
+                label='Últimos Dias',
+                value=v['days'],
+                min=1,
+                max=365,
+                step=1
+            )),
+            Slot(lambda v: ui.dropdown(
+                name='period_filter',
+                trigger=True,
+                label='Agrupamento',
+                value=v['period'],
+                choices=periods
+            )),
+            ui.separator('Ações'),
+            ui.button(
+                name='apply_sales_filters',
+                label='📊 Aplicar Filtros',
+                primary=True
+            ),
+            ui.button(
+                name='reset_sales_filters',
+                label='🔄 Limpar Filtros'
+            ),
+            ui.separator('Informações'),
+            Slot(lambda v: ui.text(f"**Período:** {v['days']} dias")),
+            Slot(lambda v: ui.text(f"**Agrupamento:** {v['period']}")),
+            Slot(lambda v: ui.text(f"**Última atualização:** {v['last_update']}"))
+        ])
+    
     async def _create_chart_card(self, q: Q):
         """Cria card com gráfico de vendas"""
         # Busca dados do DataService com filtros aplicados
@@ -125,10 +144,13 @@ class SalesPage(BasePage):
                     ['05/08', 2300]
                 ]
             
+            # Séries longas são reduzidas ao orçamento de pontos do card (LTTB)
+            fields, columns = to_wave_columns(chart_data, 'date', 'vendas',
+                                              budget=self.chart_point_budget)
             q.page['sales_chart'] = ui.plot_card(
                 box='chart',
                 title=f'💰 Vendas - Últimos {days} dias ({period})',
-                data=chart_data,
+                data=data(fields, columns=columns, pack=True),
                 axes=[
                     ui.axis(label='Período'),
                     ui.axis(label='Vendas (R$)', side='left')
@@ -138,8 +160,8 @@ class SalesPage(BasePage):
                         ui.mark(
                             coord='rect',
                             type='line',
-                            x='=0',
-                            y='=1',
+                            x='=x',
+                            y='=y',
                             color='green',
                             stroke_width=2
                         )
@@ -179,12 +201,12 @@ class SalesPage(BasePage):
                 items=[
                     ui.table(
                         name='sales_detail_table',
-                        columns=[
+                        columns=TemplateCache.get_instance().get(('sales', 'columns'), lambda: [
                             ui.table_column('product', 'Produto', width='200px'),
                             ui.table_column('value', 'Valor', width='120px'),
                             ui.table_column('date', 'Data', width='120px'),
                             ui.table_column('client', 'Cliente', width='150px')
-                        ],
+                        ]),
                         rows=table_rows,
                         height='300px'
                     )
@@ -225,9 +247,10 @@ class SalesPage(BasePage):
             ))
         return rows
     
-    async def handle_events(self, q: Q):
+    async def handle_events(self, q: Q, state=None, args=None):
         """Processa eventos específicos da página de vendas"""
-        if q.args.apply_sales_filters:
+        # Botão ou mudança num filtro (trigger, com debounce): aplica os filtros
+        if q.args.apply_sales_filters or event_source(q.args) in self.FILTER_EVENTS:
             # Aplica filtros e atualiza dados
             if q.args.days_filter:
                 self.set_state(q, 'days_filter', int(q.args.days_filter))
@@ -241,7 +264,7 @@ class SalesPage(BasePage):
             await self._create_table_card(q)
             self._create_filters_card(q)  # Atualiza informações dos filtros
             
-            await q.page.save()
+            mark_dirty(q)
             return True
         
         elif q.args.reset_sales_filters:
@@ -255,15 +278,15 @@ class SalesPage(BasePage):
             await self._create_table_card(q)
             self._create_filters_card(q)
             
-            await q.page.save()
+            mark_dirty(q)
             return True
         
         # Outros eventos...
         elif q.args.retry_sales_chart or q.args.retry_sales_table:
             await self._create_chart_card(q)
             await self._create_table_card(q)
-            await q.page.save()
+            mark_dirty(q)
             return True
         
         # Chama o handler base
-        return await super().handle_events(q)
+        return await super().handle_events(q, state=state, args=args)
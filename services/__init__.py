@@ -3,5 +3,9 @@ Serviços de negócio para aplicações Wave.
 """
 
 from .data_service import DataService
+from .cache import DataCache
+from .datasets import ColumnarDataset
+from .online_stats import StatsAccumulator
+from .sketches import ColumnSketches
 
-__all__ = ['DataService']
+__all__ = ['DataService', 'DataCache', 'ColumnarDataset', 'StatsAccumulator', 'ColumnSketches']
@@ -0,0 +1,302 @@
+"""
+Cache de dados do processo: LRU com TTL, limites por namespace e métricas.
+
+Compartilhado por todas as instâncias de ``DataService`` (``DataCache.get_instance()``).
+Cada namespace tem sua política (TTL, máximo de entradas e de bytes aproximados);
+há também um teto global de bytes. A expiração usa ``time.monotonic`` (não volta
+no tempo nem "dá a volta" como ``timedelta.seconds``). Entradas vencidas saem na
+leitura e sempre que uma escrita passa dos limites.
+
+Com ``soft_ttl`` a entrada fica "velha" antes de vencer: ainda é servida, mas
+``lookup`` avisa que precisa ser recarregada (stale-while-revalidate); depois
+do TTL rígido ela sai.
+"""
+
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+import sys
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from core.config import get_config
+
+DEFAULT_NAMESPACE = 'default'
+
+COUNTERS = ('hits', 'misses', 'sets', 'evictions', 'expirations',
+            'stale_hits', 'refreshes', 'refresh_failures', 'prefix_hits')
+
+# Amostra de itens usada para estimar o tamanho de listas/dicts grandes
+_SAMPLE_ITEMS = 32
+
+
+def estimate_size(value: Any, _depth: int = 0) -> int:
+    """Tamanho aproximado em bytes (DataFrames/arrays exatos; coleções por amostragem)"""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True, deep=True))
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, (str, bytes, bytearray)):
+        return sys.getsizeof(value)
+    if _depth > 3:
+        return sys.getsizeof(value)
+    if isinstance(value, dict):
+        items = list(value.items())
+        size = sys.getsizeof(value)
+        if not items:
+            return size
+        sample = items[:_SAMPLE_ITEMS]
+        per_item = sum(estimate_size(k, _depth + 1) + estimate_size(v, _depth + 1) for k, v in sample) / len(sample)
+        return int(size + per_item * len(items))
+    if isinstance(value, (list, tuple, set, frozenset)):
+        items = value if isinstance(value, (list, tuple)) else list(value)
+        size = sys.getsizeof(value)
+        if not items:
+            return size
+        sample = items[:_SAMPLE_ITEMS]
+        per_item = sum(estimate_size(item, _depth + 1) for item in sample) / len(sample)
+        return int(size + per_item * len(items))
+    return sys.getsizeof(value)
+
+
+class CachePolicy:
+    """Política de um namespace (None = sem limite)"""
+
+    __slots__ = ('ttl', 'soft_ttl', 'max_entries', 'max_bytes')
+
+    def __init__(self, ttl: Optional[float] = None, max_entries: Optional[int] = None,
+                 max_bytes: Optional[int] = None, soft_ttl: Optional[float] = None):
+        self.ttl = ttl
+        self.soft_ttl = soft_ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+
+class CacheEntry:
+    __slots__ = ('value', 'size', 'expires', 'stale_at')
+
+    def __init__(self, value: Any, size: int, expires: Optional[float], stale_at: Optional[float] = None):
+        self.value = value
+        self.size = size
+        self.expires = expires
+        self.stale_at = stale_at
+
+    def expired(self, now: float) -> bool:
+        return self.expires is not None and now >= self.expires
+
+    def stale(self, now: float) -> bool:
+        return self.stale_at is not None and now >= self.stale_at
+
+
+class _Namespace:
+    __slots__ = ('policy', 'entries', 'bytes', 'counters')
+
+    def __init__(self, policy: CachePolicy):
+        self.policy = policy
+        self.entries: 'OrderedDict[Hashable, CacheEntry]' = OrderedDict()
+        self.bytes = 0
+        self.counters = dict.fromkeys(COUNTERS, 0)
+
+
+class DataCache:
+    """Cache LRU + TTL compartilhado pelo processo"""
+    _instance = None
+
+    def __init__(self, ttl: float = 300.0, max_entries: int = 1024, max_bytes: Optional[int] = None,
+                 soft_ttl: Optional[float] = None):
+        self.default_policy = CachePolicy(ttl=ttl, max_entries=max_entries, soft_ttl=soft_ttl)
+        self.max_bytes = max_bytes
+        self._namespaces: Dict[str, _Namespace] = {}
+        self._policies: Dict[str, CachePolicy] = {}
+        self._lock = threading.RLock()
+
+    @classmethod
+    def get_instance(cls):
+        if cls._instance is None:
+            config = get_config()
+            cls._instance = DataCache(ttl=config.data_cache_ttl,
+                                      max_entries=config.data_cache_max_entries,
+                                      max_bytes=config.data_cache_max_bytes,
+                                      soft_ttl=config.data_cache_soft_ttl)
+        return cls._instance
+
+    def configure(self, namespace: str, ttl: Optional[float] = None, max_entries: Optional[int] = None,
+                  max_bytes: Optional[int] = None, soft_ttl: Optional[float] = None) -> None:
+        """Define a política de um namespace (valores omitidos herdam a política padrão)"""
+        policy = CachePolicy(
+            ttl=ttl if ttl is not None else self.default_policy.ttl,
+            max_entries=max_entries if max_entries is not None else self.default_policy.max_entries,
+            max_bytes=max_bytes,
+            soft_ttl=soft_ttl if soft_ttl is not None else self.default_policy.soft_ttl
+        )
+        with self._lock:
+            self._policies[namespace] = policy
+            space = self._namespaces.get(namespace)
+            if space is not None:
+                space.policy = policy
+                self._enforce(space, time.monotonic())
+
+    def _space(self, namespace: str) -> _Namespace:
+        space = self._namespaces.get(namespace)
+        if space is None:
+            space = self._namespaces[namespace] = _Namespace(self._policies.get(namespace, self.default_policy))
+        return space
+
+    def get(self, key: Hashable, namespace: str = DEFAULT_NAMESPACE, default: Any = None) -> Any:
+        """Valor da chave ou ``default`` se ausente/vencida; marca como usada recentemente"""
+        return self.lookup(key, namespace, default)[0]
+
+    def lookup(self, key: Hashable, namespace: str = DEFAULT_NAMESPACE,
+               default: Any = None) -> Tuple[Any, bool]:
+        """(valor, velho): ``velho`` indica que passou do soft TTL e deve ser recarregado"""
+        with self._lock:
+            space = self._space(namespace)
+            entry = space.entries.get(key)
+            now = time.monotonic()
+            if entry is not None and entry.expired(now):
+                self._remove(space, key)
+                space.counters['expirations'] += 1
+                entry = None
+            if entry is None:
+                space.counters['misses'] += 1
+                return default, False
+            space.entries.move_to_end(key)
+            space.counters['hits'] += 1
+            stale = entry.stale(now)
+            if stale:
+                space.counters['stale_hits'] += 1
+            return entry.value, stale
+
+    def record(self, counter: str, namespace: str = DEFAULT_NAMESPACE) -> None:
+        """Incrementa uma métrica do namespace (ex: refreshes, refresh_failures)"""
+        with self._lock:
+            self._space(namespace).counters[counter] += 1
+
+    def contains(self, key: Hashable, namespace: str = DEFAULT_NAMESPACE) -> bool:
+        with self._lock:
+            entry = self._space(namespace).entries.get(key)
+            return entry is not None and not entry.expired(time.monotonic())
+
+    def set(self, key: Hashable, value: Any, namespace: str = DEFAULT_NAMESPACE,
+            ttl: Optional[float] = None, size: Optional[int] = None,
+            soft_ttl: Optional[float] = None) -> None:
+        """
+        Armazena o valor; ``ttl``/``soft_ttl`` sobrescrevem os do namespace e
+        ``size`` evita a estimativa de tamanho.
+        """
+        if size is None:
+            size = estimate_size(value)
+        with self._lock:
+            space = self._space(namespace)
+            now = time.monotonic()
+            ttl = space.policy.ttl if ttl is None else ttl
+            soft_ttl = space.policy.soft_ttl if soft_ttl is None else soft_ttl
+            if key in space.entries:
+                self._remove(space, key)
+            space.entries[key] = CacheEntry(value, size, now + ttl if ttl else None,
+                                            now + soft_ttl if soft_ttl else None)
+            space.bytes += size
+            space.counters['sets'] += 1
+            self._enforce(space, now)
+
+    def delete(self, key: Hashable, namespace: str = DEFAULT_NAMESPACE) -> bool:
+        with self._lock:
+            space = self._space(namespace)
+            if key not in space.entries:
+                return False
+            self._remove(space, key)
+            return True
+
+    def discard(self, predicate: Callable[[Hashable], bool], namespace: str = DEFAULT_NAMESPACE) -> int:
+        """Remove as chaves do namespace para as quais ``predicate(chave)`` é verdadeiro"""
+        with self._lock:
+            space = self._space(namespace)
+            keys = [key for key in space.entries if predicate(key)]
+            for key in keys:
+                self._remove(space, key)
+            return len(keys)
+
+    def clear(self, namespace: Optional[str] = None) -> None:
+        """Esvazia um namespace (ou todos); as métricas são mantidas"""
+        with self._lock:
+            spaces = [self._space(namespace)] if namespace else list(self._namespaces.values())
+            for space in spaces:
+                space.entries.clear()
+                space.bytes = 0
+
+    def purge_expired(self) -> int:
+        """Remove todas as entradas vencidas; retorna quantas saíram"""
+        removed = 0
+        with self._lock:
+            now = time.monotonic()
+            for space in self._namespaces.values():
+                removed += self._purge(space, now)
+        return removed
+
+    def _remove(self, space: _Namespace, key: Hashable) -> None:
+        entry = space.entries.pop(key)
+        space.bytes -= entry.size
+
+    def _purge(self, space: _Namespace, now: float) -> int:
+        expired = [key for key, entry in space.entries.items() if entry.expired(now)]
+        for key in expired:
+            self._remove(space, key)
+        space.counters['expirations'] += len(expired)
+        return len(expired)
+
+    def _over(self, space: _Namespace) -> bool:
+        policy = space.policy
+        return bool(space.entries) and (
+            (policy.max_entries is not None and len(space.entries) > policy.max_entries)
+            or (policy.max_bytes is not None and space.bytes > policy.max_bytes)
+        )
+
+    def _evict_lru(self, space: _Namespace) -> None:
+        key = next(iter(space.entries))
+        self._remove(space, key)
+        space.counters['evictions'] += 1
+
+    def _enforce(self, space: _Namespace, now: float) -> None:
+        """Aplica os limites do namespace e o teto global (vencidas primeiro, depois LRU)"""
+        if self._over(space):
+            self._purge(space, now)
+        while self._over(space):
+            self._evict_lru(space)
+        if self.max_bytes is None or self.total_bytes() <= self.max_bytes:
+            return
+        for other in self._namespaces.values():
+            self._purge(other, now)
+        while self.total_bytes() > self.max_bytes:
+            # Despeja do namespace que mais ocupa memória
+            largest = max(self._namespaces.values(), key=lambda s: s.bytes)
+            if not largest.entries:
+                break
+            self._evict_lru(largest)
+
+    def total_bytes(self) -> int:
+        return sum(space.bytes for space in self._namespaces.values())
+
+    def stats(self) -> Dict[str, Any]:
+        """Métricas por namespace e totais"""
+        with self._lock:
+            namespaces = {}
+            totals = dict.fromkeys(COUNTERS, 0)
+            for name, space in self._namespaces.items():
+                namespaces[name] = dict(space.counters, entries=len(space.entries), bytes=space.bytes)
+                for counter, value in space.counters.items():
+                    totals[counter] += value
+            lookups = totals['hits'] + totals['misses']
+            totals['hit_rate'] = round(totals['hits'] / lookups, 4) if lookups else 0.0
+            totals['entries'] = sum(len(space.entries) for space in self._namespaces.values())
+            totals['bytes'] = self.total_bytes()
+            return {'namespaces': namespaces, 'totals': totals}
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            for space in self._namespaces.values():
+                for counter in space.counters:
+                    space.counters[counter] = 0
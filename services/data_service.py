@@ -2,194 +2,364 @@
 Serviço de dados centralizado.
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Callable, AsyncIterator
 import pandas as pd
 import asyncio
-from datetime import datetime, timedelta
-import random
+import inspect
+import os
+import threading
+import weakref
+
+from services.cache import DataCache, DEFAULT_NAMESPACE
+from services.singleflight import SingleFlight
+from services import ingest, synthetic
+from services.datasets import ColumnarDataset
+from services.query import QueryPlan
+from services.results import ResultCache
+from services.online_stats import StatsAccumulator
+from services.sketches import ColumnSketches
+from core.executor import run_in_executor
+from core.log import get_logger
+
+logger = get_logger('data')
+
+# Marca de ausência no cache (distingue de valores falsos como [] ou 0)
+_MISSING = object()
+
+STATS_NAMESPACE = 'stats'
+
+# Tamanho do sketch de quantis usado nas estatísticas por blocos (erro de rank ~1%)
+QUANTILE_K = 256
+
+
+async def _iterate(items: Any) -> AsyncIterator[Any]:
+    """Itera iteráveis síncronos ou assíncronos"""
+    if hasattr(items, '__aiter__'):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
 
 
 class DataService:
     """Serviço centralizado para operações de dados"""
     
-    def __init__(self):
-        self._cache: Dict[str, Any] = {}
-        self._cache_timeout = 300  # 5 minutos
-    
-    async def get_cached_data(self, key: str) -> Optional[Any]:
-        """Obtém dados do cache"""
-        if key in self._cache:
-            data, timestamp = self._cache[key]
-            if (datetime.now() - timestamp).seconds < self._cache_timeout:
-                return data
-            else:
-                del self._cache[key]
-        return None
-    
-    async def set_cached_data(self, key: str, data: Any) -> None:
-        """Armazena dados no cache"""
-        self._cache[key] = (data, datetime.now())
-    
-    async def load_csv_data(self, file_path: str) -> pd.DataFrame:
-        """Carrega dados de arquivo CSV"""
+    # Datasets colunares abertos, por caminho (compartilhados pelo processo)
+    _datasets: Dict[str, ColumnarDataset] = {}
+    _datasets_lock = threading.Lock()
+    
+    # Estatísticas acumuladas por chave (append_statistics); não expiram
+    _accumulators: Dict[str, StatsAccumulator] = {}
+    _accumulators_lock = threading.Lock()
+    _sketches: Dict[str, ColumnSketches] = {}
+    _sketches_lock = threading.Lock()
+    
+    def __init__(self, cache: DataCache = None):
+        # Cache compartilhado pelo processo: todas as instâncias veem as mesmas entradas
+        self._cache = cache or DataCache.get_instance()
+        self._flights = SingleFlight.get_instance()
+        self._results = ResultCache(cache) if cache is not None else ResultCache.get_instance()
+    
+    async def get_cached_data(self, key: str, namespace: str = DEFAULT_NAMESPACE) -> Optional[Any]:
+        """Obtém dados do cache (None se ausente ou vencido)"""
+        return self._cache.get(key, namespace=namespace)
+    
+    async def set_cached_data(self, key: str, data: Any, namespace: str = DEFAULT_NAMESPACE,
+                              ttl: Optional[float] = None) -> None:
+        """Armazena dados no cache (TTL do namespace, ou ``ttl`` em segundos)"""
+        self._cache.set(key, data, namespace=namespace, ttl=ttl)
+    
+    async def get_or_load(self, key: str, loader: Callable[[], Any], namespace: str = DEFAULT_NAMESPACE,
+                          ttl: Optional[float] = None, soft_ttl: Optional[float] = None) -> Any:
+        """
+        Valor do cache ou o resultado de ``loader`` (função ou corrotina), guardado no cache.
+        Chamadas concorrentes com a mesma chave aguardam uma única carga; erros chegam a
+        todas elas e não são guardados.
+        Entre ``soft_ttl`` e ``ttl`` o valor velho é devolvido na hora e uma única
+        recarga por chave é agendada em segundo plano; depois de ``ttl`` a chamada espera.
+        """
+        value, stale = self._cache.lookup(key, namespace=namespace, default=_MISSING)
+        if value is not _MISSING:
+            if stale:
+                self._schedule_refresh(key, loader, namespace, ttl, soft_ttl)
+            return value
+        return await self._flights.run((namespace, key),
+                                       lambda: self._load(key, loader, namespace, ttl, soft_ttl))
+    
+    async def _load(self, key: str, loader: Callable[[], Any], namespace: str, ttl: Optional[float],
+                    soft_ttl: Optional[float], refresh: bool = False) -> Any:
+        if not refresh:
+            # Outra carga pode ter terminado entre o miss e a entrada no single-flight
+            value = self._cache.get(key, namespace=namespace, default=_MISSING)
+            if value is not _MISSING:
+                return value
+        value = loader()
+        if inspect.isawaitable(value):
+            value = await value
+        self._cache.set(key, value, namespace=namespace, ttl=ttl, soft_ttl=soft_ttl)
+        return value
+    
+    def _schedule_refresh(self, key: str, loader: Callable[[], Any], namespace: str,
+                          ttl: Optional[float], soft_ttl: Optional[float]) -> None:
+        """Agenda a recarga de um valor velho (no máximo uma em andamento por chave)"""
+        flight = (namespace, key)
+        if self._flights.in_flight(flight):
+            return
+        self._flights.start(flight, lambda: self._refresh(key, loader, namespace, ttl, soft_ttl))
+    
+    async def _refresh(self, key: str, loader: Callable[[], Any], namespace: str,
+                       ttl: Optional[float], soft_ttl: Optional[float]) -> Any:
+        self._cache.record('refreshes', namespace)
+        try:
+            return await self._load(key, loader, namespace, ttl, soft_ttl, refresh=True)
+        except Exception as e:
+            # O valor velho continua no cache até o TTL rígido
+            self._cache.record('refresh_failures', namespace)
+            logger.warning("Falha ao recarregar '%s' (%s): %s", key, namespace, e)
+            raise
+    
+    def cache_stats(self) -> Dict[str, Any]:
+        """Métricas do cache (hits, misses, despejos, bytes por namespace) e das cargas"""
+        stats = self._cache.stats()
+        stats['loads'] = self._flights.stats()
+        return stats
+    
+    async def load_csv_data(self, file_path: str, usecols=None, dtype=None, chunksize: Optional[int] = None,
+                            progress: Optional[Callable] = None, cancel: Any = None, **read_kwargs) -> pd.DataFrame:
+        """
+        Carrega dados de arquivo CSV sem bloquear o event loop.
+        ``progress(fração, linhas)`` é chamado a cada bloco; ``cancel`` (Event ou
+        função) interrompe a leitura entre blocos com ``LoadCancelled``.
+        """
+        try:
+            return await ingest.read_csv(file_path, usecols=usecols, dtype=dtype, chunksize=chunksize,
+                                         progress=progress, cancel=cancel, **read_kwargs)
+        except ingest.LoadCancelled:
+            raise
+        except Exception as e:
+            raise ValueError(f"Erro ao carregar CSV: {e}")
+    
+    async def iter_csv_chunks(self, file_path: str, chunksize: int = ingest.DEFAULT_CHUNKSIZE, usecols=None,
+                              dtype=None, progress: Optional[Callable] = None, cancel: Any = None,
+                              **read_kwargs) -> AsyncIterator[pd.DataFrame]:
+        """Itera o CSV em blocos de ``chunksize`` linhas (cada bloco lido no pool de threads)"""
         try:
-            return pd.read_csv(file_path)
+            async for chunk in ingest.iter_csv_chunks(file_path, chunksize=chunksize, usecols=usecols,
+                                                      dtype=dtype, progress=progress, cancel=cancel,
+                                                      **read_kwargs):
+                yield chunk
+        except ingest.LoadCancelled:
+            raise
         except Exception as e:
             raise ValueError(f"Erro ao carregar CSV: {e}")
     
-    async def load_excel_data(self, file_path: str, sheet_name: str = None) -> pd.DataFrame:
-        """Carrega dados de arquivo Excel"""
+    async def load_excel_data(self, file_path: str, sheet_name: str = None, usecols=None, dtype=None,
+                              progress: Optional[Callable] = None, cancel: Any = None,
+                              **read_kwargs) -> pd.DataFrame:
+        """Carrega dados de arquivo Excel sem bloquear o event loop"""
         try:
-            return pd.read_excel(file_path, sheet_name=sheet_name)
+            return await ingest.read_excel(file_path, sheet_name=sheet_name, usecols=usecols, dtype=dtype,
+                                           progress=progress, cancel=cancel, **read_kwargs)
+        except ingest.LoadCancelled:
+            raise
         except Exception as e:
             raise ValueError(f"Erro ao carregar Excel: {e}")
     
-    async def process_dataframe(self, df: pd.DataFrame, operations: List[Dict[str, Any]]) -> pd.DataFrame:
-        """Processa DataFrame com lista de operações"""
-        result_df = df.copy()
-        
-        for operation in operations:
-            op_type = operation.get('type')
-            
-            if op_type == 'filter':
-                column = operation.get('column')
-                value = operation.get('value')
-                operator = operation.get('operator', '==')
-                
-                if operator == '==':
-                    result_df = result_df[result_df[column] == value]
-                elif operator == '!=':
-                    result_df = result_df[result_df[column] != value]
-                elif operator == '>':
-                    result_df = result_df[result_df[column] > value]
-                elif operator == '<':
-                    result_df = result_df[result_df[column] < value]
-                elif operator == '>=':
-                    result_df = result_df[result_df[column] >= value]
-                elif operator == '<=':
-                    result_df = result_df[result_df[column] <= value]
-                elif operator == 'contains':
-                    result_df = result_df[result_df[column].str.contains(str(value), na=False)]
-            
-            elif op_type == 'sort':
-                column = operation.get('column')
-                ascending = operation.get('ascending', True)
-                result_df = result_df.sort_values(by=column, ascending=ascending)
-            
-            elif op_type == 'group':
-                columns = operation.get('columns')
-                agg_func = operation.get('agg_func', 'sum')
-                result_df = result_df.groupby(columns).agg(agg_func).reset_index()
-            
-            elif op_type == 'rename':
-                columns = operation.get('columns')
-                result_df = result_df.rename(columns=columns)
+    @staticmethod
+    def cancel_token(q) -> threading.Event:
+        """Token de cancelamento das cargas do cliente (passe como ``cancel=``)"""
+        token = getattr(q.client, 'load_cancel', None)
+        if token is None:
+            token = threading.Event()
+            q.client.load_cancel = token
+            # Ao desconectar, o Wave descarta o estado do cliente: cargas soltas param junto
+            weakref.finalize(q.client, token.set)
+        return token
+    
+    @staticmethod
+    def cancel_loads(q) -> None:
+        """Cancela as cargas em andamento do cliente (ex: saída, logout, nova carga)"""
+        token = getattr(q.client, 'load_cancel', None)
+        if token is not None:
+            token.set()
+            q.client.load_cancel = None
+    
+    def open_dataset(self, path: str, format: Optional[str] = None) -> ColumnarDataset:
+        """Dataset Parquet/Arrow IPC do caminho; reaberto se os arquivos mudaram"""
+        with self._datasets_lock:
+            dataset = self._datasets.get(path)
+            if dataset is None or dataset.changed() or (format and dataset.format != format):
+                if dataset is not None:
+                    self._results.invalidate(self._dataset_version(dataset))
+                dataset = self._datasets[path] = ColumnarDataset(path, format=format)
+            return dataset
+    
+    @staticmethod
+    def _dataset_version(dataset: ColumnarDataset) -> tuple:
+        return ('dataset', dataset.path, dataset.version)
+    
+    async def query_dataset(self, dataset, operations: Optional[List[Dict[str, Any]]] = None,
+                            columns: Optional[List[str]] = None, cache: bool = True) -> pd.DataFrame:
+        """
+        Consulta um dataset (caminho ou ``ColumnarDataset``) com as operações de
+        ``process_dataframe``: filtros e projeção vão para o leitor; o restante roda
+        no DataFrame resultante. ``columns`` limita as colunas lidas (None = todas).
+        Resultados ficam em cache até os arquivos do dataset mudarem.
+        """
+        try:
+            if isinstance(dataset, str):
+                dataset = await run_in_executor(self.open_dataset, dataset)
+            version = self._dataset_version(dataset)
+            if cache:
+                frame, _ = self._results.lookup(version, operations, columns, prefix=False)
+                if frame is not None:
+                    return frame.copy()
+            frame, remaining = await run_in_executor(dataset.scan, operations, columns)
+        except Exception as e:
+            raise ValueError(f"Erro ao consultar dataset: {e}")
+        if remaining:
+            frame = await self.process_dataframe(frame, remaining, cache=False)
+        if cache:
+            self._results.store(version, operations, columns, frame)
+            frame = frame.copy()
+        return frame
+    
+    async def process_dataframe(self, df: pd.DataFrame, operations: List[Dict[str, Any]],
+                                columns: Optional[List[str]] = None, version: Any = None,
+                                cache: bool = True) -> pd.DataFrame:
+        """
+        Processa DataFrame com lista de operações (``filter``, ``sort``, ``group``, ``rename``).
+        As operações são compiladas num plano (``services/query.py``): filtros são
+        combinados numa máscara e aplicados antes de ordenar/agrupar quando isso não
+        muda o resultado. ``columns`` limita as colunas do resultado (e as copiadas).
         
-        return result_df
+        Com ``version`` (identificador dos dados, a cargo de quem chama: mude-o quando
+        o DataFrame mudar) o resultado fica em cache por (versão, operações, colunas);
+        sem ele, é sempre calculado. Sempre retorna um DataFrame novo.
+        """
+        if not operations or not cache or version is None:
+            return QueryPlan.compile(operations, df.dtypes, columns).execute(df)
+        cached, remaining = self._results.lookup(version, operations, columns)
+        if cached is not None and not remaining:
+            # O cache é compartilhado: quem chama recebe uma cópia
+            return cached.copy() if columns is None else cached[list(columns)].copy()
+        source = df if cached is None else cached
+        result = QueryPlan.compile(remaining, source.dtypes, columns).execute(source)
+        self._results.store(version, operations, columns, result)
+        return result.copy()
+    
+    def invalidate_results(self, version: Any = None) -> int:
+        """Descarta resultados em cache de uma versão (ou todos)"""
+        return self._results.invalidate(version)
+    
+    def explain(self, operations: List[Dict[str, Any]], df: Optional[pd.DataFrame] = None,
+                columns: Optional[List[str]] = None) -> str:
+        """Plano que ``process_dataframe`` executaria para as operações"""
+        return QueryPlan.compile(operations, df.dtypes if df is not None else None, columns).explain()
     
     async def get_sample_sales_data(self, days: int = 30) -> List[Dict[str, Any]]:
         """Gera dados de vendas de exemplo"""
-        cache_key = f"sales_data_{days}"
-        cached_data = await self.get_cached_data(cache_key)
-        
-        if cached_data:
-            return cached_data
-        
-        base_date = datetime.now() - timedelta(days=days)
-        data = []
-        
-        for i in range(days):
-            date = base_date + timedelta(days=i)
-            data.append({
-                'date': date.strftime('%Y-%m-%d'),
-                'vendas': random.randint(1000, 5000),
-                'usuarios': random.randint(100, 800),
-                'pedidos': random.randint(20, 150),
-                'receita': random.randint(10000, 80000)
-            })
-        
-        await self.set_cached_data(cache_key, data)
-        return data
+        return await self.get_or_load(f"sales_data_{days}", lambda: self._build_sales_data(days))
+    
+    def _build_sales_data(self, days: int) -> List[Dict[str, Any]]:
+        return synthetic.sales(days=days).to_dict('records')
     
     async def get_sample_product_data(self, count: int = 10) -> List[Dict[str, Any]]:
         """Gera dados de produtos de exemplo"""
-        cache_key = f"product_data_{count}"
-        cached_data = await self.get_cached_data(cache_key)
-        
-        if cached_data:
-            return cached_data
-        
-        categorias = ['Eletrônicos', 'Roupas', 'Casa', 'Esporte', 'Livros']
-        status_options = ['Ativo', 'Inativo', 'Pendente', 'Descontinuado']
-        
-        data = []
-        for i in range(count):
-            data.append({
-                'produto': f'Produto {chr(65 + i)}',
-                'categoria': random.choice(categorias),
-                'preco': round(random.uniform(10.0, 500.0), 2),
-                'estoque': random.randint(0, 100),
-                'vendas': random.randint(0, 1000),
-                'receita': random.randint(1000, 50000),
-                'status': random.choice(status_options),
-                'rating': round(random.uniform(1.0, 5.0), 1)
-            })
-        
-        await self.set_cached_data(cache_key, data)
-        return data
+        return await self.get_or_load(f"product_data_{count}", lambda: self._build_product_data(count))
     
-    async def get_sample_user_data(self, count: int = 50) -> List[Dict[str, Any]]:
-        """Gera dados de usuários de exemplo"""
-        cache_key = f"user_data_{count}"
-        cached_data = await self.get_cached_data(cache_key)
-        
-        if cached_data:
-            return cached_data
-        
-        cidades = ['São Paulo', 'Rio de Janeiro', 'Belo Horizonte', 'Brasília', 'Porto Alegre']
-        estados = ['SP', 'RJ', 'MG', 'DF', 'RS']
-        
-        data = []
-        for i in range(count):
-            cidade_idx = random.randint(0, len(cidades) - 1)
-            data.append({
-                'usuario_id': f'user_{i:03d}',
-                'nome': f'Usuário {i + 1}',
-                'email': f'usuario{i + 1}@email.com',
-                'cidade': cidades[cidade_idx],
-                'estado': estados[cidade_idx],
-                'idade': random.randint(18, 70),
-                'pedidos': random.randint(0, 50),
-                'total_gasto': random.randint(0, 10000),
-                'ultimo_acesso': (datetime.now() - timedelta(days=random.randint(0, 30))).strftime('%Y-%m-%d')
-            })
-        
-        await self.set_cached_data(cache_key, data)
-        return data
+    def _build_product_data(self, count: int) -> List[Dict[str, Any]]:
+        return synthetic.products(count=count).to_dict('records')
     
-    async def calculate_statistics(self, data: List[Dict[str, Any]], 
-                                 numeric_columns: List[str]) -> Dict[str, Dict[str, float]]:
-        """Calcula estatísticas básicas para colunas numéricas"""
-        if not data:
+    async def calculate_statistics(self, data: Any, numeric_columns: List[str],
+                                   version: Any = None) -> Dict[str, Dict[str, float]]:
+        """
+        Calcula estatísticas básicas para colunas numéricas (lista de dicts ou DataFrame).
+        Todas as colunas numa passada vetorizada (``services/online_stats.py``), no pool
+        de threads. Com ``version`` (identificador dos dados, a cargo de quem chama) o
+        resultado fica em cache por versão; sem ele, é sempre recalculado.
+        """
+        if data is None or len(data) == 0:
             return {}
         
-        df = pd.DataFrame(data)
-        stats = {}
+        df = data if isinstance(data, pd.DataFrame) else pd.DataFrame(data)
+        compute = lambda: run_in_executor(StatsAccumulator(numeric_columns).update, df)
+        if version is None:
+            accumulator = await compute()
+        else:
+            accumulator = await self.get_or_load((version, tuple(numeric_columns)), compute, namespace=STATS_NAMESPACE)
+        return accumulator.result()
+    
+    async def stream_statistics(self, chunks: Any, numeric_columns: List[str]) -> Dict[str, Dict[str, float]]:
+        """
+        Estatísticas de blocos (iterável síncrono ou assíncrono de DataFrames/listas),
+        sem manter os dados em memória. A mediana vem de um sketch KLL (aproximada).
+        """
+        accumulator = StatsAccumulator(numeric_columns, QUANTILE_K)
+        async for chunk in _iterate(chunks):
+            partial = await run_in_executor(StatsAccumulator(numeric_columns, QUANTILE_K).update, chunk, False)
+            accumulator.merge(partial)
+        return accumulator.result()
+    
+    async def csv_statistics(self, file_path: str, numeric_columns: List[str],
+                             chunksize: int = ingest.DEFAULT_CHUNKSIZE, progress: Optional[Callable] = None,
+                             cancel: Any = None) -> Dict[str, Dict[str, float]]:
+        """Estatísticas de um CSV lido em blocos (só as colunas pedidas); em cache até o arquivo mudar"""
+        info = os.stat(file_path)
+        wanted = set(numeric_columns)
         
-        for column in numeric_columns:
-            if column in df.columns:
-                col_data = pd.to_numeric(df[column], errors='coerce').dropna()
-                if not col_data.empty:
-                    stats[column] = {
-                        'mean': float(col_data.mean()),
-                        'median': float(col_data.median()),
-                        'std': float(col_data.std()),
-                        'min': float(col_data.min()),
-                        'max': float(col_data.max()),
-                        'count': int(col_data.count())
-                    }
+        async def load():
+            chunks = self.iter_csv_chunks(file_path, chunksize=chunksize, usecols=lambda name: name in wanted,
+                                          progress=progress, cancel=cancel)
+            return await self.stream_statistics(chunks, numeric_columns)
         
-        return stats
+        key = ('file', file_path, info.st_size, info.st_mtime_ns, tuple(numeric_columns))
+        return await self.get_or_load(key, load, namespace=STATS_NAMESPACE)
+    
+    async def append_statistics(self, key: str, rows: Any, numeric_columns: List[str]) -> Dict[str, Dict[str, float]]:
+        """
+        Acumula linhas novas nas estatísticas de ``key`` (ex: eventos que chegam aos poucos)
+        sem reprocessar as anteriores; ``reset_statistics(key)`` recomeça.
+        """
+        partial = await run_in_executor(StatsAccumulator(numeric_columns, QUANTILE_K).update, rows, False)
+        with self._accumulators_lock:
+            accumulator = self._accumulators.get(key)
+            if accumulator is None:
+                accumulator = self._accumulators[key] = StatsAccumulator(numeric_columns, QUANTILE_K)
+            accumulator.merge(partial)
+            return accumulator.result()
+    
+    def reset_statistics(self, key: str) -> None:
+        with self._accumulators_lock:
+            self._accumulators.pop(key, None)
+    
+    async def update_sketches(self, key: str, rows: Any, columns: List[str]) -> ColumnSketches:
+        """
+        Alimenta os sketches de ``key`` (quantis, distintos, mais frequentes por coluna)
+        com um bloco de linhas; memória fixa por coluna, qualquer que seja o volume.
+        """
+        partial = await run_in_executor(ColumnSketches(columns).update, rows)
+        return self.merge_sketches(key, partial)
+    
+    def merge_sketches(self, key: str, sketches: ColumnSketches) -> ColumnSketches:
+        """Combina sketches vindos de outro bloco ou processo (ex: via pickle) aos de ``key``"""
+        with self._sketches_lock:
+            current = self._sketches.get(key)
+            if current is None:
+                current = self._sketches[key] = ColumnSketches(sketches.columns)
+            return current.merge(sketches)
+    
+    def sketch_summary(self, key: str, quantiles: List[float] = (0.25, 0.5, 0.75, 0.95),
+                       top: int = 10) -> Dict[str, Dict[str, Any]]:
+        """Por coluna: distintos aproximados, ``top`` mais frequentes e quantis (numéricas)"""
+        with self._sketches_lock:
+            sketches = self._sketches.get(key)
+            return sketches.summary(quantiles, top) if sketches is not None else {}
+    
+    def reset_sketches(self, key: str) -> None:
+        with self._sketches_lock:
+            self._sketches.pop(key, None)
     
     async def get_data_summary(self, data: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Retorna resumo dos dados"""
@@ -214,37 +384,7 @@ class DataService:
         Returns:
             Lista de dicionários com dados de usuários
         """
-        cache_key = f"user_data_{count}"
-        cached_data = await self.get_cached_data(cache_key)
-        
-        if cached_data:
-            return cached_data
-        
-        import random
-        from datetime import datetime, timedelta
-        
-        users = []
-        first_names = ['João', 'Maria', 'Pedro', 'Ana', 'Carlos', 'Sofia', 'Miguel', 'Beatriz', 'Tiago', 'Lucia']
-        last_names = ['Silva', 'Santos', 'Oliveira', 'Costa', 'Lima', 'Fernandes', 'Rocha', 'Alves', 'Pereira', 'Martins']
-        roles = ['Admin', 'User', 'Manager', 'Viewer', 'Editor']
-        departments = ['Vendas', 'Marketing', 'TI', 'RH', 'Financeiro']
-        
-        for i in range(count):
-            first = random.choice(first_names)
-            last = random.choice(last_names)
-            full_name = f'{first} {last}'
-            email = f'{first.lower()}.{last.lower()}{i+1}@company.com'
-            
-            users.append({
-                'name': full_name,
-                'email': email,
-                'role': random.choice(roles),
-                'department': random.choice(departments),
-                'last_login': (datetime.now() - timedelta(days=random.randint(1, 30))).strftime('%Y-%m-%d'),
-                'status': random.choice(['Ativo', 'Inativo']),
-                'projects': random.randint(1, 8),
-                'score': round(random.uniform(0, 100), 1)
-            })
-        
-        await self.set_cached_data(cache_key, users)
-        return users
+        return await self.get_or_load(f"user_data_{count}", lambda: self._build_user_data(count))
+    
+    def _build_user_data(self, count: int) -> List[Dict[str, Any]]:
+        return synthetic.users(count=count).to_dict('records')
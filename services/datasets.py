@@ -0,0 +1,214 @@
+"""
+Datasets colunares (Parquet / Arrow IPC) lidos sob demanda.
+
+Em vez de carregar o arquivo inteiro, cada consulta lê só as colunas necessárias
+e empurra para o leitor os filtros das operações de ``process_dataframe``: no
+Parquet, grupos de linhas cujas estatísticas não casam com o filtro nem são
+lidos. Os arquivos locais são mapeados em memória. O que não dá para empurrar
+(ordenação, agrupamento, renomeação, filtros após um agrupamento) volta como
+operações restantes para serem aplicadas no DataFrame resultante.
+
+Requer ``pyarrow`` (dependência opcional).
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import os
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.dataset as ds
+    import pyarrow.fs as pafs
+except ImportError:
+    # Sem pyarrow o DataService continua funcionando com CSV/Excel
+    pa = pc = ds = pafs = None
+
+from core.log import get_logger
+from services.query import is_regex
+
+logger = get_logger('data')
+
+PARQUET = 'parquet'
+IPC = 'ipc'
+
+_EXTENSIONS = {
+    '.parquet': PARQUET, '.pq': PARQUET,
+    '.arrow': IPC, '.ipc': IPC, '.feather': IPC,
+}
+
+# Operadores de filtro que viram expressões do Arrow, com a semântica do pandas
+_COMPARISONS = {
+    '==': lambda field, value: field == value,
+    # No pandas nulo != valor é verdadeiro; no Arrow a comparação com nulo descarta a linha
+    '!=': lambda field, value: (field != value) | field.is_null(),
+    '>': lambda field, value: field > value,
+    '<': lambda field, value: field < value,
+    '>=': lambda field, value: field >= value,
+    '<=': lambda field, value: field <= value,
+}
+
+
+def arrow_available() -> bool:
+    return ds is not None
+
+
+def _require_arrow() -> None:
+    if ds is None:
+        raise ImportError("pyarrow é necessário para datasets Parquet/Arrow (pip install pyarrow)")
+
+
+def infer_format(path: str) -> str:
+    """Formato pela extensão (diretórios: extensão do primeiro arquivo)"""
+    if os.path.isdir(path):
+        for name in sorted(os.listdir(path)):
+            fmt = _EXTENSIONS.get(os.path.splitext(name)[1].lower())
+            if fmt:
+                return fmt
+        return PARQUET
+    return _EXTENSIONS.get(os.path.splitext(path)[1].lower(), PARQUET)
+
+
+def _filter_expression(column: str, operator: str, value: Any):
+    """Expressão Arrow do filtro ou None se o operador não tiver equivalente"""
+    field = ds.field(column)
+    if operator in _COMPARISONS:
+        return _COMPARISONS[operator](field, value)
+    if operator == 'contains':
+        pattern = str(value)
+        if not is_regex(pattern):
+            return pc.match_substring(field, pattern)
+        try:
+            # RE2 não tem todos os recursos do re do Python: sem suporte, o filtro fica no pandas
+            pc.match_substring_regex(pa.array([''], type=pa.string()), pattern)
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+            return None
+        return pc.match_substring_regex(field, pattern)
+    if operator == 'in':
+        return field.isin(list(value))
+    return None
+
+
+def split_operations(operations: Sequence[Dict[str, Any]], columns: Sequence[str]):
+    """
+    Separa as operações em (expressão empurrável, operações restantes, colunas referenciadas).
+    Filtros comutam com ordenação e renomeação (o nome é traduzido para o da fonte);
+    depois de um agrupamento nada mais é empurrado.
+    """
+    source_names = {name: name for name in columns}
+    expression = None
+    remaining: List[Dict[str, Any]] = []
+    referenced = set()
+    grouped = False
+
+    for operation in operations or []:
+        op_type = operation.get('type')
+        if op_type == 'filter' and not grouped:
+            source = source_names.get(operation.get('column'))
+            pushed = None
+            if source is not None:
+                pushed = _filter_expression(source, operation.get('operator', '=='), operation.get('value'))
+            if pushed is not None:
+                expression = pushed if expression is None else expression & pushed
+                continue
+        remaining.append(operation)
+        if not grouped:
+            for key in ('column', 'columns'):
+                value = operation.get(key)
+                names = [value] if isinstance(value, str) else list(value or [])
+                referenced.update(source_names[name] for name in names if name in source_names)
+        if op_type == 'rename':
+            renamed = operation.get('columns') or {}
+            source_names = {renamed.get(name, name): source for name, source in source_names.items()}
+        elif op_type == 'group':
+            grouped = True
+    return expression, remaining, referenced
+
+
+class ColumnarDataset:
+    """Dataset Parquet/Arrow IPC (arquivo ou diretório) consultado sem carga completa"""
+
+    def __init__(self, path: str, format: Optional[str] = None):
+        _require_arrow()
+        self.path = path
+        self.format = format or infer_format(path)
+        filesystem = pafs.LocalFileSystem(use_mmap=True)
+        self._dataset = ds.dataset(path, format=self.format, filesystem=filesystem)
+        self.version = self.current_version()
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self._dataset.schema.names)
+
+    @property
+    def schema(self):
+        return self._dataset.schema
+
+    def current_version(self) -> Tuple:
+        """Impressão digital barata dos arquivos (caminho, tamanho, mtime)"""
+        stats = []
+        for file_path in sorted(self._dataset.files):
+            info = os.stat(file_path)
+            stats.append((file_path, info.st_size, info.st_mtime_ns))
+        return tuple(stats)
+
+    def changed(self) -> bool:
+        try:
+            return self.current_version() != self.version
+        except OSError:
+            return True
+
+    def count_rows(self, operations: Sequence[Dict[str, Any]] = None) -> int:
+        expression, _, _ = split_operations(operations, self.columns)
+        return self._dataset.count_rows(filter=expression)
+
+    def scan(self, operations: Sequence[Dict[str, Any]] = None,
+             columns: Optional[Sequence[str]] = None) -> Tuple[pd.DataFrame, List[Dict[str, Any]]]:
+        """
+        Lê só o necessário: ``columns`` (nomes da fonte; None = todas) mais as colunas
+        usadas pelas operações, com os filtros empurrados para o leitor.
+        Retorna (DataFrame, operações restantes).
+        """
+        expression, remaining, referenced = split_operations(operations, self.columns)
+        projection = None
+        if columns is not None:
+            wanted = list(dict.fromkeys(list(columns) + sorted(referenced)))
+            projection = [name for name in wanted if name in self.columns]
+        try:
+            table = self._dataset.to_table(columns=projection, filter=expression)
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError, pa.ArrowTypeError) as e:
+            # Tipos que o Arrow não compara (ex: texto x timestamp): filtra no pandas
+            logger.debug("Filtro não empurrado para %s: %s", self.path, e)
+            if columns is not None:
+                projection = [name for name in dict.fromkeys(list(columns) + self._operation_columns(operations))
+                              if name in self.columns]
+            table = self._dataset.to_table(columns=projection)
+            remaining = list(operations or [])
+        return table.to_pandas(), remaining
+
+    def _operation_columns(self, operations: Sequence[Dict[str, Any]]) -> List[str]:
+        names = []
+        for operation in operations or []:
+            for key in ('column', 'columns'):
+                value = operation.get(key)
+                if isinstance(value, dict):
+                    names.extend(value.keys())
+                elif isinstance(value, str):
+                    names.append(value)
+                elif value:
+                    names.extend(value)
+        return names
+
+
+def write_dataset(frame: pd.DataFrame, path: str, format: Optional[str] = None,
+                  row_group_size: int = 128 * 1024) -> None:
+    """Grava um DataFrame como Parquet (grupos de linhas menores = pushdown mais seletivo) ou Arrow IPC"""
+    _require_arrow()
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    if (format or infer_format(path)) == IPC:
+        import pyarrow.feather as feather
+        feather.write_feather(table, path)
+    else:
+        import pyarrow.parquet as pq
+        pq.write_table(table, path, row_group_size=row_group_size)
@@ -0,0 +1,106 @@
+"""
+Leitura de CSV/Excel sem bloquear o event loop.
+
+O parsing roda no pool de threads do processo (``core.executor``). CSVs podem ser
+lidos em blocos (``chunksize``) por um iterador assíncrono; entre um bloco e
+outro o progresso é informado e o cancelamento é verificado. Projeção de
+colunas (``usecols``) e tipos (``dtype``) vão direto para o pandas.
+"""
+
+from typing import Any, AsyncIterator, Callable, Optional
+import inspect
+import os
+
+import pandas as pd
+
+from core.executor import run_in_executor
+
+DEFAULT_CHUNKSIZE = 100_000
+
+
+class LoadCancelled(Exception):
+    """Carga interrompida a pedido (ex: cliente saiu ou iniciou outra carga)"""
+
+
+def is_cancelled(cancel: Any) -> bool:
+    """``cancel`` pode ser um Event (threading/asyncio) ou uma função que retorna bool"""
+    if cancel is None:
+        return False
+    if hasattr(cancel, 'is_set'):
+        return cancel.is_set()
+    return bool(cancel())
+
+
+async def notify(progress: Optional[Callable], fraction: float, rows: int) -> None:
+    """Chama ``progress(fração, linhas)`` (função ou corrotina)"""
+    if progress is None:
+        return
+    result = progress(fraction, rows)
+    if inspect.isawaitable(result):
+        await result
+
+
+def _next_chunk(reader) -> Optional[pd.DataFrame]:
+    return next(reader, None)
+
+
+def _open(file_path: str):
+    """Abre o arquivo e mede o tamanho (I/O de disco: roda no pool de threads)"""
+    handle = open(file_path, 'rb')
+    try:
+        return handle, os.fstat(handle.fileno()).st_size
+    except BaseException:
+        handle.close()
+        raise
+
+
+async def iter_csv_chunks(file_path: str, chunksize: int = DEFAULT_CHUNKSIZE, usecols=None, dtype=None,
+                          progress: Optional[Callable] = None, cancel: Any = None,
+                          **read_kwargs) -> AsyncIterator[pd.DataFrame]:
+    """Blocos do CSV, cada um lido no pool de threads; progresso pela posição no arquivo"""
+    handle, total = await run_in_executor(_open, file_path)
+    try:
+        reader = await run_in_executor(pd.read_csv, handle, chunksize=chunksize, usecols=usecols,
+                                       dtype=dtype, **read_kwargs)
+        rows = 0
+        with reader:
+            while True:
+                if is_cancelled(cancel):
+                    raise LoadCancelled(file_path)
+                chunk = await run_in_executor(_next_chunk, reader)
+                if chunk is None:
+                    break
+                rows += len(chunk)
+                await notify(progress, min(1.0, handle.tell() / total) if total else 1.0, rows)
+                yield chunk
+    finally:
+        handle.close()
+
+
+async def read_csv(file_path: str, usecols=None, dtype=None, chunksize: Optional[int] = None,
+                   progress: Optional[Callable] = None, cancel: Any = None, **read_kwargs) -> pd.DataFrame:
+    """CSV inteiro; com progresso/cancelamento (ou ``chunksize``) lê em blocos e concatena"""
+    if chunksize is None and progress is None and cancel is None:
+        return await run_in_executor(pd.read_csv, file_path, usecols=usecols, dtype=dtype, **read_kwargs)
+    chunks = [chunk async for chunk in iter_csv_chunks(
+        file_path, chunksize=chunksize or DEFAULT_CHUNKSIZE, usecols=usecols, dtype=dtype,
+        progress=progress, cancel=cancel, **read_kwargs
+    )]
+    if not chunks:
+        return await run_in_executor(pd.read_csv, file_path, usecols=usecols, dtype=dtype, nrows=0, **read_kwargs)
+    return await run_in_executor(pd.concat, chunks, ignore_index=True)
+
+
+async def read_excel(file_path: str, sheet_name=None, usecols=None, dtype=None,
+                     progress: Optional[Callable] = None, cancel: Any = None, **read_kwargs):
+    """Excel no pool de threads (o pandas não lê Excel em blocos: progresso só no início e no fim)"""
+    if is_cancelled(cancel):
+        raise LoadCancelled(file_path)
+    await notify(progress, 0.0, 0)
+    result = await run_in_executor(pd.read_excel, file_path, sheet_name=sheet_name, usecols=usecols,
+                                   dtype=dtype, **read_kwargs)
+    if is_cancelled(cancel):
+        raise LoadCancelled(file_path)
+    rows = len(result) if isinstance(result, pd.DataFrame) else sum(len(df) for df in result.values())
+    await notify(progress, 1.0, rows)
+    return result
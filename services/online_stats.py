@@ -0,0 +1,195 @@
+"""
+Estatísticas em uma passada, por blocos e combináveis.
+
+``StatsAccumulator`` guarda, por coluna, contagem, média, soma dos quadrados
+dos desvios (M2), mínimo e máximo. Cada bloco é processado de uma vez para
+todas as colunas (matriz NumPy) e os acumuladores se combinam pela fórmula de
+Chan/Welford, então o resultado não depende de como os dados foram divididos:
+dá para somar blocos de um CSV maior que a memória, acumular linhas novas ou
+juntar resultados de vários processos.
+
+A mediana exata só é possível com todos os dados de uma vez: ela existe quando
+o acumulador recebeu um único bloco. Com ``quantile_k`` cada coluna mantém
+também um sketch KLL (``services/sketches.py``) e, depois de combinações, a
+mediana vem dele (aproximada); sem ele, vira ``None``.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import copy
+
+import numpy as np
+import pandas as pd
+
+from services.sketches import QuantileSketch
+
+# Linhas por bloco ao processar DataFrames grandes (limita a matriz temporária)
+BLOCK_ROWS = 1_000_000
+
+
+def numeric_matrix(frame: pd.DataFrame, columns: Sequence[str]) -> Tuple[np.ndarray, bool]:
+    """
+    Matriz float (linhas x colunas, colunas contíguas) e se ela pode ter NaN;
+    colunas ausentes ou não numéricas viram NaN.
+    """
+    matrix = np.full((len(frame), len(columns)), np.nan, order='F')
+    nullable = False
+    for position, column in enumerate(columns):
+        if column not in frame.columns:
+            nullable = True
+            continue
+        series = frame[column]
+        if not (pd.api.types.is_integer_dtype(series.dtype)
+                and not pd.api.types.is_extension_array_dtype(series.dtype)):
+            nullable = True
+            if not (pd.api.types.is_numeric_dtype(series.dtype) and not pd.api.types.is_bool_dtype(series.dtype)):
+                series = pd.to_numeric(series, errors='coerce')
+        matrix[:, position] = series.to_numpy(dtype=float, na_value=np.nan)
+    return matrix, nullable
+
+
+def _medians(matrix: np.ndarray, nullable: bool) -> np.ndarray:
+    if not nullable:
+        return np.median(matrix, axis=0) if len(matrix) else np.full(matrix.shape[1], np.nan)
+    medians = []
+    for index in range(matrix.shape[1]):
+        values = matrix[:, index]
+        values = values[~np.isnan(values)]
+        medians.append(np.median(values) if len(values) else np.nan)
+    return np.array(medians, dtype=float)
+
+
+class StatsAccumulator:
+    """Contagem, média, desvio, mínimo e máximo de várias colunas, combináveis"""
+
+    def __init__(self, columns: Sequence[str], quantile_k: Optional[int] = None):
+        self.columns: List[str] = list(columns)
+        self.quantile_k = quantile_k
+        self.sketches: Optional[List[QuantileSketch]] = (
+            [QuantileSketch(quantile_k) for _ in self.columns] if quantile_k else None
+        )
+        size = len(self.columns)
+        self.count = np.zeros(size, dtype=np.int64)
+        self.mean = np.zeros(size)
+        self.m2 = np.zeros(size)
+        self.min = np.full(size, np.nan)
+        self.max = np.full(size, np.nan)
+        self.median: Optional[np.ndarray] = None
+        self.batches = 0
+
+    def update(self, data: Any, exact_median: bool = True) -> 'StatsAccumulator':
+        """
+        Acrescenta linhas (DataFrame ou lista de dicts). No primeiro bloco,
+        ``exact_median`` calcula também a mediana exata.
+        """
+        frame = data if isinstance(data, pd.DataFrame) else pd.DataFrame(data)
+        median = exact_median and self.batches == 0 and len(frame) > 0
+        self.median = None
+        for start in range(0, len(frame), BLOCK_ROWS):
+            matrix, nullable = numeric_matrix(frame.iloc[start:start + BLOCK_ROWS], self.columns)
+            self._update_matrix(matrix, nullable)
+            if self.sketches is not None:
+                for index, sketch in enumerate(self.sketches):
+                    sketch.update(matrix[:, index])
+            if median and len(frame) <= BLOCK_ROWS:
+                self.median = _medians(matrix, nullable)
+        if median and self.median is None:
+            self.median = _medians(*numeric_matrix(frame, self.columns))
+        self.batches += 1
+        return self
+
+    def _update_matrix(self, matrix: np.ndarray, nullable: bool) -> None:
+        """Momentos do bloco para todas as colunas de uma vez, combinados aos atuais"""
+        if not len(matrix):
+            return
+        block = StatsAccumulator(self.columns)
+        if nullable:
+            valid = ~np.isnan(matrix)
+            block.count = valid.sum(axis=0)
+            filled = np.where(valid, matrix, 0.0)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                block.mean = np.where(block.count > 0, filled.sum(axis=0) / np.maximum(block.count, 1), 0.0)
+            deviations = np.where(valid, matrix - block.mean, 0.0)
+            block.min = np.fmin.reduce(matrix, axis=0)
+            block.max = np.fmax.reduce(matrix, axis=0)
+        else:
+            block.count = np.full(matrix.shape[1], len(matrix), dtype=np.int64)
+            block.mean = matrix.sum(axis=0) / len(matrix)
+            deviations = matrix - block.mean
+            block.min = matrix.min(axis=0)
+            block.max = matrix.max(axis=0)
+        block.m2 = np.einsum('ij,ij->j', deviations, deviations)
+        self._combine(block)
+
+    def _combine(self, other: 'StatsAccumulator') -> None:
+        """Combinação paralela de Chan: médias e M2 ponderados pelas contagens"""
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        with np.errstate(invalid='ignore', divide='ignore'):
+            weight = np.where(total > 0, other.count / np.maximum(total, 1), 0.0)
+        self.mean = self.mean + delta * weight
+        self.m2 = self.m2 + other.m2 + delta ** 2 * self.count * weight
+        self.min = np.fmin(self.min, other.min)
+        self.max = np.fmax(self.max, other.max)
+        self.count = total
+
+    def merge(self, other: 'StatsAccumulator') -> 'StatsAccumulator':
+        """Combina outro acumulador (mesmas colunas ou subconjunto/superconjunto)"""
+        if other.columns != self.columns:
+            other = other.aligned(self.columns)
+        if not other.batches:
+            return self
+        if self.batches:
+            self.median = None
+        else:
+            self.median = None if other.median is None else other.median.copy()
+        self._combine(other)
+        if self.sketches is not None and other.sketches is not None:
+            for sketch, incoming in zip(self.sketches, other.sketches):
+                sketch.merge(incoming)
+        self.batches += other.batches
+        return self
+
+    def aligned(self, columns: Sequence[str]) -> 'StatsAccumulator':
+        """Cópia reordenada para ``columns`` (colunas novas começam vazias)"""
+        result = StatsAccumulator(columns, self.quantile_k)
+        positions = {name: index for index, name in enumerate(self.columns)}
+        for index, name in enumerate(result.columns):
+            source = positions.get(name)
+            if source is None:
+                continue
+            result.count[index] = self.count[source]
+            result.mean[index] = self.mean[source]
+            result.m2[index] = self.m2[source]
+            result.min[index] = self.min[source]
+            result.max[index] = self.max[source]
+            if self.sketches is not None:
+                result.sketches[index] = copy.deepcopy(self.sketches[source])
+        if self.median is not None:
+            result.median = np.array([self.median[positions[name]] if name in positions else np.nan
+                                      for name in result.columns])
+        result.batches = self.batches
+        return result
+
+    def copy(self) -> 'StatsAccumulator':
+        return copy.deepcopy(self)
+
+    def result(self) -> Dict[str, Dict[str, Any]]:
+        """Estatísticas por coluna (só colunas com valores); ``std`` amostral como no pandas"""
+        stats = {}
+        for index, column in enumerate(self.columns):
+            count = int(self.count[index])
+            if not count:
+                continue
+            std = float(np.sqrt(self.m2[index] / (count - 1))) if count > 1 else float('nan')
+            median = self.median[index] if self.median is not None else None
+            if median is None and self.sketches is not None:
+                median = self.sketches[index].median()
+            stats[column] = {
+                'mean': float(self.mean[index]),
+                'median': float(median) if median is not None else None,
+                'std': std,
+                'min': float(self.min[index]),
+                'max': float(self.max[index]),
+                'count': count,
+            }
+        return stats
@@ -0,0 +1,297 @@
+"""
+Planejador das operações de ``DataService.process_dataframe``.
+
+A lista de operações (``filter``, ``sort``, ``group``, ``rename``) é compilada
+num plano antes de tocar nos dados:
+
+- filtros sobem para antes de ordenações, renomeações (o nome é traduzido) e
+  agrupamentos cujas chaves incluem a coluna filtrada (as linhas são as mesmas;
+  o índice do agrupamento, já renumerado, fica sem buracos); filtros vizinhos viram
+  uma única máscara booleana, aplicada com uma só cópia das linhas;
+- com ``columns`` (colunas do resultado), só as colunas usadas pelo plano são
+  copiadas;
+- ``contains`` sem metacaracteres busca texto literal, e em colunas de texto o
+  teste roda uma vez por valor distinto, não por linha.
+
+``QueryPlan.explain()`` mostra o plano.
+"""
+
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+import re
+
+import numpy as np
+import pandas as pd
+
+FILTER = 'filter'
+SORT = 'sort'
+GROUP = 'group'
+RENAME = 'rename'
+
+_REGEX_CHARS = re.compile(r'[.^$*+?{}\[\]\\|()]')
+
+
+def _as_list(value: Any) -> List[Any]:
+    if value is None:
+        return []
+    if isinstance(value, (list, tuple)):
+        return list(value)
+    return [value]
+
+
+def _bool_array(result: Any) -> np.ndarray:
+    """Máscara em ndarray de bool (NA conta como falso)"""
+    if isinstance(result, pd.Series):
+        if result.dtype == bool:
+            return result.to_numpy()
+        return result.to_numpy(dtype=bool, na_value=False)
+    return np.asarray(result, dtype=bool)
+
+
+def _is_text(series: pd.Series) -> bool:
+    return (isinstance(series.dtype, pd.CategoricalDtype)
+            or pd.api.types.is_object_dtype(series.dtype)
+            or pd.api.types.is_string_dtype(series.dtype))
+
+
+def is_regex(pattern: str) -> bool:
+    """``contains`` trata o padrão como regex só se houver metacaracteres"""
+    return bool(_REGEX_CHARS.search(pattern))
+
+
+def _contains(series: pd.Series, pattern: str) -> np.ndarray:
+    regex = is_regex(pattern)
+    if not _is_text(series):
+        return _bool_array(series.str.contains(pattern, na=False, regex=regex))
+    # Um teste por valor distinto; código -1 (nulo) vira falso
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes, uniques = series.cat.codes.to_numpy(), pd.Series(series.cat.categories)
+    else:
+        codes, uniques = pd.factorize(series)
+        uniques = pd.Series(uniques, dtype=object)
+    # Como ``.str.contains`` na coluna: só valores str casam (12 não casa com "1")
+    is_str = np.fromiter((isinstance(v, str) for v in uniques), dtype=bool, count=len(uniques))
+    matches = np.zeros(len(uniques) + 1, dtype=bool)
+    if is_str.any():
+        matches[:-1][is_str] = _bool_array(uniques[is_str].str.contains(pattern, na=False, regex=regex))
+    return matches[codes]
+
+
+class Predicate:
+    """Um filtro: ``coluna operador valor``"""
+
+    __slots__ = ('column', 'operator', 'value')
+
+    OPERATORS = ('==', '!=', '>', '<', '>=', '<=', 'contains', 'in')
+
+    def __init__(self, column: str, operator: str, value: Any):
+        self.column = column
+        self.operator = operator
+        self.value = value
+
+    def evaluate(self, frame: pd.DataFrame) -> np.ndarray:
+        series = frame[self.column]
+        operator, value = self.operator, self.value
+        if operator == '==':
+            return _bool_array(series == value)
+        if operator == '!=':
+            return _bool_array(series != value)
+        if operator == '>':
+            return _bool_array(series > value)
+        if operator == '<':
+            return _bool_array(series < value)
+        if operator == '>=':
+            return _bool_array(series >= value)
+        if operator == '<=':
+            return _bool_array(series <= value)
+        if operator == 'contains':
+            return _contains(series, str(value))
+        return _bool_array(series.isin(_as_list(value)))
+
+    def describe(self) -> str:
+        return f"{self.column} {self.operator} {self.value!r}"
+
+
+class Step:
+    """Passo do plano; filtros vizinhos compartilham um passo (uma máscara)"""
+
+    __slots__ = ('kind', 'predicates', 'columns', 'ascending', 'agg_func', 'mapping')
+
+    def __init__(self, kind: str, predicates: Optional[List[Predicate]] = None, columns: Any = None,
+                 ascending: Any = True, agg_func: Any = 'sum', mapping: Any = None):
+        self.kind = kind
+        self.predicates = predicates or []
+        self.columns = columns
+        self.ascending = ascending
+        self.agg_func = agg_func
+        self.mapping = mapping
+
+    def mask(self, frame: pd.DataFrame) -> np.ndarray:
+        mask = None
+        for predicate in self.predicates:
+            matched = predicate.evaluate(frame)
+            mask = matched if mask is None else mask & matched
+            if not mask.any():
+                break
+        return mask
+
+    def referenced(self) -> List[str]:
+        """Colunas que o passo lê (nomes vigentes no ponto do plano)"""
+        if self.kind == FILTER:
+            return [predicate.column for predicate in self.predicates]
+        if self.kind == SORT:
+            return _as_list(self.columns)
+        if self.kind == GROUP:
+            names = _as_list(self.columns)
+            if isinstance(self.agg_func, dict):
+                names.extend(self.agg_func)
+            return names
+        return []
+
+    def describe(self) -> str:
+        if self.kind == FILTER:
+            return "filter: " + " AND ".join(p.describe() for p in self.predicates)
+        if self.kind == SORT:
+            return f"sort: {self.columns} ascending={self.ascending}"
+        if self.kind == GROUP:
+            return f"group: {self.columns} agg={self.agg_func!r}"
+        return f"rename: {self.mapping}"
+
+
+class QueryPlan:
+    """Plano compilado: passos, projeção inicial e colunas do resultado"""
+
+    def __init__(self, steps: List[Step], projection: Optional[List[str]] = None,
+                 output: Optional[List[str]] = None):
+        self.steps = steps
+        self.projection = projection
+        self.output = output
+
+    @classmethod
+    def compile(cls, operations: Sequence[Dict[str, Any]], dtypes: Optional[Mapping[str, Any]] = None,
+                columns: Optional[Sequence[str]] = None) -> 'QueryPlan':
+        """
+        Compila as operações. ``dtypes`` (coluna -> dtype do DataFrame de entrada)
+        habilita a projeção e evita subir filtros por chaves categóricas;
+        ``columns`` restringe as colunas do resultado.
+        """
+        steps: List[Step] = []
+        categorical = set()
+        if dtypes is not None:
+            categorical = {name for name, dtype in dtypes.items() if isinstance(dtype, pd.CategoricalDtype)}
+        for operation in operations or []:
+            op_type = operation.get('type')
+            if op_type == FILTER:
+                operator = operation.get('operator', '==')
+                if operator in Predicate.OPERATORS:
+                    cls._place_filter(steps, Predicate(operation.get('column'), operator,
+                                                       operation.get('value')), categorical)
+            elif op_type == SORT:
+                steps.append(Step(SORT, columns=operation.get('column'),
+                                  ascending=operation.get('ascending', True)))
+            elif op_type == GROUP:
+                steps.append(Step(GROUP, columns=operation.get('columns'),
+                                  agg_func=operation.get('agg_func', 'sum')))
+            elif op_type == RENAME:
+                steps.append(Step(RENAME, mapping=operation.get('columns')))
+
+        output = list(columns) if columns is not None else None
+        projection = None
+        if output is not None and dtypes is not None:
+            projection = cls._projection(steps, list(dtypes.keys()), output)
+        return cls(steps, projection, output)
+
+    @staticmethod
+    def _place_filter(steps: List[Step], predicate: Predicate, categorical: set) -> None:
+        """Sobe o filtro o máximo possível sem mudar o resultado"""
+        position = len(steps)
+        column = predicate.column
+        while position > 0:
+            previous = steps[position - 1]
+            if previous.kind == SORT:
+                position -= 1
+            elif previous.kind == RENAME and isinstance(previous.mapping, dict):
+                sources = [old for old, new in previous.mapping.items() if new == column]
+                if len(sources) > 1 or (not sources and column in previous.mapping):
+                    break
+                column = sources[0] if sources else column
+                position -= 1
+            elif (previous.kind == GROUP and column in _as_list(previous.columns)
+                  and column not in categorical):
+                # Filtrar pela chave antes ou depois de agrupar dá os mesmos grupos
+                position -= 1
+            else:
+                break
+        predicate.column = column
+        if position > 0 and steps[position - 1].kind == FILTER:
+            steps[position - 1].predicates.append(predicate)
+        elif position < len(steps) and steps[position].kind == FILTER:
+            steps[position].predicates.insert(0, predicate)
+        else:
+            steps.insert(position, Step(FILTER, predicates=[predicate]))
+
+    @staticmethod
+    def _projection(steps: List[Step], columns: List[str], output: List[str]) -> List[str]:
+        """
+        Colunas da entrada usadas pelo plano ou pelo resultado, na ordem original.
+        Filtros iniciais leem o DataFrame de entrada e não entram na projeção.
+        """
+        source_of = {name: name for name in columns}
+        needed = set()
+        leading = True
+        for step in steps:
+            leading = leading and step.kind == FILTER
+            if leading:
+                continue
+            needed.update(source_of[name] for name in step.referenced() if name in source_of)
+            if step.kind == RENAME:
+                if not isinstance(step.mapping, dict):
+                    return list(columns)
+                source_of = {step.mapping.get(name, name): source for name, source in source_of.items()}
+        needed.update(source_of[name] for name in output if name in source_of)
+        return [name for name in columns if name in needed]
+
+    def execute(self, frame: pd.DataFrame) -> pd.DataFrame:
+        result = frame
+        projection = self.projection
+        if projection is not None and len(projection) == len(frame.columns):
+            projection = None
+        copied = False
+        for step in self.steps:
+            if step.kind == FILTER:
+                mask = step.mask(result)
+                if projection is not None:
+                    result = result.loc[mask, projection]
+                    projection = None
+                else:
+                    result = result[mask]
+                copied = True
+                continue
+            if projection is not None:
+                result = result[projection]
+                projection = None
+            if step.kind == SORT:
+                # Estável: filtrar antes ou depois de ordenar dá a mesma ordem nos empates
+                result = result.sort_values(by=step.columns, ascending=step.ascending, kind='stable')
+            elif step.kind == GROUP:
+                result = result.groupby(step.columns).agg(step.agg_func).reset_index()
+            else:
+                result = result.rename(columns=step.mapping)
+            copied = True
+        if projection is not None:
+            result = result[projection]
+            copied = True
+        if self.output is not None:
+            result = result[self.output]
+        elif not copied:
+            result = result.copy()
+        return result
+
+    def explain(self) -> str:
+        lines = []
+        if self.projection is not None:
+            lines.append(f"project: {self.projection}")
+        for step in self.steps:
+            lines.append(step.describe())
+        if self.output is not None:
+            lines.append(f"output: {self.output}")
+        return "\n".join(lines) or "(sem operações)"
@@ -0,0 +1,119 @@
+"""
+Cache de resultados de ``process_dataframe``.
+
+A chave é (versão da fonte, operações canônicas, colunas). A versão de um
+DataFrame é informada por quem chama (sem ela nada é guardado); a de um dataset
+colunar vem dos arquivos. Fonte alterada = chave nova; as entradas antigas saem
+por LRU/TTL ou por ``invalidate``.
+
+Filtros vizinhos são ordenados na forma canônica (comutam), e um resultado em
+cache de um prefixo das operações (ex: "filtro A") alimenta pedidos mais longos
+("filtro A + ordenação B"), que só executam o restante.
+
+Os resultados ficam no ``DataCache`` (namespace ``results``, com teto de bytes
+próprio) e são compartilhados entre usuários: o ``DataService`` devolve cópias.
+"""
+
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from core.config import get_config
+from services.cache import DataCache
+
+RESULTS_NAMESPACE = 'results'
+
+_DEFAULTS = {
+    'filter': {'operator': '=='},
+    'sort': {'ascending': True},
+    'group': {'agg_func': 'sum'},
+}
+
+
+def _freeze(value: Any) -> Hashable:
+    if isinstance(value, dict):
+        return ('dict',) + tuple(sorted(((str(k), _freeze(v)) for k, v in value.items()), key=repr))
+    if isinstance(value, (list, tuple)):
+        return ('list',) + tuple(_freeze(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return ('set',) + tuple(sorted((_freeze(item) for item in value), key=repr))
+    try:
+        hash(value)
+    except TypeError:
+        return ('repr', repr(value))
+    # O tipo entra na chave: 1, 1.0 e True têm o mesmo hash
+    return (type(value).__name__, value)
+
+
+def canonical(operations: Sequence[Dict[str, Any]]) -> List[Tuple[Hashable, Dict[str, Any]]]:
+    """Pares (forma canônica, operação) com padrões explícitos e filtros vizinhos ordenados"""
+    pairs = []
+    for operation in operations or []:
+        normalized = dict(_DEFAULTS.get(operation.get('type'), {}), **operation)
+        pairs.append((_freeze(normalized), operation))
+    result, run = [], []
+    for pair in pairs:
+        if pair[1].get('type') == 'filter':
+            run.append(pair)
+            continue
+        result.extend(sorted(run, key=lambda item: repr(item[0])))
+        run = []
+        result.append(pair)
+    result.extend(sorted(run, key=lambda item: repr(item[0])))
+    return result
+
+
+class ResultCache:
+    """Resultados de ``process_dataframe`` por (versão, operações, colunas)"""
+    _instance = None
+
+    def __init__(self, cache: DataCache = None, namespace: str = RESULTS_NAMESPACE):
+        self._cache = cache or DataCache.get_instance()
+        self.namespace = namespace
+
+    @classmethod
+    def get_instance(cls):
+        if cls._instance is None:
+            cache = DataCache.get_instance()
+            cache.configure(RESULTS_NAMESPACE, max_bytes=get_config().result_cache_max_bytes)
+            cls._instance = ResultCache(cache)
+        return cls._instance
+
+    @staticmethod
+    def _key(version: Hashable, ops: Sequence[Hashable], columns: Optional[Sequence[str]]) -> Tuple:
+        return (version, tuple(ops), tuple(columns) if columns is not None else None)
+
+    def lookup(self, version: Hashable, operations: Sequence[Dict[str, Any]],
+               columns: Optional[Sequence[str]] = None,
+               prefix: bool = True) -> Tuple[Optional[pd.DataFrame], List[Dict[str, Any]]]:
+        """
+        (resultado em cache, operações que faltam executar sobre ele).
+        Sem resultado completo e com ``prefix``, usa o maior prefixo em cache (sempre
+        com todas as colunas: projete o resultado); sem nenhum, retorna
+        (None, operações em ordem canônica).
+        """
+        pairs = canonical(operations)
+        ops = [pair[0] for pair in pairs]
+        ordered = [pair[1] for pair in pairs]
+        frame = self._cache.get(self._key(version, ops, columns), namespace=self.namespace)
+        if frame is not None or not prefix:
+            return frame, [] if frame is not None else ordered
+        for size in range(len(ops) - (1 if columns is None else 0), 0, -1):
+            key = self._key(version, ops[:size], None)
+            if self._cache.contains(key, namespace=self.namespace):
+                frame = self._cache.get(key, namespace=self.namespace)
+                if frame is not None:
+                    self._cache.record('prefix_hits', self.namespace)
+                    return frame, ordered[size:]
+        return None, ordered
+
+    def store(self, version: Hashable, operations: Sequence[Dict[str, Any]],
+              columns: Optional[Sequence[str]], frame: pd.DataFrame) -> None:
+        ops = [pair[0] for pair in canonical(operations)]
+        self._cache.set(self._key(version, ops, columns), frame, namespace=self.namespace)
+
+    def invalidate(self, version: Optional[Hashable] = None) -> int:
+        """Remove os resultados de uma versão da fonte (ou todos); retorna quantos saíram"""
+        if version is None:
+            return self._cache.discard(lambda key: True, namespace=self.namespace)
+        return self._cache.discard(lambda key: key[0] == version, namespace=self.namespace)
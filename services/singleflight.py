@@ -0,0 +1,60 @@
+"""
+Single-flight: chamadas concorrentes para a mesma chave compartilham uma execução.
+
+Quando vários clientes perdem o cache ao mesmo tempo (ex: expiração na virada
+da hora), só a primeira chamada executa a carga; as demais aguardam o mesmo
+resultado. Erros chegam a todos os que aguardavam e nada é guardado: a próxima
+chamada tenta de novo. A carga roda numa tarefa própria, então cancelar quem a
+iniciou (cliente desconectado) não derruba os outros.
+"""
+
+from typing import Any, Awaitable, Callable, Dict, Hashable, Union
+import asyncio
+import inspect
+
+
+class SingleFlight:
+    """Registro das cargas em andamento, compartilhado pelo processo"""
+    _instance = None
+
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    @classmethod
+    def get_instance(cls):
+        if cls._instance is None:
+            cls._instance = SingleFlight()
+        return cls._instance
+
+    def in_flight(self, key: Hashable) -> bool:
+        return key in self._calls
+
+    async def run(self, key: Hashable, func: Callable[[], Union[Any, Awaitable[Any]]]) -> Any:
+        """Resultado de ``func()``, executada uma vez para todas as chamadas simultâneas da chave"""
+        return await asyncio.shield(self.start(key, func))
+
+    def start(self, key: Hashable, func: Callable[[], Union[Any, Awaitable[Any]]]) -> asyncio.Future:
+        """Inicia a carga (ou retorna a que já está em andamento) sem aguardar o resultado"""
+        task = self._calls.get(key)
+        if task is not None:
+            self.coalesced += 1
+            return task
+        task = self._calls[key] = asyncio.ensure_future(self._execute(key, func))
+        # Cargas em segundo plano podem terminar sem ninguém aguardando: consome o erro
+        task.add_done_callback(lambda done: done.cancelled() or done.exception())
+        return task
+
+    async def _execute(self, key: Hashable, func: Callable) -> Any:
+        self.executions += 1
+        try:
+            result = func()
+            if inspect.isawaitable(result):
+                result = await result
+            return result
+        finally:
+            self._calls.pop(key, None)
+
+    def stats(self) -> Dict[str, int]:
+        return {'executions': self.executions, 'coalesced': self.coalesced, 'in_flight': len(self._calls)}
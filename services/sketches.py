@@ -0,0 +1,295 @@
+"""
+Sketches de memória fixa para resumos de colunas grandes ou em streaming.
+
+- ``QuantileSketch`` (KLL): quantis aproximados (mediana, p95...) com erro de
+  rank ~1/k, guardando O(k) valores.
+- ``DistinctSketch`` (HyperLogLog): contagem de distintos com erro ~1.04/sqrt(2^p),
+  em 2^p bytes.
+- ``FrequencySketch`` (Count-Min + candidatos): itens mais frequentes e a
+  frequência aproximada de qualquer valor (nunca subestima).
+
+Todos são alimentados por blocos (arrays/Series, vetorizado em NumPy), combinam
+com ``merge`` (blocos, threads ou processos: os objetos são serializáveis com
+pickle) e usam hashes estáveis entre processos (``pandas.util.hash_array``).
+``ColumnSketches`` reúne os três por coluna de um DataFrame.
+"""
+
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple
+import copy
+import math
+
+import numpy as np
+import pandas as pd
+
+
+def _non_null(values: Any) -> pd.Series:
+    series = values if isinstance(values, pd.Series) else pd.Series(values)
+    return series.dropna()
+
+
+def hash_values(values: Any) -> np.ndarray:
+    """
+    Hash de 64 bits estável de cada valor (números por valor, 1 == 1.0;
+    demais por texto). Nulos são ignorados.
+    """
+    series = _non_null(values)
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes = series.cat.codes.to_numpy()
+        return hash_values(pd.Series(series.cat.categories))[codes]
+    if pd.api.types.is_numeric_dtype(series.dtype) and not pd.api.types.is_bool_dtype(series.dtype):
+        return pd.util.hash_array(series.to_numpy(dtype=float))
+    return pd.util.hash_array(series.astype(str).to_numpy(dtype=object))
+
+
+class QuantileSketch:
+    """Sketch KLL: compactadores por nível; um item no nível h pesa 2^h"""
+
+    def __init__(self, k: int = 256, seed: Optional[int] = None):
+        self.k = k
+        self.levels: List[np.ndarray] = [np.empty(0)]
+        self.count = 0
+        self.min = np.nan
+        self.max = np.nan
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.levels) - level - 1
+        return max(2, int(math.ceil(self.k * (2 / 3) ** depth)))
+
+    def update(self, values: Any) -> 'QuantileSketch':
+        array = pd.to_numeric(_non_null(values), errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+        array = array[~np.isnan(array)]
+        if not len(array):
+            return self
+        self.count += len(array)
+        self.min = np.fmin(self.min, array.min())
+        self.max = np.fmax(self.max, array.max())
+        self.levels[0] = np.concatenate((self.levels[0], array))
+        self._compress()
+        return self
+
+    def _compress(self) -> None:
+        # Um nível novo reduz a capacidade dos de baixo: repete até todos caberem
+        compacted = True
+        while compacted:
+            compacted = False
+            for level in range(len(self.levels)):
+                if len(self.levels[level]) > self._capacity(level):
+                    self._compact(level)
+                    compacted = True
+
+    def _compact(self, level: int) -> None:
+        """Ordena o nível e promove metade dos itens (pares ou ímpares, ao acaso)"""
+        if level + 1 == len(self.levels):
+            self.levels.append(np.empty(0))
+        items = np.sort(self.levels[level])
+        # Número ímpar: o último item fica no nível
+        keep = items[-1:] if len(items) % 2 else items[:0]
+        paired = items[:len(items) - len(keep)]
+        self.levels[level] = keep
+        self.levels[level + 1] = np.concatenate((self.levels[level + 1], paired[self._rng.integers(0, 2)::2]))
+
+    def merge(self, other: 'QuantileSketch') -> 'QuantileSketch':
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for level, items in enumerate(other.levels):
+            self.levels[level] = np.concatenate((self.levels[level], items))
+        self.count += other.count
+        self.min = np.fmin(self.min, other.min)
+        self.max = np.fmax(self.max, other.max)
+        self._compress()
+        return self
+
+    def quantiles(self, fractions: Sequence[float]) -> List[float]:
+        """Valores aproximados dos quantis ``fractions`` (0..1); NaN se vazio"""
+        if not self.count:
+            return [float('nan')] * len(fractions)
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(level_items), 2 ** level, dtype=np.int64)
+                                  for level, level_items in enumerate(self.levels)])
+        order = np.argsort(items, kind='stable')
+        items, cumulative = items[order], np.cumsum(weights[order])
+        result = []
+        for fraction in fractions:
+            if fraction <= 0:
+                result.append(float(self.min))
+            elif fraction >= 1:
+                result.append(float(self.max))
+            else:
+                rank = fraction * cumulative[-1]
+                result.append(float(items[min(np.searchsorted(cumulative, rank), len(items) - 1)]))
+        return result
+
+    def quantile(self, fraction: float) -> float:
+        return self.quantiles([fraction])[0]
+
+    def median(self) -> float:
+        return self.quantile(0.5)
+
+    def retained(self) -> int:
+        return sum(len(items) for items in self.levels)
+
+
+class DistinctSketch:
+    """HyperLogLog com 2^p registradores"""
+
+    def __init__(self, p: int = 14):
+        self.p = p
+        self.registers = np.zeros(1 << p, dtype=np.uint8)
+
+    def update(self, values: Any = None, hashes: Optional[np.ndarray] = None) -> 'DistinctSketch':
+        hashes = hash_values(values) if hashes is None else hashes
+        if not len(hashes):
+            return self
+        bits = 64 - self.p
+        index = (hashes >> np.uint64(bits)).astype(np.int64)
+        rest = (hashes & np.uint64((1 << bits) - 1)).astype(float)
+        # Posição do primeiro bit 1 nos bits restantes (frexp é exato até 2^53)
+        _, exponent = np.frexp(rest)
+        rank = np.where(rest > 0, bits - exponent + 1, bits + 1).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+        return self
+
+    def merge(self, other: 'DistinctSketch') -> 'DistinctSketch':
+        if other.p != self.p:
+            raise ValueError("DistinctSketch com precisões diferentes")
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def estimate(self) -> int:
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if raw <= 2.5 * m and zeros:
+            # Faixa pequena: contagem linear
+            return int(round(m * math.log(m / zeros)))
+        return int(round(raw))
+
+
+class FrequencySketch:
+    """Count-Min (largura x profundidade) e os ``top`` candidatos mais frequentes"""
+
+    def __init__(self, width: int = 2048, depth: int = 5, top: int = 20):
+        self.width = width
+        self.depth = depth
+        self.top = top
+        self.table = np.zeros((depth, width), dtype=np.int64)
+        self.total = 0
+        self.candidates: Dict[Hashable, np.uint64] = {}
+
+    def _columns(self, hashes: np.ndarray) -> np.ndarray:
+        """Posições (profundidade x n) por hash duplo das metades do hash de 64 bits"""
+        low = (hashes & np.uint64(0xFFFFFFFF)).astype(np.int64)
+        high = (hashes >> np.uint64(32)).astype(np.int64) | 1
+        rows = np.arange(self.depth, dtype=np.int64)[:, None]
+        return (low[None, :] + rows * high[None, :]) % self.width
+
+    def update(self, values: Any) -> 'FrequencySketch':
+        series = _non_null(values)
+        if not len(series):
+            return self
+        # Conta cada valor distinto do bloco uma vez
+        counts = series.value_counts(sort=True)
+        counts = counts[counts > 0]
+        hashes = hash_values(pd.Series(counts.index, dtype=series.dtype))
+        columns = self._columns(hashes)
+        weights = counts.to_numpy(dtype=np.int64)
+        for row in range(self.depth):
+            self.table[row] += np.bincount(columns[row], weights=weights, minlength=self.width).astype(np.int64)
+        self.total += int(weights.sum())
+        leaders = counts.index[:self.top]
+        self._refresh_candidates(dict(zip(leaders, hashes[:self.top])))
+        return self
+
+    def _refresh_candidates(self, new: Dict[Hashable, np.uint64]) -> None:
+        candidates = dict(self.candidates)
+        candidates.update(new)
+        keys = list(candidates)
+        estimates = self._estimate_hashes(np.array([candidates[key] for key in keys], dtype=np.uint64))
+        order = np.argsort(-estimates, kind='stable')[:self.top]
+        self.candidates = {keys[i]: candidates[keys[i]] for i in order}
+
+    def _estimate_hashes(self, hashes: np.ndarray) -> np.ndarray:
+        if not len(hashes):
+            return np.zeros(0, dtype=np.int64)
+        columns = self._columns(hashes)
+        return self.table[np.arange(self.depth)[:, None], columns].min(axis=0)
+
+    def estimate(self, value: Any) -> int:
+        """Frequência aproximada (nunca menor que a real)"""
+        return int(self._estimate_hashes(hash_values(pd.Series([value])))[0])
+
+    def merge(self, other: 'FrequencySketch') -> 'FrequencySketch':
+        if (other.width, other.depth) != (self.width, self.depth):
+            raise ValueError("FrequencySketch com dimensões diferentes")
+        self.table += other.table
+        self.total += other.total
+        self._refresh_candidates(other.candidates)
+        return self
+
+    def most_common(self, n: Optional[int] = None) -> List[Tuple[Any, int]]:
+        keys = list(self.candidates)
+        estimates = self._estimate_hashes(np.array([self.candidates[key] for key in keys], dtype=np.uint64))
+        pairs = sorted(zip(keys, estimates.tolist()), key=lambda item: -item[1])
+        return pairs[:n or self.top]
+
+
+class ColumnSketches:
+    """Quantis (colunas numéricas), distintos e mais frequentes por coluna"""
+
+    def __init__(self, columns: Sequence[str], k: int = 256, p: int = 14, top: int = 20,
+                 seed: Optional[int] = None):
+        self.columns = list(columns)
+        self.quantile_sketches: Dict[str, QuantileSketch] = {}
+        self.distinct = {column: DistinctSketch(p) for column in self.columns}
+        self.frequent = {column: FrequencySketch(top=top) for column in self.columns}
+        self.k = k
+        self.seed = seed
+        self.rows = 0
+
+    def update(self, data: Any) -> 'ColumnSketches':
+        frame = data if isinstance(data, pd.DataFrame) else pd.DataFrame(data)
+        self.rows += len(frame)
+        for column in self.columns:
+            if column not in frame.columns:
+                continue
+            series = frame[column]
+            self.distinct[column].update(hashes=hash_values(series))
+            self.frequent[column].update(series)
+            if pd.api.types.is_numeric_dtype(series.dtype) and not pd.api.types.is_bool_dtype(series.dtype):
+                self._quantiles(column).update(series)
+        return self
+
+    def _quantiles(self, column: str) -> QuantileSketch:
+        sketch = self.quantile_sketches.get(column)
+        if sketch is None:
+            sketch = self.quantile_sketches[column] = QuantileSketch(self.k, seed=self.seed)
+        return sketch
+
+    def merge(self, other: 'ColumnSketches') -> 'ColumnSketches':
+        self.rows += other.rows
+        for column in other.columns:
+            if column not in self.distinct:
+                self.columns.append(column)
+                self.distinct[column] = copy.deepcopy(other.distinct[column])
+                self.frequent[column] = copy.deepcopy(other.frequent[column])
+            else:
+                self.distinct[column].merge(other.distinct[column])
+                self.frequent[column].merge(other.frequent[column])
+            if column in other.quantile_sketches:
+                self._quantiles(column).merge(other.quantile_sketches[column])
+        return self
+
+    def summary(self, quantiles: Sequence[float] = (0.25, 0.5, 0.75, 0.95), top: int = 10) -> Dict[str, Dict[str, Any]]:
+        result = {}
+        for column in self.columns:
+            item = {
+                'distinct': self.distinct[column].estimate(),
+                'top': self.frequent[column].most_common(top),
+            }
+            sketch = self.quantile_sketches.get(column)
+            if sketch is not None and sketch.count:
+                item['quantiles'] = dict(zip(quantiles, sketch.quantiles(quantiles)))
+            result[column] = item
+        return result
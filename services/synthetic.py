@@ -0,0 +1,197 @@
+"""
+Gerador vetorizado de dados sintéticos (vendas, produtos, usuários).
+
+Cada coluna é sorteada de uma vez com NumPy (``np.random.default_rng(seed)``):
+mesma semente = mesmos dados. As distribuições padrão reproduzem os dados de
+exemplo do ``DataService`` e podem ser trocadas por coluna::
+
+    sales(days=365, rows_per_day=10_000, seed=42,
+          distributions={'vendas': ('normal', 3000, 400, 0)})
+
+Especificações aceitas (tuplas):
+
+- ``('integers', min, max)`` (inclusivo)
+- ``('uniform', min, max[, casas])``
+- ``('normal', média, desvio[, casas])``
+- ``('lognormal', média, sigma[, casas])``
+- ``('poisson', lambda)``
+- ``('choice', valores[, probabilidades])``
+- ``('constant', valor)``
+
+ou uma função ``f(rng, tamanho) -> array``. ``write(kind, caminho, ...)`` grava
+o resultado em Parquet/Arrow IPC (requer ``pyarrow``).
+"""
+
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+Spec = Union[tuple, Callable[[np.random.Generator, int], np.ndarray]]
+
+SALES_DISTRIBUTIONS: Dict[str, Spec] = {
+    'vendas': ('integers', 1000, 5000),
+    'usuarios': ('integers', 100, 800),
+    'pedidos': ('integers', 20, 150),
+    'receita': ('integers', 10000, 80000),
+}
+
+PRODUCT_DISTRIBUTIONS: Dict[str, Spec] = {
+    'categoria': ('choice', ['Eletrônicos', 'Roupas', 'Casa', 'Esporte', 'Livros']),
+    'preco': ('uniform', 10.0, 500.0, 2),
+    'estoque': ('integers', 0, 100),
+    'vendas': ('integers', 0, 1000),
+    'receita': ('integers', 1000, 50000),
+    'status': ('choice', ['Ativo', 'Inativo', 'Pendente', 'Descontinuado']),
+    'rating': ('uniform', 1.0, 5.0, 1),
+}
+
+USER_DISTRIBUTIONS: Dict[str, Spec] = {
+    'role': ('choice', ['Admin', 'User', 'Manager', 'Viewer', 'Editor']),
+    'department': ('choice', ['Vendas', 'Marketing', 'TI', 'RH', 'Financeiro']),
+    'days_since_login': ('integers', 1, 30),
+    'status': ('choice', ['Ativo', 'Inativo']),
+    'projects': ('integers', 1, 8),
+    'score': ('uniform', 0.0, 100.0, 1),
+}
+
+FIRST_NAMES = ['João', 'Maria', 'Pedro', 'Ana', 'Carlos', 'Sofia', 'Miguel', 'Beatriz', 'Tiago', 'Lucia']
+LAST_NAMES = ['Silva', 'Santos', 'Oliveira', 'Costa', 'Lima', 'Fernandes', 'Rocha', 'Alves', 'Pereira', 'Martins']
+
+
+def draw(rng: np.random.Generator, spec: Spec, size: int):
+    """Amostra ``size`` valores de uma especificação (``choice`` gera uma categórica)"""
+    if callable(spec):
+        return np.asarray(spec(rng, size))
+    kind, *params = spec
+    if kind == 'integers':
+        return rng.integers(params[0], params[1], size=size, endpoint=True)
+    if kind == 'choice':
+        probabilities = params[1] if len(params) > 1 else None
+        codes = rng.choice(len(params[0]), size=size, p=probabilities)
+        # Poucos valores distintos: categórica (códigos inteiros, sem cópia de texto por linha)
+        return pd.Categorical.from_codes(codes, categories=pd.unique(pd.Series(params[0])))
+    if kind == 'poisson':
+        return rng.poisson(params[0], size=size)
+    if kind == 'constant':
+        return np.full(size, params[0])
+    if kind == 'uniform':
+        values = rng.uniform(params[0], params[1], size=size)
+    elif kind == 'normal':
+        values = rng.normal(params[0], params[1], size=size)
+    elif kind == 'lognormal':
+        values = rng.lognormal(params[0], params[1], size=size)
+    else:
+        raise ValueError(f"Distribuição desconhecida: {kind}")
+    if len(params) > 2 and params[2] is not None:
+        values = np.round(values, params[2])
+        if params[2] == 0:
+            values = values.astype(np.int64)
+    return values
+
+
+def _draw_columns(rng: np.random.Generator, defaults: Dict[str, Spec],
+                  overrides: Optional[Dict[str, Spec]], size: int) -> Dict[str, np.ndarray]:
+    specs = dict(defaults, **(overrides or {}))
+    return {name: draw(rng, spec, size) for name, spec in specs.items()}
+
+
+def _day(value: Any) -> np.datetime64:
+    if value is None:
+        return np.datetime64(date.today(), 'D')
+    if isinstance(value, datetime):
+        value = value.date()
+    return np.datetime64(value, 'D')
+
+
+def _day_text(days: np.ndarray) -> np.ndarray:
+    """datetime64[D] -> 'AAAA-MM-DD' (formata só os dias distintos)"""
+    unique, inverse = np.unique(days, return_inverse=True)
+    return np.datetime_as_string(unique, unit='D')[inverse.ravel()]
+
+
+def sales(days: int = 30, start: Any = None, end: Any = None, rows_per_day: int = 1,
+          seed: Optional[int] = None, distributions: Optional[Dict[str, Spec]] = None,
+          dates_as_text: bool = True) -> pd.DataFrame:
+    """
+    Vendas diárias: ``date``, ``vendas``, ``usuarios``, ``pedidos``, ``receita``.
+    Sem ``start``/``end``: os ``days`` dias até ontem. ``rows_per_day`` linhas por dia.
+    """
+    if start is not None:
+        first = _day(start)
+        days = int((_day(end) - first).astype(int)) + 1 if end is not None else days
+    else:
+        first = _day(end) + 1 - days if end is not None else _day(None) - days
+    rng = np.random.default_rng(seed)
+    size = max(days, 0) * rows_per_day
+    day_values = np.repeat(first + np.arange(max(days, 0)), rows_per_day)
+    frame = {'date': _day_text(day_values) if dates_as_text else day_values.astype('datetime64[ns]')}
+    frame.update(_draw_columns(rng, SALES_DISTRIBUTIONS, distributions, size))
+    return pd.DataFrame(frame)
+
+
+def _labels(prefix: str, count: int) -> np.ndarray:
+    """'Produto A'..'Produto Z' até 26 itens; depois 'Produto 1'..'Produto N'"""
+    if count <= 26:
+        suffixes = np.array([chr(65 + i) for i in range(count)], dtype=str)
+    else:
+        suffixes = np.arange(1, count + 1).astype(str)
+    return np.char.add(prefix, suffixes)
+
+
+def products(count: int = 10, seed: Optional[int] = None,
+             distributions: Optional[Dict[str, Spec]] = None) -> pd.DataFrame:
+    """Catálogo: ``produto``, ``categoria``, ``preco``, ``estoque``, ``vendas``, ``receita``, ``status``, ``rating``"""
+    rng = np.random.default_rng(seed)
+    frame = {'produto': _labels('Produto ', count)}
+    frame.update(_draw_columns(rng, PRODUCT_DISTRIBUTIONS, distributions, count))
+    return pd.DataFrame(frame)
+
+
+def users(count: int = 10, seed: Optional[int] = None, distributions: Optional[Dict[str, Spec]] = None,
+          today: Any = None) -> pd.DataFrame:
+    """Usuários: ``name``, ``email``, ``role``, ``department``, ``last_login``, ``status``, ``projects``, ``score``"""
+    rng = np.random.default_rng(seed)
+    first = rng.integers(0, len(FIRST_NAMES), size=count)
+    last = rng.integers(0, len(LAST_NAMES), size=count)
+    columns = _draw_columns(rng, USER_DISTRIBUTIONS, distributions, count)
+
+    # Pares (nome, sobrenome) distintos são poucos: monta o texto por par
+    pair = first * len(LAST_NAMES) + last
+    names = np.array([f'{a} {b}' for a in FIRST_NAMES for b in LAST_NAMES])
+    handles = np.array([f'{a.lower()}.{b.lower()}' for a in FIRST_NAMES for b in LAST_NAMES])
+    numbers = np.arange(1, count + 1).astype(str)
+
+    last_login = _day(today) - columns.pop('days_since_login').astype('timedelta64[D]')
+    frame = {
+        'name': pd.Categorical.from_codes(pair, categories=names),
+        'email': np.char.add(np.char.add(handles[pair], numbers), '@company.com'),
+        'role': columns.pop('role'),
+        'department': columns.pop('department'),
+        'last_login': _day_text(last_login),
+    }
+    frame.update(columns)
+    return pd.DataFrame(frame)
+
+
+GENERATORS: Dict[str, Callable[..., pd.DataFrame]] = {
+    'sales': sales,
+    'products': products,
+    'users': users,
+}
+
+
+def generate(kind: str, **kwargs) -> pd.DataFrame:
+    """DataFrame do tipo ``kind`` ('sales', 'products', 'users')"""
+    if kind not in GENERATORS:
+        raise ValueError(f"Tipo de dados desconhecido: {kind}")
+    return GENERATORS[kind](**kwargs)
+
+
+def write(kind: str, path: str, format: Optional[str] = None, **kwargs) -> pd.DataFrame:
+    """Gera e grava em Parquet/Arrow IPC (formato pela extensão); retorna o DataFrame"""
+    from services.datasets import write_dataset
+    frame = generate(kind, **kwargs)
+    write_dataset(frame, path, format=format)
+    return frame
@@ -0,0 +1,87 @@
+"""
+Coalescência por componente que disparou o evento: cliques em botões chegam
+com os valores dos filtros, mas não são atrasados nem substituídos.
+"""
+
+import asyncio
+import time
+
+from h2o_wave import Expando
+
+from core.app import WaveApp
+from core.coalescing import SUBMISSION_KEY, SUPERSEDED
+
+FILTERS = {'days_filter': 30, 'period_filter': 'daily'}
+
+
+def _app(dispatched):
+    app = WaveApp()
+    for name in FILTERS:
+        app.coalesce_event(name, debounce=0.3, group='sales_filters')
+
+    async def dispatch(q, state, args):
+        dispatched.append(args[SUBMISSION_KEY])
+        return True
+    app._dispatch = dispatch
+    return app
+
+
+def _client():
+    return Expando({'client': Expando(), 'events': Expando()})
+
+
+def _args(source, **values):
+    """Args como o Wave envia: todos os valores do formulário e o nome da submissão"""
+    args = dict(FILTERS, **values)
+    args.setdefault(source, True)
+    args[SUBMISSION_KEY] = source
+    return args
+
+
+def test_button_click_with_filter_values_is_not_coalesced():
+    dispatched = []
+    app = _app(dispatched)
+    q = _client()
+
+    async def run():
+        started = time.monotonic()
+        apply = await app.handle_events(q, args=_args('apply_sales_filters'))
+        retry = await app.handle_events(q, args=_args('retry'))
+        return apply, retry, time.monotonic() - started
+
+    apply, retry, elapsed = asyncio.run(run())
+    assert apply is True and retry is True
+    assert dispatched == ['apply_sales_filters', 'retry']
+    assert elapsed < 0.3
+
+
+def test_click_during_filter_debounce_is_dispatched():
+    dispatched = []
+    app = _app(dispatched)
+    q = _client()
+
+    async def run():
+        filtering = asyncio.ensure_future(app.handle_events(q, args=_args('days_filter', days_filter=10)))
+        await asyncio.sleep(0)
+        clicked = await app.handle_events(q, args=_args('apply_sales_filters'))
+        return clicked, await filtering
+
+    clicked, filtered = asyncio.run(run())
+    assert clicked is True and filtered is True
+    assert dispatched == ['apply_sales_filters', 'days_filter']
+
+
+def test_filter_bursts_keep_only_the_latest():
+    dispatched = []
+    app = _app(dispatched)
+    q = _client()
+
+    async def run():
+        first = asyncio.ensure_future(app.handle_events(q, args=_args('days_filter', days_filter=10)))
+        await asyncio.sleep(0)
+        second = await app.handle_events(q, args=_args('period_filter', period_filter='weekly'))
+        return await first, second
+
+    first, second = asyncio.run(run())
+    assert first is SUPERSEDED and second is True
+    assert dispatched == ['period_filter']
@@ -0,0 +1,73 @@
+"""
+Filtros empurrados para o leitor Arrow devem dar as mesmas linhas que o
+``process_dataframe`` sobre o arquivo inteiro.
+"""
+
+import asyncio
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip('pyarrow')
+
+from services.data_service import DataService
+from services.datasets import split_operations, write_dataset
+
+FILTERS = [
+    ('valor', '==', 2.0),
+    ('valor', '!=', 2.0),
+    ('valor', '>', 1.5),
+    ('valor', '<=', 3.0),
+    ('valor', 'in', [1.0, 4.0]),
+    ('nome', '==', 'xzy'),
+    ('nome', '!=', 'xzy'),
+    ('nome', 'contains', 'z'),
+    ('nome', 'contains', 'x.y'),
+    ('nome', 'contains', '^a'),
+    ('nome', 'in', ['abc', 'x.y']),
+]
+
+
+@pytest.fixture(scope='module')
+def dataset_path(tmp_path_factory):
+    frame = pd.DataFrame({
+        'id': np.arange(8),
+        'valor': [1.0, 2.0, np.nan, 3.0, 4.0, None, 2.0, 5.0],
+        'nome': ['abc', 'xzy', None, 'x.y', 'axy', 'xzy', None, 'b'],
+    })
+    path = str(tmp_path_factory.mktemp('datasets') / 'dados.parquet')
+    write_dataset(frame, path)
+    return path
+
+
+@pytest.mark.parametrize('column,operator,value', FILTERS)
+def test_pushdown_matches_pandas(dataset_path, column, operator, value):
+    operations = [{'type': 'filter', 'column': column, 'operator': operator, 'value': value}]
+    service = DataService()
+    expression, remaining, _ = split_operations(operations, ['id', 'valor', 'nome'])
+    assert expression is not None and not remaining
+
+    pushed = asyncio.run(service.query_dataset(dataset_path, operations, cache=False))
+    expected = asyncio.run(service.process_dataframe(pd.read_parquet(dataset_path), operations, cache=False))
+    assert pushed['id'].tolist() == expected['id'].tolist()
+
+
+def test_unsupported_regex_stays_in_pandas(dataset_path):
+    operations = [{'type': 'filter', 'column': 'nome', 'operator': 'contains', 'value': r'x(?=z)'}]
+    expression, remaining, _ = split_operations(operations, ['id', 'valor', 'nome'])
+    assert expression is None and remaining == operations
+
+
+@pytest.mark.parametrize('dtype', [object, 'category'])
+@pytest.mark.parametrize('value', ['1', 'x', '^1', '2$'])
+def test_contains_on_mixed_column_matches_str_contains(dtype, value):
+    # Valores que não são str nunca casam, como em ``.str.contains(na=False)``
+    frame = pd.DataFrame({
+        'id': np.arange(7),
+        'codigo': pd.Series(['1a', 12, None, 'x1', 1.5, np.nan, 'b2'], dtype=dtype),
+    })
+    operations = [{'type': 'filter', 'column': 'codigo', 'operator': 'contains', 'value': value}]
+    result = asyncio.run(DataService().process_dataframe(frame, operations, cache=False))
+    expected = frame[frame['codigo'].str.contains(value, na=False)]
+    assert result['id'].tolist() == expected['id'].tolist()
@@ -0,0 +1,58 @@
+"""
+Memoização de render: entradas grandes são comparadas pelo conteúdo completo e
+o ``render`` padrão do ``BaseCard`` pula componentes cujas entradas não mudaram.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from h2o_wave import Expando
+
+from core.memo import RenderMemo, hash_inputs
+from daze_echo_example import EchoCard
+
+
+def test_large_inputs_differing_in_the_middle_have_different_hashes():
+    frame = pd.DataFrame({'v': np.arange(10_000, dtype=float)})
+    edited = frame.copy()
+    edited.loc[5_000, 'v'] = -1.0
+    assert hash_inputs(frame) != hash_inputs(edited)
+    assert hash_inputs(frame) == hash_inputs(frame.copy())
+
+    array = np.arange(10_000)
+    changed = array.copy()
+    changed[5_000] = -1
+    assert hash_inputs(array) != hash_inputs(changed)
+
+    values = list(range(10_000))
+    assert hash_inputs(values) != hash_inputs(values[:5_000] + [-1] + values[5_001:])
+
+
+def test_unhashable_inputs_raise():
+    class Opaque:
+        __hash__ = None
+
+    with pytest.raises(TypeError):
+        hash_inputs([Opaque()])
+
+
+def test_card_skips_component_when_render_inputs_are_unchanged():
+    card = EchoCard('echo')
+    component = card.components['main']
+    renders = []
+    component.render = lambda q, state=None: renders.append(component.get_result(q, 'echo'))
+    q = Expando({'client': Expando(), 'page': {}})
+    memo = RenderMemo.get_instance()
+
+    card.render(q)
+    card.render(q)
+    assert renders == [None]
+
+    component.store_result(q, 'echo', 'Você clicou!')
+    card.render(q)
+    card.render(q)
+    assert renders == [None, 'Você clicou!']
+
+    memo.invalidate(q)
+    card.render(q)
+    assert len(renders) == 3